@@ -1,17 +1,46 @@
 """
-The script reads seed_issues.sql and executes it.
+Generate synthetic issues and stream them into Postgres with COPY.
+
+    python alembic/seeds/seed_issues.py                       # 100 issues, like the old seed file
+    python alembic/seeds/seed_issues.py --count 10000000 --workers 8 --days 1095
+
+Rows are built in chunks of --chunk-size, each from its own random
+generator seeded with (--seed, chunk number), so the generated data only
+depends on --seed, --count, --chunk-size and the time range, never on the
+number of workers. Pass --until as well for byte-identical reruns; ids
+depend on insert order, which is only fixed with --workers 1.
+
+Each chunk is one COPY and one transaction, so a failed run keeps the
+chunks that finished. Distributions:
+
+- title and description lengths are log-normal (most titles 20-80
+  characters, most descriptions a few hundred), clipped to the schema
+  limits of 200 and 5000;
+- status is open with probability --open-ratio;
+- created_at is uniform over the --days before --until; updated_at follows
+  0-5 days later for open issues and 1-30 days later for closed ones,
+  never after --until.
 """
 
+import argparse
+import csv
+import io
+import math
+import multiprocessing
 import os
+import random
 import sys
+import time
+from datetime import datetime, timezone
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
 
 
 class SeedSettings(BaseSettings):
     DATABASE_URL: str
-    
+
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".env"),
         case_sensitive=True,
@@ -20,59 +49,161 @@ class SeedSettings(BaseSettings):
 
 settings = SeedSettings()
 
-def seed_issues() -> None:
-    print("Starting seed process...")
+TITLE_MAX_LENGTH = 200
+DESCRIPTION_MAX_LENGTH = 5000
 
-    script_dir = os.path.dirname(__file__)
-    sql_file_path = os.path.join(script_dir, 'seed_issues.sql')
-    
-    if not os.path.exists(sql_file_path):
-        print(f"❌ Error: SQL file not found at {sql_file_path}", file=sys.stderr)
-        sys.exit(1)
+COPY_SQL = "COPY issues (title, description, status, created_at, updated_at) FROM STDIN WITH (FORMAT csv)"
 
-    try:
-        with open(sql_file_path, 'r') as f:
-            sql_content = f.read()
-    except Exception as e:
-        print(f"❌ Error reading SQL file: {e}", file=sys.stderr)
-        sys.exit(1)
-    
-    # Create engine
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,
+DAY = 24 * 60 * 60
+
+TITLE_VERBS = [
+    "Fix", "Add", "Update", "Improve", "Refactor", "Implement", "Optimize", "Remove", "Investigate", "Document",
+    "Support", "Migrate", "Handle", "Validate", "Cache",
+]
+
+WORDS = [
+    "authentication", "flow", "user", "profile", "API", "documentation", "error", "handling", "database",
+    "queries", "search", "memory", "leak", "service", "unit", "tests", "module", "indexes", "dependencies",
+    "CORS", "configuration", "logging", "middleware", "rate", "limiting", "date", "formatting", "input",
+    "validation", "messages", "UI", "components", "pagination", "caching", "layer", "file", "upload", "login",
+    "session", "token", "timeout", "export", "import", "report", "dashboard", "notification", "email", "mobile",
+    "browser", "layout", "latency", "crash", "retry", "webhook", "permission", "billing", "invoice", "sync",
+    "the", "when", "after", "before", "on", "in", "for", "with", "is", "not", "a", "of", "to", "and", "page",
+    "users", "request", "response", "slow", "broken", "missing", "duplicate", "intermittent", "returns",
+    "fails", "shows", "blank", "wrong", "value", "expected", "actual", "steps", "reproduce", "version",
+]
+
+
+def _length(rng, median, sigma, minimum, maximum):
+    return max(minimum, min(maximum, int(rng.lognormvariate(math.log(median), sigma))))
+
+
+def _text(rng, length, first_word=None):
+    words = rng.choices(WORDS, k=length // 5 + 2)
+    if first_word:
+        words[0] = first_word
+    text = " ".join(words)[:length + 1]
+    # Cut at the last whole word that fits
+    return text[:length] if len(text) <= length else (text.rsplit(" ", 1)[0] or text[:length])
+
+
+def generate_rows(seed, chunk_index, count, open_ratio, until, days):
+    """The rows of one chunk; a pure function of its arguments"""
+    rng = random.Random(f"{seed}:{chunk_index}")
+    earliest = until - days * DAY
+    for _ in range(count):
+        title = _text(rng, _length(rng, 45, 0.45, 8, TITLE_MAX_LENGTH), first_word=rng.choice(TITLE_VERBS))
+        description = _text(rng, _length(rng, 400, 1.0, 20, DESCRIPTION_MAX_LENGTH))
+        is_open = rng.random() < open_ratio
+        created_at = rng.randint(earliest, until)
+        if is_open:
+            updated_at = created_at + rng.randint(0, 5 * DAY)
+        else:
+            updated_at = created_at + rng.randint(DAY, 30 * DAY)
+        yield title, description, "open" if is_open else "closed", created_at, min(updated_at, until)
+
+
+# ---------- worker processes ----------
+
+_engine = None
+
+
+def _init_worker(database_url):
+    global _engine
+    _engine = create_engine(database_url, poolclass=NullPool)
+
+
+def copy_chunk(job):
+    """Generate one chunk and COPY it in its own transaction; returns the row count"""
+    chunk_index, count, seed, open_ratio, until, days = job
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(
+        generate_rows(seed, chunk_index, count, open_ratio, until, days)
     )
-    
-    connection = engine.connect()
-    trans = connection.begin()
-    
+    buffer.seek(0)
+
+    connection = _engine.raw_connection()
     try:
-        print("Executing seed SQL...")
-        connection.execute(text(sql_content))
-        
-        trans.commit()
-        print("✅ Successfully seeded issues!")
-        
-        # Show summary
-        result = connection.execute(text("SELECT status, COUNT(*) FROM issues GROUP BY status"))
-        print("\nSummary:")
-        for row in result:
-            print(f"  {row[0]}: {row[1]} issues")
-        
-    except Exception as e:
-        trans.rollback()
-        print(f"❌ Error seeding issues: {e}", file=sys.stderr)
-        raise
+        with connection.cursor() as cursor:
+            cursor.copy_expert(COPY_SQL, buffer)
+        connection.commit()
     finally:
         connection.close()
+    return count
+
+
+def _jobs(args, until):
+    for chunk_index, start in enumerate(range(0, args.count, args.chunk_size)):
+        yield chunk_index, min(args.chunk_size, args.count - start), args.seed, args.open_ratio, until, args.days
+
+
+def seed_issues(args) -> None:
+    until = args.until or int(time.time())
+    print(
+        f"Generating {args.count:,} issues with {args.workers} worker(s) "
+        f"(seed {args.seed}, until {datetime.fromtimestamp(until, timezone.utc):%Y-%m-%d %H:%M} UTC)..."
+    )
+
+    started = time.perf_counter()
+    done = 0
+    last_report = started
+
+    def _progress(rows):
+        nonlocal done, last_report
+        done += rows
+        now = time.perf_counter()
+        if now - last_report >= 1 or done == args.count:
+            last_report = now
+            print(f"  {done:,} / {args.count:,} issues ({done / (now - started):,.0f} rows/sec)")
+
+    if args.workers == 1:
+        _init_worker(settings.DATABASE_URL)
+        for job in _jobs(args, until):
+            _progress(copy_chunk(job))
+    else:
+        with multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(settings.DATABASE_URL,)) as pool:
+            for rows in pool.imap_unordered(copy_chunk, _jobs(args, until)):
+                _progress(rows)
+
+    seconds = time.perf_counter() - started
+    print(f"✅ Successfully seeded {args.count:,} issues in {seconds:.1f}s ({args.count / seconds:,.0f} rows/sec)")
+
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        with engine.begin() as connection:
+            # Fresh planner statistics, so benchmarks right after a big load use the indexes
+            connection.execute(text("ANALYZE issues"))
+            result = connection.execute(text("SELECT status, COUNT(*) FROM issues GROUP BY status ORDER BY status"))
+            print("\nSummary:")
+            for row in result:
+                print(f"  {row[0]}: {row[1]:,} issues")
+    finally:
         engine.dispose()
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100, help="Number of issues to generate")
+    parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, 8), help="COPY worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; same seed, same data")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="Rows per COPY and transaction")
+    parser.add_argument("--open-ratio", type=float, default=0.7, help="Share of open issues")
+    parser.add_argument("--days", type=int, default=60, help="created_at is spread over this many days")
+    parser.add_argument("--until", type=int, help="Newest created_at, in epoch seconds (default: now)")
+    args = parser.parse_args(argv)
+    if args.count < 1 or args.chunk_size < 1 or args.workers < 1 or args.days < 1:
+        parser.error("--count, --chunk-size, --workers and --days must be positive")
+    if not 0 <= args.open_ratio <= 1:
+        parser.error("--open-ratio must be between 0 and 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
     try:
-        seed_issues()
+        seed_issues(args)
     except Exception as e:
-        print(f"Fatal error: {e}", file=sys.stderr)
+        print(f"❌ Error seeding issues: {e}", file=sys.stderr)
         sys.exit(1)
 
 
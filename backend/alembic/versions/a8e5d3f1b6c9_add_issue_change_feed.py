@@ -0,0 +1,87 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'a8e5d3f1b6c9'
+down_revision = 'f6a3c9e1d7b2'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_issues_updated_at_id'
+INDEX_COLUMNS = 'updated_at, id'
+# Postgres's own name for a partition's copy of an index on (updated_at, id)
+PARTITION_INDEX_SUFFIX = 'updated_at_id_idx'
+
+
+def _partitions(table):
+    """(name, is_partitioned) of the partitions directly under `table`"""
+    return op.get_bind().execute(sa.text("""
+        SELECT c.relname, c.relkind = 'p'
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:table AS regclass)
+        ORDER BY c.relname
+    """), {"table": table}).all()
+
+
+def _create_partitioned_index(table, index_name):
+    """
+    Postgres cannot build an index on a partitioned table concurrently, so
+    the parent's index is created empty (ON ONLY), each partition's is built
+    concurrently, and attaching the last one makes the parent's valid.
+    """
+    op.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON ONLY {table} ({INDEX_COLUMNS})")
+    for partition, is_partitioned in _partitions(table):
+        partition_index = f"{partition}_{PARTITION_INDEX_SUFFIX}"
+        if is_partitioned:
+            _create_partitioned_index(partition, partition_index)
+        else:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} ({INDEX_COLUMNS})"
+            )
+        op.execute(f"ALTER INDEX {index_name} ATTACH PARTITION {partition_index}")
+
+
+def upgrade() -> None:
+    op.create_table(
+        'issue_tombstones',
+        sa.Column('issue_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('deleted_at', sa.Integer(), nullable=False, server_default=sa.text("EXTRACT(EPOCH FROM NOW())::INTEGER")),
+        sa.PrimaryKeyConstraint('issue_id')
+    )
+    op.create_index('ix_issue_tombstones_deleted_at_issue_id', 'issue_tombstones', ['deleted_at', 'issue_id'])
+
+    # Statement-level, so it fires for DELETE FROM issues only: rows moving
+    # between partitions on a status change, and partition maintenance
+    # deleting from the partitions directly, leave no tombstone behind.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_issue_tombstones()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO issue_tombstones (issue_id)
+            SELECT id FROM old_rows
+            ON CONFLICT (issue_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+            RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+    """)
+    op.execute("""
+        CREATE TRIGGER record_issue_tombstones_on_delete
+            AFTER DELETE ON issues
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION record_issue_tombstones();
+    """)
+
+    # Build concurrently so issues stays writable during the migration
+    with op.get_context().autocommit_block():
+        _create_partitioned_index('issues', INDEX_NAME)
+
+
+def downgrade() -> None:
+    # Drops the partitions' indexes along with it
+    op.drop_index(INDEX_NAME, table_name='issues', if_exists=True)
+
+    op.execute("DROP TRIGGER IF EXISTS record_issue_tombstones_on_delete ON issues")
+    op.execute("DROP FUNCTION IF EXISTS record_issue_tombstones()")
+    op.drop_index('ix_issue_tombstones_deleted_at_issue_id', table_name='issue_tombstones')
+    op.drop_table('issue_tombstones')
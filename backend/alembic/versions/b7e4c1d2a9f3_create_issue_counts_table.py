@@ -0,0 +1,105 @@
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'b7e4c1d2a9f3'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'issue_counts',
+        sa.Column('status', postgresql.ENUM('open', 'closed', name='issue_status', create_type=False), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('status')
+    )
+
+    # Create trigger function to keep per-status totals in step with issues.
+    # Statement-level triggers with transition tables apply one delta per
+    # status per statement, so bulk inserts/updates touch each counter once.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_issue_counts()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            changed RECORD;
+        BEGIN
+            -- Deltas are applied in status order so that concurrent statements
+            -- touching both counters always lock them in the same order.
+            IF TG_OP = 'INSERT' THEN
+                FOR changed IN
+                    SELECT status, COUNT(*) AS delta FROM new_rows GROUP BY status ORDER BY status
+                LOOP
+                    UPDATE issue_counts SET count = count + changed.delta WHERE status = changed.status;
+                END LOOP;
+            ELSIF TG_OP = 'DELETE' THEN
+                FOR changed IN
+                    SELECT status, COUNT(*) AS delta FROM old_rows GROUP BY status ORDER BY status
+                LOOP
+                    UPDATE issue_counts SET count = count - changed.delta WHERE status = changed.status;
+                END LOOP;
+            ELSE
+                FOR changed IN
+                    SELECT status, SUM(delta) AS delta
+                    FROM (
+                        SELECT status, 1 AS delta FROM new_rows
+                        UNION ALL
+                        SELECT status, -1 AS delta FROM old_rows
+                    ) AS changes
+                    GROUP BY status
+                    HAVING SUM(delta) <> 0
+                    ORDER BY status
+                LOOP
+                    UPDATE issue_counts SET count = count + changed.delta WHERE status = changed.status;
+                END LOOP;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+    """)
+
+    # Lock out writers while seeding so no row is counted twice or missed
+    op.execute("LOCK TABLE issues IN SHARE ROW EXCLUSIVE MODE")
+
+    op.execute("""
+        INSERT INTO issue_counts (status, count)
+        SELECT s.status, COUNT(i.id)
+        FROM unnest(enum_range(NULL::issue_status)) AS s(status)
+        LEFT JOIN issues i ON i.status = s.status
+        GROUP BY s.status
+    """)
+
+    # Create triggers on issues table
+    op.execute("""
+        CREATE TRIGGER update_issue_counts_on_insert
+            AFTER INSERT ON issues
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION update_issue_counts();
+    """)
+
+    op.execute("""
+        CREATE TRIGGER update_issue_counts_on_update
+            AFTER UPDATE ON issues
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION update_issue_counts();
+    """)
+
+    op.execute("""
+        CREATE TRIGGER update_issue_counts_on_delete
+            AFTER DELETE ON issues
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION update_issue_counts();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS update_issue_counts_on_delete ON issues")
+    op.execute("DROP TRIGGER IF EXISTS update_issue_counts_on_update ON issues")
+    op.execute("DROP TRIGGER IF EXISTS update_issue_counts_on_insert ON issues")
+    op.execute("DROP FUNCTION IF EXISTS update_issue_counts()")
+
+    op.drop_table('issue_counts')
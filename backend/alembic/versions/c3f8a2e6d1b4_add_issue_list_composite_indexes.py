@@ -0,0 +1,39 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'c3f8a2e6d1b4'
+down_revision = 'b7e4c1d2a9f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build concurrently so existing tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_issues_status_created_at_id',
+            'issues',
+            ['status', sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_issues_created_at_id',
+            'issues',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+        # Both are left-prefixes of the composite indexes above
+        op.drop_index('ix_issues_status', table_name='issues', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_issues_created_at', table_name='issues', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_issues_status', 'issues', ['status'], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_issues_created_at', 'issues', ['created_at'], postgresql_concurrently=True, if_not_exists=True)
+
+        op.drop_index('ix_issues_created_at_id', table_name='issues', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_issues_status_created_at_id', table_name='issues', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,44 @@
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'd9a4e7b2c5f1'
+down_revision = 'c3f8a2e6d1b4'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', description), 'B')"
+)
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites the table under an ACCESS
+    # EXCLUSIVE lock; schedule it like any other table rewrite.
+    op.add_column(
+        'issues',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+            nullable=False,
+        )
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_issues_search_vector',
+            'issues',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_issues_search_vector', table_name='issues', postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('issues', 'search_vector')
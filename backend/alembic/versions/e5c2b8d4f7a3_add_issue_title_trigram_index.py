@@ -0,0 +1,29 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e5c2b8d4f7a3'
+down_revision = 'd9a4e7b2c5f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Needs the contrib package on the server and a role allowed to create it
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_issues_title_trgm',
+            'issues',
+            [sa.text('title gin_trgm_ops')],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_issues_title_trgm', table_name='issues', postgresql_concurrently=True, if_exists=True)
+
+    # The extension is left installed; other objects may depend on it
@@ -0,0 +1,154 @@
+from datetime import date, datetime, timezone
+import time
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'f6a3c9e1d7b2'
+down_revision = 'e5c2b8d4f7a3'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', description), 'B')"
+)
+
+ISSUE_COLUMNS = "id, title, description, status, created_at, updated_at"
+
+# Month partitions created ahead of the current one; app.cli.maintain_issue_partitions keeps it up
+MONTHS_AHEAD = 2
+
+
+def _create_issues_table(partition_by=None):
+    op.execute(f"""
+        CREATE TABLE issues (
+            id INTEGER NOT NULL DEFAULT nextval('issues_id_seq'),
+            title VARCHAR(200) NOT NULL,
+            description VARCHAR(5000) NOT NULL,
+            status issue_status NOT NULL DEFAULT 'open',
+            created_at INTEGER NOT NULL DEFAULT EXTRACT(EPOCH FROM NOW())::INTEGER,
+            updated_at INTEGER NOT NULL DEFAULT EXTRACT(EPOCH FROM NOW())::INTEGER,
+            search_vector TSVECTOR GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED NOT NULL
+        ){f" PARTITION BY {partition_by}" if partition_by else ""}
+    """)
+
+
+def _add_month(month, months=1):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month_start(month):
+    return int(datetime(month.year, month.month, 1, tzinfo=timezone.utc).timestamp())
+
+
+def _month_of(timestamp):
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return date(moment.year, moment.month, 1)
+
+
+def _create_partitions():
+    op.execute("CREATE TABLE issues_open PARTITION OF issues FOR VALUES IN ('open')")
+    op.execute("CREATE TABLE issues_closed PARTITION OF issues FOR VALUES IN ('closed') PARTITION BY RANGE (created_at)")
+    op.execute("CREATE TABLE issues_closed_default PARTITION OF issues_closed DEFAULT")
+
+    # A month partition for every month with closed issues, through MONTHS_AHEAD months from now
+    oldest = op.get_bind().execute(
+        sa.text("SELECT min(created_at) FROM issues_unpartitioned WHERE status = 'closed'")
+    ).scalar()
+    now = int(time.time())
+    month = _month_of(min(oldest, now) if oldest is not None else now)
+    last = _add_month(_month_of(now), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE issues_closed_{month:%Y_%m} PARTITION OF issues_closed "
+            f"FOR VALUES FROM ({_month_start(month)}) TO ({_month_start(_add_month(month))})"
+        )
+        month = _add_month(month)
+
+
+def _create_indexes_and_triggers(primary_key, list_indexes):
+    op.create_primary_key('issues_pkey', 'issues', primary_key)
+    for name, columns in list_indexes:
+        op.create_index(name, 'issues', columns)
+    op.create_index('ix_issues_search_vector', 'issues', ['search_vector'], postgresql_using='gin')
+
+    has_trgm = op.get_bind().execute(sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).scalar()
+    if has_trgm:
+        op.create_index('ix_issues_title_trgm', 'issues', [sa.text('title gin_trgm_ops')], postgresql_using='gin')
+
+    # The trigger functions survive the old table; only the triggers went with it
+    op.execute("""
+        CREATE TRIGGER update_issues_updated_at
+            BEFORE UPDATE ON issues
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at_column();
+    """)
+    op.execute("""
+        CREATE TRIGGER update_issue_counts_on_insert
+            AFTER INSERT ON issues
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION update_issue_counts();
+    """)
+    op.execute("""
+        CREATE TRIGGER update_issue_counts_on_update
+            AFTER UPDATE ON issues
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION update_issue_counts();
+    """)
+    op.execute("""
+        CREATE TRIGGER update_issue_counts_on_delete
+            AFTER DELETE ON issues
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION update_issue_counts();
+    """)
+
+
+def _swap_in_new_table(old_name, partition_by=None, create_partitions=None):
+    """Copy issues into a freshly built table of the same name and drop the old one"""
+    op.execute(f"ALTER TABLE issues RENAME TO {old_name}")
+    op.execute(f"ALTER TABLE {old_name} RENAME CONSTRAINT issues_pkey TO {old_name}_pkey")
+    # Keep the id sequence alive when the old table is dropped
+    op.execute("ALTER SEQUENCE issues_id_seq OWNED BY NONE")
+
+    _create_issues_table(partition_by)
+    if create_partitions:
+        create_partitions()
+
+    # Triggers and indexes come after the copy: it is faster, and the
+    # counters stay as they are since the same rows move over
+    op.execute(f"INSERT INTO issues ({ISSUE_COLUMNS}) SELECT {ISSUE_COLUMNS} FROM {old_name}")
+    op.execute(f"DROP TABLE {old_name}")
+    op.execute("ALTER SEQUENCE issues_id_seq OWNED BY issues.id")
+
+
+def upgrade() -> None:
+    # Rewrites the table under an ACCESS EXCLUSIVE lock: reads and writes
+    # wait for the copy, so schedule it like any other table rewrite.
+    _swap_in_new_table('issues_unpartitioned', 'LIST (status)', _create_partitions)
+
+    # Status is the partition key, so (created_at, id) in each partition
+    # serves status-filtered lists too and ix_issues_status_created_at_id goes
+    _create_indexes_and_triggers(
+        ['id', 'status', 'created_at'],
+        [('ix_issues_created_at_id', [sa.text('created_at DESC'), sa.text('id DESC')])],
+    )
+    op.execute("ANALYZE issues")
+
+
+def downgrade() -> None:
+    # Issues already moved to the archive schema stay there
+    _swap_in_new_table('issues_partitioned')
+
+    _create_indexes_and_triggers(
+        ['id'],
+        [
+            ('ix_issues_status_created_at_id', ['status', sa.text('created_at DESC'), sa.text('id DESC')]),
+            ('ix_issues_created_at_id', [sa.text('created_at DESC'), sa.text('id DESC')]),
+        ],
+    )
+    op.execute("ANALYZE issues")
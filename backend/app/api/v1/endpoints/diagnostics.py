@@ -0,0 +1,33 @@
+from fastapi import APIRouter, status
+from app import database
+from app.services.issue_cache import issue_cache, suggest_cache
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+def get_cache_stats():
+    """Hit/miss/eviction counters and sizing of the issue response cache"""
+    return issue_cache.stats()
+
+
+@router.get("/cache/suggest", status_code=status.HTTP_200_OK)
+def get_suggest_cache_stats():
+    """Counters and sizing of the title suggestion cache"""
+    return suggest_cache.stats()
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+def get_pool_stats():
+    """Connection pool gauges, checkout wait histogram and timeout counts per engine"""
+    database.init_engines()
+    stats = {"sync": database.pool_metrics.stats(database.engine.pool)}
+    if database.async_engine is not None:
+        stats["async"] = database.async_pool_metrics.stats(database.async_engine.sync_engine.pool)
+    return stats
+
+
+@router.get("/replicas", status_code=status.HTTP_200_OK)
+def get_replica_stats():
+    """Read routing counters and health of each read replica"""
+    return database.replica_set.stats()
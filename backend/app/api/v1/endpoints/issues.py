@@ -1,99 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, File, Request, UploadFile, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from typing import Optional
-from math import ceil
-import logging
-from app.database import get_db
-from app.models.issue import Issue, IssueStatus
-from app.schemas.issue import IssueCreate, IssueUpdate, IssueResponse, PaginatedIssueResponse
-
-logger = logging.getLogger(__name__)
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Any, List, Optional
+from app.core.handlers import run_handler
+from app.core.replicas import read_source
+from app.database import get_db, get_read_db
+from app.schemas.issue import (
+    IssueBatchRequest,
+    IssueBatchResponse,
+    IssueBulkResult,
+    IssueBulkUpdate,
+    IssueChangesResponse,
+    IssueCreate,
+    IssueImportResult,
+    IssueResponse,
+    IssueSelection,
+    IssueSuggestion,
+    IssueUpdate,
+    PaginatedIssueResponse,
+)
+from app.services import issue_handlers as handlers
+from app.services.issue_changes import CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT
+from app.services.issue_suggest import SUGGEST_DEFAULT_LIMIT, SUGGEST_MAX_LIMIT, SUGGEST_MIN_LENGTH
 
 router = APIRouter(prefix="/issues", tags=["issues"])
 
 
 @router.get("", response_model=PaginatedIssueResponse, status_code=status.HTTP_200_OK)
 def list_issues(
+    request: Request,
     status_filter: Optional[str] = Query(None, description="Filter by status: 'open' or 'closed'"),
     sort: Optional[str] = Query("desc", description="Sort order: 'asc' or 'desc'"),
     page: int = Query(1, ge=1, description="Page number (starts at 1)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor/prev_cursor; takes precedence over page"),
+    q: Optional[str] = Query(None, max_length=200, description="Full-text search over title and description; results are ranked by relevance and paged by page number"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, e.g. id,title,status; only those columns are read"),
+    view: Optional[str] = Query(None, description="'summary' returns id, title, status, timestamps and a short excerpt of the description"),
+    db: Session = Depends(get_read_db)
+):
+    return run_handler(db, handlers.list_issues(request, read_source(db), status_filter, sort, page, cursor, q, fields, view))
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+def export_issues(
+    export_format: str = Query("ndjson", alias="format", description="Export format: 'ndjson' or 'csv'"),
+    status_filter: Optional[str] = Query(None, description="Filter by status: 'open' or 'closed'"),
+    sort: Optional[str] = Query("desc", description="Sort order: 'asc' or 'desc'"),
+    db: Session = Depends(get_read_db)
+):
+    export = handlers.export_issues(export_format, status_filter, sort)
+
+    # Runs after the handler returns; get_db keeps the session open until
+    # the response has been sent.
+    def _stream():
+        if export.header:
+            yield export.header
+        try:
+            for rows in db.execute(export.statement).partitions():
+                yield export.chunk(rows)
+        except SQLAlchemyError as e:
+            export.failed(e)
+            raise
+
+    return export.response(_stream())
+
+
+@router.get("/suggest", response_model=List[IssueSuggestion], status_code=status.HTTP_200_OK)
+def suggest_issues(
+    prefix: str = Query(..., min_length=SUGGEST_MIN_LENGTH, max_length=100, description="What the user has typed so far, at least 3 characters"),
+    limit: int = Query(SUGGEST_DEFAULT_LIMIT, ge=1, le=SUGGEST_MAX_LIMIT, description="Maximum number of suggestions"),
+    db: Session = Depends(get_read_db)
+):
+    return run_handler(db, handlers.suggest_issues(prefix, limit, read_source(db)))
+
+
+@router.get("/changes", response_model=IssueChangesResponse, status_code=status.HTTP_200_OK)
+def list_issue_changes(
+    since: Optional[str] = Query(None, description="next_cursor of the previous call; omit to start from the oldest change"),
+    limit: int = Query(CHANGES_DEFAULT_LIMIT, ge=1, le=CHANGES_MAX_LIMIT, description="Maximum number of changes"),
     db: Session = Depends(get_db)
 ):
-    PER_PAGE = 20
-
-    try:
-        query = db.query(Issue)
-
-        if status_filter:
-            if status_filter not in ["open", "closed"]:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="status_filter must be 'open' or 'closed'"
-                )
-            query = query.filter(Issue.status == status_filter)
-
-        if sort == "asc":
-            query = query.order_by(Issue.created_at.asc())
-        else:
-            query = query.order_by(Issue.created_at.desc())
-
-        total = query.count()
-
-        offset = (page - 1) * PER_PAGE
-        issues = query.offset(offset).limit(PER_PAGE).all()
-
-        if total == 0:
-            total_pages = 1
-        else:
-            total_pages = ceil(total / PER_PAGE)
-        
-        return PaginatedIssueResponse(
-            items=issues,
-            total=total,
-            page=page,
-            per_page=PER_PAGE,
-            total_pages=total_pages
-        )
-    except HTTPException as e:
-        raise HTTPException(
-            status_code=e.status_code,
-            detail="An unexpected error occurred while fetching the list of issues"
-        )
-    except SQLAlchemyError as e:
-        logger.error(f"Database error listing issues: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected database error occurred while fetching issues"
-        )
+    """
+    Issues created, updated or deleted after `since`, oldest change first.
+    Read from the primary, whose in-flight transactions bound the page.
+    """
+    return run_handler(db, handlers.list_issue_changes(since, limit))
+
+
+@router.get("/batch", response_model=IssueBatchResponse, status_code=status.HTTP_200_OK)
+def get_issues_batch(
+    ids: str = Query(..., description="Comma-separated issue ids; POST /issues/batch takes long lists"),
+    db: Session = Depends(get_read_db)
+):
+    """Issues in the order requested, with the ids that do not exist listed under `missing`"""
+    return run_handler(db, handlers.get_issues_batch(ids))
+
+
+@router.post("/batch", response_model=IssueBatchResponse, status_code=status.HTTP_200_OK)
+def post_issues_batch(
+    batch: IssueBatchRequest,
+    db: Session = Depends(get_read_db)
+):
+    """Same as GET /issues/batch, for id lists too long for a URL"""
+    return run_handler(db, handlers.post_issues_batch(batch.ids))
 
 
 @router.get("/{issue_id}", response_model=IssueResponse, status_code=status.HTTP_200_OK)
 def get_issue(
     issue_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_read_db)
 ):
-    try:
-        issue = db.query(Issue).filter(Issue.id == issue_id).first()
-        
-        if not issue:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Issue with id {issue_id} not found"
-            )
-        
-        return issue
-    except HTTPException as e:
-        raise HTTPException(
-            status_code=e.status_code,
-            detail="An unexpected error occurred while fetching the issue"
-        )
-    except SQLAlchemyError as e:
-        logger.error(f"Database error fetching issue {issue_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected database error occurred while fetching the issue"
-        )
+    return run_handler(db, handlers.get_issue(issue_id, request, read_source(db)))
 
 
 @router.post("", response_model=IssueResponse, status_code=status.HTTP_201_CREATED)
@@ -101,32 +119,40 @@ def create_issue(
     issue_data: IssueCreate,
     db: Session = Depends(get_db)
 ):
-    issue = Issue(
-        title=issue_data.title,
-        description=issue_data.description,
-        status=issue_data.status
-    )
-    
-    try:
-        db.add(issue)
-        db.commit()
-        db.refresh(issue)
-    except IntegrityError as e:
-        db.rollback()
-        logger.error(f"Database integrity error creating issue: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to create issue due to data integrity constraint violation"
-        )
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.error(f"Database error creating issue: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected database error occurred"
-        )
-    
-    return issue
+    return run_handler(db, handlers.create_issue(issue_data))
+
+
+@router.post("/bulk", response_model=List[IssueResponse], status_code=status.HTTP_201_CREATED)
+def create_issues_bulk(
+    items: List[Any] = Body(..., description="Issues to create, each validated like POST /issues"),
+    db: Session = Depends(get_db)
+):
+    return run_handler(db, handlers.create_issues_bulk(items))
+
+
+@router.patch("/bulk", response_model=IssueBulkResult, status_code=status.HTTP_200_OK)
+def update_issues_bulk(
+    bulk_data: IssueBulkUpdate,
+    db: Session = Depends(get_db)
+):
+    return run_handler(db, handlers.update_issues_bulk(bulk_data))
+
+
+@router.post("/bulk/delete", response_model=IssueBulkResult, status_code=status.HTTP_200_OK)
+def delete_issues_bulk(
+    selection: IssueSelection,
+    db: Session = Depends(get_db)
+):
+    return run_handler(db, handlers.delete_issues_bulk(selection))
+
+
+@router.post("/import", response_model=IssueImportResult, status_code=status.HTTP_201_CREATED)
+def import_issues_upload(
+    file: UploadFile = File(..., description="CSV or NDJSON file of issues"),
+    import_format: Optional[str] = Query(None, alias="format", description="'csv' or 'ndjson'; guessed from the file name when omitted"),
+    db: Session = Depends(get_db)
+):
+    return run_handler(db, handlers.import_issues_upload(file.file, file.filename, import_format))
 
 
 @router.patch("/{issue_id}", response_model=IssueResponse, status_code=status.HTTP_200_OK)
@@ -135,39 +161,7 @@ def update_issue(
     issue_data: IssueUpdate,
     db: Session = Depends(get_db)
 ):
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
-    
-    if not issue:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Issue with id {issue_id} not found"
-        )
-    
-    update_data = issue_data.model_dump(exclude_unset=True, exclude_none=True)
-    
-    for field, value in update_data.items():
-        setattr(issue, field, value)
-    
-    try:
-        db.commit()
-        db.refresh(issue)
-    except IntegrityError as e:
-        db.rollback()
-        logger.error(f"Database integrity error updating issue {issue_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to update issue due to data integrity constraint violation"
-        )
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.error(f"Database error updating issue {issue_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected database error occurred"
-        )
-    
-    return issue
-
+    return run_handler(db, handlers.update_issue(issue_id, issue_data))
 
 
 @router.delete("/{issue_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -175,30 +169,4 @@ def delete_issue(
     issue_id: int,
     db: Session = Depends(get_db)
 ):
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
-    
-    if not issue:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Issue with id {issue_id} not found"
-        )
-    
-    try:
-        db.delete(issue)
-        db.commit()
-    except IntegrityError as e:
-        db.rollback()
-        logger.error(f"Database integrity error deleting issue {issue_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to delete issue due to data integrity constraint violation"
-        )
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.error(f"Database error deleting issue {issue_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected database error occurred"
-        )
-    
-    return None
+    return run_handler(db, handlers.delete_issue(issue_id))
@@ -0,0 +1,177 @@
+"""
+Async issue endpoints backed by asyncpg and AsyncSession.
+
+Mirrors `issues.py` route for route; `app.main` mounts this router instead
+of the sync one when `settings.DATABASE_ASYNC` is enabled.
+"""
+from fastapi import APIRouter, Body, Depends, File, Request, UploadFile, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Any, List, Optional
+from app.core.handlers import run_handler_async
+from app.core.replicas import read_source
+from app.database import get_async_db, get_async_read_db
+from app.schemas.issue import (
+    IssueBatchRequest,
+    IssueBatchResponse,
+    IssueBulkResult,
+    IssueBulkUpdate,
+    IssueChangesResponse,
+    IssueCreate,
+    IssueImportResult,
+    IssueResponse,
+    IssueSelection,
+    IssueSuggestion,
+    IssueUpdate,
+    PaginatedIssueResponse,
+)
+from app.services import issue_handlers as handlers
+from app.services.issue_changes import CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT
+from app.services.issue_suggest import SUGGEST_DEFAULT_LIMIT, SUGGEST_MAX_LIMIT, SUGGEST_MIN_LENGTH
+
+router = APIRouter(prefix="/issues", tags=["issues"])
+
+
+@router.get("", response_model=PaginatedIssueResponse, status_code=status.HTTP_200_OK)
+async def list_issues(
+    request: Request,
+    status_filter: Optional[str] = Query(None, description="Filter by status: 'open' or 'closed'"),
+    sort: Optional[str] = Query("desc", description="Sort order: 'asc' or 'desc'"),
+    page: int = Query(1, ge=1, description="Page number (starts at 1)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor/prev_cursor; takes precedence over page"),
+    q: Optional[str] = Query(None, max_length=200, description="Full-text search over title and description; results are ranked by relevance and paged by page number"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, e.g. id,title,status; only those columns are read"),
+    view: Optional[str] = Query(None, description="'summary' returns id, title, status, timestamps and a short excerpt of the description"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    return await run_handler_async(db, handlers.list_issues(request, read_source(db), status_filter, sort, page, cursor, q, fields, view))
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_issues(
+    export_format: str = Query("ndjson", alias="format", description="Export format: 'ndjson' or 'csv'"),
+    status_filter: Optional[str] = Query(None, description="Filter by status: 'open' or 'closed'"),
+    sort: Optional[str] = Query("desc", description="Sort order: 'asc' or 'desc'"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    export = handlers.export_issues(export_format, status_filter, sort)
+
+    async def _stream():
+        if export.header:
+            yield export.header
+        try:
+            result = await db.stream(export.statement)
+            async for rows in result.partitions():
+                yield export.chunk(rows)
+        except SQLAlchemyError as e:
+            export.failed(e)
+            raise
+
+    return export.response(_stream())
+
+
+@router.get("/suggest", response_model=List[IssueSuggestion], status_code=status.HTTP_200_OK)
+async def suggest_issues(
+    prefix: str = Query(..., min_length=SUGGEST_MIN_LENGTH, max_length=100, description="What the user has typed so far, at least 3 characters"),
+    limit: int = Query(SUGGEST_DEFAULT_LIMIT, ge=1, le=SUGGEST_MAX_LIMIT, description="Maximum number of suggestions"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    return await run_handler_async(db, handlers.suggest_issues(prefix, limit, read_source(db)))
+
+
+@router.get("/changes", response_model=IssueChangesResponse, status_code=status.HTTP_200_OK)
+async def list_issue_changes(
+    since: Optional[str] = Query(None, description="next_cursor of the previous call; omit to start from the oldest change"),
+    limit: int = Query(CHANGES_DEFAULT_LIMIT, ge=1, le=CHANGES_MAX_LIMIT, description="Maximum number of changes"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Issues created, updated or deleted after `since`, oldest change first.
+    Read from the primary, whose in-flight transactions bound the page.
+    """
+    return await run_handler_async(db, handlers.list_issue_changes(since, limit))
+
+
+@router.get("/batch", response_model=IssueBatchResponse, status_code=status.HTTP_200_OK)
+async def get_issues_batch(
+    ids: str = Query(..., description="Comma-separated issue ids; POST /issues/batch takes long lists"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Issues in the order requested, with the ids that do not exist listed under `missing`"""
+    return await run_handler_async(db, handlers.get_issues_batch(ids))
+
+
+@router.post("/batch", response_model=IssueBatchResponse, status_code=status.HTTP_200_OK)
+async def post_issues_batch(
+    batch: IssueBatchRequest,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Same as GET /issues/batch, for id lists too long for a URL"""
+    return await run_handler_async(db, handlers.post_issues_batch(batch.ids))
+
+
+@router.get("/{issue_id}", response_model=IssueResponse, status_code=status.HTTP_200_OK)
+async def get_issue(
+    issue_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    return await run_handler_async(db, handlers.get_issue(issue_id, request, read_source(db)))
+
+
+@router.post("", response_model=IssueResponse, status_code=status.HTTP_201_CREATED)
+async def create_issue(
+    issue_data: IssueCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_handler_async(db, handlers.create_issue(issue_data))
+
+
+@router.post("/bulk", response_model=List[IssueResponse], status_code=status.HTTP_201_CREATED)
+async def create_issues_bulk(
+    items: List[Any] = Body(..., description="Issues to create, each validated like POST /issues"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_handler_async(db, handlers.create_issues_bulk(items))
+
+
+@router.patch("/bulk", response_model=IssueBulkResult, status_code=status.HTTP_200_OK)
+async def update_issues_bulk(
+    bulk_data: IssueBulkUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_handler_async(db, handlers.update_issues_bulk(bulk_data))
+
+
+@router.post("/bulk/delete", response_model=IssueBulkResult, status_code=status.HTTP_200_OK)
+async def delete_issues_bulk(
+    selection: IssueSelection,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_handler_async(db, handlers.delete_issues_bulk(selection))
+
+
+@router.post("/import", response_model=IssueImportResult, status_code=status.HTTP_201_CREATED)
+async def import_issues_upload(
+    file: UploadFile = File(..., description="CSV or NDJSON file of issues"),
+    import_format: Optional[str] = Query(None, alias="format", description="'csv' or 'ndjson'; guessed from the file name when omitted"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_handler_async(db, handlers.import_issues_upload(file.file, file.filename, import_format))
+
+
+@router.patch("/{issue_id}", response_model=IssueResponse, status_code=status.HTTP_200_OK)
+async def update_issue(
+    issue_id: int,
+    issue_data: IssueUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_handler_async(db, handlers.update_issue(issue_id, issue_data))
+
+
+@router.delete("/{issue_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_issue(
+    issue_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_handler_async(db, handlers.delete_issue(issue_id))
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+from app.config import settings
+from app.core.http_metrics import CONTENT_TYPE, HTTPMetrics
+
+http_metrics = HTTPMetrics(settings.METRICS_BUCKETS, multiprocess_dir=settings.METRICS_MULTIPROC_DIR)
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Request counters, in-flight gauges and latency histograms in Prometheus text format"""
+    return Response(http_metrics.render(), media_type=CONTENT_TYPE)
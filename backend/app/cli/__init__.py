@@ -0,0 +1,5 @@
+"""
+Command-line tools package.
+
+This package contains maintenance commands run with `python -m app.cli.<command>`.
+"""
@@ -0,0 +1,68 @@
+"""
+Bulk-load issues from a CSV or NDJSON file through PostgreSQL COPY.
+
+Each record is validated with the same rules as the create endpoint; rejected
+records are written as NDJSON (line, errors, record) to a side file instead
+of aborting the import. CSV files need a header row with title and
+description, and may add status and created_at (epoch seconds):
+
+    python -m app.cli.import_issues legacy_issues.csv
+    python -m app.cli.import_issues - --format ndjson < legacy_issues.ndjson
+
+The whole file is imported in one transaction, so a failed COPY imports nothing.
+"""
+
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.services.issue_import import IMPORT_FORMATS, import_format_for, import_issues
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Import issues through PostgreSQL COPY")
+    parser.add_argument("path", help="CSV or NDJSON file to import, or - for stdin")
+    parser.add_argument("--format", dest="import_format", choices=IMPORT_FORMATS,
+                        help="Input format; guessed from the file extension when omitted")
+    parser.add_argument("--rejects", help="Where to write rejected records (default: <path>.rejects.ndjson)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    import_format = args.import_format or import_format_for(args.path)
+    if import_format is None:
+        print("❌ Error: could not guess the format, pass --format csv or --format ndjson", file=sys.stderr)
+        sys.exit(1)
+
+    rejects_path = args.rejects or ("rejects.ndjson" if args.path == "-" else f"{args.path}.rejects.ndjson")
+
+    if args.path == "-":
+        source = open(sys.stdin.fileno(), encoding="utf-8-sig", newline="", closefd=False)
+    else:
+        source = open(args.path, encoding="utf-8-sig", newline="")
+
+    db = SessionLocal()
+    try:
+        with source, open(rejects_path, "w", encoding="utf-8") as rejects_file:
+            print(f"Importing {import_format} from {args.path}...")
+            report = import_issues(
+                db, source, import_format,
+                on_reject=lambda rejected: rejects_file.write(rejected.to_json() + "\n")
+            )
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error importing issues: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"✅ Imported {report.imported} issues in {report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/sec)")
+    if report.rejected:
+        print(f"  {report.rejected} rejected records written to {rejects_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Create upcoming partitions of the issues table and archive old closed issues.
+
+Run it daily, e.g. from cron; it is idempotent:
+
+    python -m app.cli.maintain_issue_partitions
+    python -m app.cli.maintain_issue_partitions --dry-run
+
+Closed issues created before the start of the month ISSUE_ARCHIVE_AFTER_DAYS
+ago are moved to tables in the `archive` schema and no longer served by the
+API. Month partitions are created ISSUE_PARTITION_MONTHS_AHEAD months ahead.
+Tombstones older than CHANGE_FEED_RETENTION_DAYS are deleted, which is the
+horizon of the change feed: older cursors are refused with 410.
+It then checks that no issue id is held by more than one partition, which
+the primary key cannot enforce, and exits with status 2 if one is.
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.issue_changes import prune_tombstones
+from app.services.issue_partitions import archive_partitions, duplicate_issue_ids, ensure_partitions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the partitions of the issues table")
+    parser.add_argument("--months-ahead", type=int, default=settings.ISSUE_PARTITION_MONTHS_AHEAD,
+                        help="Months of partitions to keep ready ahead of the current one")
+    parser.add_argument("--archive-after-days", type=int, default=settings.ISSUE_ARCHIVE_AFTER_DAYS,
+                        help="Archive closed issues created longer ago than this; 0 disables archiving")
+    parser.add_argument("--tombstone-retention-days", type=int, default=settings.CHANGE_FEED_RETENTION_DAYS,
+                        help="Delete change feed tombstones older than this; 0 keeps them. Keep it at "
+                             "CHANGE_FEED_RETENTION_DAYS, which the API checks cursors against")
+    parser.add_argument("--lock-timeout", default="5s",
+                        help="Give up when a lock cannot be taken within this time (default: %(default)s)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change, then roll back")
+    parser.add_argument("--no-check-ids", dest="check_ids", action="store_false",
+                        help="Skip the scan for issue ids held by more than one partition")
+    args = parser.parse_args(argv)
+    if args.months_ahead < 0 or args.archive_after_days < 0 or args.tombstone_retention_days < 0:
+        parser.error("--months-ahead, --archive-after-days and --tombstone-retention-days cannot be negative")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    now = int(time.time())
+
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT set_config('lock_timeout', :timeout, true)"), {"timeout": args.lock_timeout})
+        # Archive first, so months it empties are not recreated for stragglers
+        archived = archive_partitions(db, now, args.archive_after_days) if args.archive_after_days else []
+        created = ensure_partitions(db, now, args.months_ahead)
+        pruned = prune_tombstones(db, now, args.tombstone_retention_days)
+        duplicates = duplicate_issue_ids(db) if args.check_ids else []
+        if args.dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error maintaining issue partitions: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        db.close()
+
+    prefix = "Would have " if args.dry_run else ""
+    for partition in archived:
+        print(f"  {prefix}archived {partition.name} ({partition.rows} issues)")
+    for name in created:
+        print(f"  {prefix}created {name}")
+    print(f"✅ {'Dry run finished' if args.dry_run else 'Issue partitions maintained'}: "
+          f"{len(created)} created, {len(archived)} archived, {pruned} tombstones pruned")
+
+    if duplicates:
+        print(f"❌ Issue ids held by more than one partition: {', '.join(map(str, duplicates))}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+Rebuild the issue_counts table from the issues table.
+
+Run this if the per-status counters ever drift from the real row counts,
+e.g. after restoring data with triggers disabled:
+
+    python -m app.cli.reconcile_issue_counts
+"""
+
+import sys
+
+from app.database import SessionLocal
+from app.services.issue_counts import reconcile_issue_counts
+
+
+def main():
+    db = SessionLocal()
+    try:
+        print("Reconciling issue counts...")
+        result = reconcile_issue_counts(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error reconciling issue counts: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        db.close()
+
+    for issue_status, counts in result.items():
+        drift = counts["actual"] - counts["stored"]
+        print(f"  {issue_status}: {counts['actual']} issues (drift {drift:+d})")
+    print("✅ Issue counts reconciled")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator, ConfigDict
-from typing import List, Union, Optional
+from functools import lru_cache
+from typing import List, Literal, Union, Optional, cast
 
 class Settings(BaseSettings):
     model_config = ConfigDict(
@@ -14,17 +15,99 @@ class Settings(BaseSettings):
     # Test Database (optional, falls back to modifying DATABASE_URL)
     TEST_DATABASE_URL: Optional[str] = None
     
+    # Serve the issues API from the asyncpg/AsyncSession stack instead of psycopg2
+    DATABASE_ASYNC: bool = False
+    
+    # Read replicas (comma-separated URLs) serving list/get/export/suggest reads. A replica
+    # that fails to connect is skipped for REPLICA_EJECT_SECONDS; after a write, that
+    # client's reads go to the primary for READ_YOUR_WRITES_SECONDS
+    DATABASE_REPLICA_URLS: Union[str, List[str]] = ""
+    REPLICA_EJECT_SECONDS: float = 30.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    
+    # Connection pool, applied to both the sync and the async engine (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = True
+    
+    # Partition maintenance (app.cli.maintain_issue_partitions): month partitions for closed
+    # issues are created this many months ahead, and closed issues created more than
+    # ISSUE_ARCHIVE_AFTER_DAYS ago are moved to the archive schema (0 keeps them)
+    ISSUE_PARTITION_MONTHS_AHEAD: int = 2
+    ISSUE_ARCHIVE_AFTER_DAYS: int = 365
+    
+    # Startup check that the database is migrated to the revision this code expects
+    # (alembic upgrade head): "error" refuses to start, "warn" logs and serves anyway
+    SCHEMA_CHECK: Literal["error", "warn", "off"] = "error"
+    
     # CORS - can be comma-separated string or list
     CORS_ORIGINS: Union[str, List[str]] = "http://localhost:5173,http://localhost:3000"
     
-    @field_validator('CORS_ORIGINS', mode='before')
+    @field_validator('CORS_ORIGINS', 'DATABASE_REPLICA_URLS', mode='before')
     @classmethod
-    def parse_cors_origins(cls, v):
+    def parse_comma_separated(cls, v):
         if isinstance(v, str):
             return [origin.strip() for origin in v.split(',') if origin.strip()]
         return v
     
+    # In-process response cache for issue list/detail reads
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_TTL_SECONDS: float = 5.0
+    
+    # Per-prefix cache for /issues/suggest (also gated by CACHE_ENABLED)
+    SUGGEST_CACHE_MAX_ENTRIES: int = 4096
+    SUGGEST_CACHE_TTL_SECONDS: float = 30.0
+    
+    # Largest number of issues accepted by one bulk request or batch get
+    BULK_MAX_ITEMS: int = 1000
+    
+    # The change feed leaves out changes from the last seconds and from the start of the
+    # oldest transaction still in flight (at least 1, for the one-second timestamps), and
+    # keeps deletions for CHANGE_FEED_RETENTION_DAYS (pruned by partition maintenance;
+    # 0 keeps them forever): clients must poll more often or start over
+    CHANGE_FEED_SETTLE_SECONDS: int = 2
+    CHANGE_FEED_RETENTION_DAYS: int = 30
+    
+    # SQL instrumentation: per-request query count/time in a Server-Timing header,
+    # slow-query log and N+1 warnings. SQL_ECHO prints every statement (slow; debugging only)
+    SQL_INSTRUMENTATION: bool = True
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_REPEATED_QUERY_THRESHOLD: int = 10
+    SQL_ECHO: bool = False
+    
+    # Per-route request metrics served at /metrics. Set METRICS_MULTIPROC_DIR to an
+    # empty directory shared by all workers when running more than one process
+    METRICS_ENABLED: bool = True
+    METRICS_BUCKETS: Union[str, List[float]] = "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10"
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    
+    @field_validator('METRICS_BUCKETS', mode='before')
+    @classmethod
+    def parse_metrics_buckets(cls, v):
+        if isinstance(v, str):
+            return [float(bound) for bound in v.split(',') if bound.strip()]
+        return v
+    
     # Environment
     ENVIRONMENT: str = "development"
 
-settings = Settings()
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
+
+
+class _LazySettings:
+    """Stands in for the Settings instance, which reads the environment on first use rather than at import"""
+
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_settings(), name, value)
+
+
+settings = cast(Settings, _LazySettings())
@@ -0,0 +1,79 @@
+"""
+Endpoint logic written once for both the sync and the async stack.
+
+A handler is a generator that yields the database steps it needs (`Execute`,
+`COMMIT`, `ROLLBACK`, ...) and receives each step's result back from
+`yield`; a step that raises is thrown back into the handler at that `yield`,
+so handlers catch database errors with ordinary try/except. `run_handler`
+drives one on a Session and `run_handler_async` on an AsyncSession, leaving
+the endpoint modules as thin shells around the same code.
+"""
+from typing import Any, Generator, NamedTuple, Optional, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+Handler = Generator[Any, Any, T]
+
+
+class Execute(NamedTuple):
+    """Run a statement; the handler receives its Result"""
+    statement: Any
+    params: Optional[Any] = None
+
+    def run(self, db: Session):
+        return db.execute(self.statement, self.params)
+
+    async def run_async(self, db: AsyncSession):
+        return await db.execute(self.statement, self.params)
+
+
+class _Commit:
+    def run(self, db: Session) -> None:
+        db.commit()
+
+    async def run_async(self, db: AsyncSession) -> None:
+        await db.commit()
+
+
+class _Rollback:
+    def run(self, db: Session) -> None:
+        db.rollback()
+
+    async def run_async(self, db: AsyncSession) -> None:
+        await db.rollback()
+
+
+COMMIT = _Commit()
+ROLLBACK = _Rollback()
+
+
+def run_handler(db: Session, handler: Handler[T]) -> T:
+    """Run `handler`'s steps on a sync Session and return what it returns"""
+    outcome, error = None, None
+    while True:
+        try:
+            step = handler.send(outcome) if error is None else handler.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        outcome, error = None, None
+        try:
+            outcome = step.run(db)
+        except Exception as e:
+            error = e
+
+
+async def run_handler_async(db: AsyncSession, handler: Handler[T]) -> T:
+    """Run `handler`'s steps on an AsyncSession and return what it returns"""
+    outcome, error = None, None
+    while True:
+        try:
+            step = handler.send(outcome) if error is None else handler.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        outcome, error = None, None
+        try:
+            outcome = await step.run_async(db)
+        except Exception as e:
+            error = e
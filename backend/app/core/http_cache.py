@@ -0,0 +1,63 @@
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response, status
+
+
+def format_http_date(epoch: int) -> str:
+    return formatdate(epoch, usegmt=True)
+
+
+def parse_http_date(value: str) -> Optional[int]:
+    try:
+        return int(parsedate_to_datetime(value).timestamp())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[int] = None) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since only when it is absent"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        since = parse_http_date(if_modified_since)
+        return since is not None and last_modified <= since
+
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[int] = None) -> None:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_http_date(last_modified)
+
+
+def not_modified_response(etag: str, last_modified: Optional[int] = None) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def json_response(body: bytes, etag: str, last_modified: Optional[int] = None) -> Response:
+    """
+    200 response for a body that is already serialized JSON. Returning a
+    Response skips FastAPI's response_model validation and encoding, so the
+    body is only ever serialized once.
+    """
+    response = Response(content=body, media_type="application/json")
+    set_validators(response, etag, last_modified)
+    return response
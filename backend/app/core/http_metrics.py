@@ -0,0 +1,258 @@
+"""
+Per-route HTTP metrics in Prometheus text format.
+
+`HTTPMetricsMiddleware` is a plain ASGI middleware (no BaseHTTPMiddleware
+task/stream overhead). Requests are labelled with the template of the
+route that handled them (`/api/v1/issues/{issue_id}`, never the raw path,
+so ids don't explode the label set), read from the scope after FastAPI's
+router has matched it; matching routes again up front would cost more
+than everything else the middleware does. Counts per status code and a
+latency histogram are kept in an in-process `HTTPMetrics` registry, and
+in-flight gauges are derived from the requests still running when the
+registry is read. All updates happen on the event loop thread, so the hot
+path takes no locks.
+
+With several worker processes a scrape only reaches one of them. When a
+`multiprocess_dir` is configured every worker writes its registry to
+`<dir>/<pid>.json` shortly after it changes (and right before rendering),
+and `/metrics` merges the files of all workers: counters and histograms
+of workers that have exited are kept, their in-flight gauges are dropped.
+"""
+import asyncio
+import bisect
+import glob
+import json
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Route label for requests that matched no route (404s on arbitrary paths)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteStats:
+    __slots__ = ("statuses", "in_flight", "buckets", "sum")
+
+    def __init__(self, bucket_count: int):
+        self.statuses: Dict[int, int] = {}
+        self.in_flight = 0
+        # One slot per bucket plus +Inf; not cumulative until rendered
+        self.buckets = [0] * (bucket_count + 1)
+        self.sum = 0.0
+
+    def to_dict(self) -> dict:
+        return {"statuses": self.statuses, "in_flight": self.in_flight, "buckets": self.buckets, "sum": self.sum}
+
+
+class HTTPMetrics:
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        multiprocess_dir: Optional[str] = None,
+        flush_interval: float = 1.0
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self._flush_scheduled = False
+        # Scopes of the requests being handled, by id(); their route is only known once routed
+        self.active: Dict[int, Scope] = {}
+        # Replaced by the middleware, which knows the application's routes
+        self.route_template: Callable[[Scope], str] = lambda scope: UNMATCHED_ROUTE
+
+    def stats_for(self, method: str, route: str) -> RouteStats:
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = RouteStats(len(self.buckets))
+        return stats
+
+    def start(self, scope: Scope) -> None:
+        self.active[id(scope)] = scope
+
+    def finish(self, scope: Scope, status_code: int, seconds: float) -> None:
+        del self.active[id(scope)]
+        stats = self.stats_for(scope["method"], self.route_template(scope))
+        stats.statuses[status_code] = stats.statuses.get(status_code, 0) + 1
+        stats.buckets[bisect.bisect_left(self.buckets, seconds)] += 1
+        stats.sum += seconds
+        if self.multiprocess_dir is not None and not self._flush_scheduled:
+            self._schedule_flush()
+
+    # ---------- multi-process ----------
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._flush_scheduled = True
+        loop.call_later(self.flush_interval, self.flush)
+
+    def _state(self) -> dict:
+        for stats in self.routes.values():
+            stats.in_flight = 0
+        for scope in list(self.active.values()):
+            self.stats_for(scope["method"], self.route_template(scope)).in_flight += 1
+        return {
+            "pid": os.getpid(),
+            "buckets": list(self.buckets),
+            "routes": [[method, route, stats.to_dict()] for (method, route), stats in self.routes.items()],
+        }
+
+    def flush(self) -> None:
+        """Write this process's registry to the multiprocess directory"""
+        self._flush_scheduled = False
+        if self.multiprocess_dir is None:
+            return
+        path = os.path.join(self.multiprocess_dir, f"{os.getpid()}.json")
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(self._state(), f)
+        os.replace(temporary, path)
+
+    def _collect(self) -> List[dict]:
+        """Registry states of every worker, this process's taken live"""
+        if self.multiprocess_dir is None:
+            return [self._state()]
+
+        self.flush()
+        states = []
+        for path in glob.glob(os.path.join(self.multiprocess_dir, "*.json")):
+            try:
+                with open(path) as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if tuple(state["buckets"]) != self.buckets:
+                # Written by a run with different buckets; can't be merged
+                continue
+            if not _process_alive(state["pid"]):
+                for _, _, stats in state["routes"]:
+                    stats["in_flight"] = 0
+            states.append(state)
+        return states
+
+    # ---------- exposition ----------
+
+    def render(self) -> str:
+        merged: Dict[Tuple[str, str], RouteStats] = {}
+        for state in self._collect():
+            for method, route, stats in state["routes"]:
+                total = merged.get((method, route))
+                if total is None:
+                    total = merged[(method, route)] = RouteStats(len(self.buckets))
+                for status_code, count in stats["statuses"].items():
+                    total.statuses[int(status_code)] = total.statuses.get(int(status_code), 0) + count
+                total.in_flight += stats["in_flight"]
+                total.buckets = [a + b for a, b in zip(total.buckets, stats["buckets"])]
+                total.sum += stats["sum"]
+
+        keys = sorted(merged)
+        lines = [
+            "# HELP http_requests_total Requests handled, by route template, method and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for key in keys:
+            for status_code, count in sorted(merged[key].statuses.items()):
+                lines.append(f'http_requests_total{{{_labels(*key)},status="{status_code}"}} {count}')
+
+        lines += [
+            "# HELP http_requests_in_progress Requests currently being handled.",
+            "# TYPE http_requests_in_progress gauge",
+        ]
+        for key in keys:
+            lines.append(f"http_requests_in_progress{{{_labels(*key)}}} {merged[key].in_flight}")
+
+        lines += [
+            "# HELP http_request_duration_seconds Time from receiving a request to sending its response.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for key in keys:
+            stats = merged[key]
+            labels = _labels(*key)
+            cumulative = 0
+            for bound, count in zip(_bucket_labels(self.buckets), stats.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.sum!r}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _bucket_labels(buckets: Iterable[float]) -> List[str]:
+    return [repr(float(bound)) for bound in buckets] + ["+Inf"]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(method: str, route: str) -> str:
+    return f'method="{_escape(method)}",route="{_escape(route)}"'
+
+
+class HTTPMetricsMiddleware:
+    """Record every HTTP request of `app` in `metrics`, labelled by the template of its route in `routes`"""
+
+    def __init__(self, app: ASGIApp, metrics: HTTPMetrics, routes: Sequence):
+        self.app = app
+        self.metrics = metrics
+        # The application's live route list, so routers included later are found too
+        self.routes = routes
+        self._endpoint_paths: Dict[object, str] = {}
+        metrics.route_template = self.route_template
+
+    def route_template(self, scope: Scope) -> str:
+        # Set by FastAPI's APIRoute on a full or method-only (405) match
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        # Plain Starlette routes (/docs, /openapi.json) only leave their endpoint behind
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        path = self._endpoint_paths.get(endpoint)
+        if path is None:
+            path = next((route.path for route in self.routes if getattr(route, "endpoint", None) is endpoint), UNMATCHED_ROUTE)
+            self._endpoint_paths[endpoint] = path
+        return path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        self.metrics.start(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.finish(scope, status_code, time.perf_counter() - started)
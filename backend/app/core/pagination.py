@@ -0,0 +1,55 @@
+import base64
+import binascii
+import json
+from typing import Tuple
+
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: int, issue_id: int, direction: str) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor string"""
+    payload = json.dumps([created_at, issue_id, direction], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int, str]:
+    """Decode a cursor into (created_at, id, direction)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, issue_id, direction = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+    if (
+        type(created_at) is not int
+        or type(issue_id) is not int
+        or direction not in (CURSOR_NEXT, CURSOR_PREV)
+    ):
+        raise InvalidCursorError("Malformed cursor")
+
+    return created_at, issue_id, direction
+
+
+def encode_change_cursor(changed_at: int, issue_id: int) -> str:
+    """Encode a change feed position, the (changed_at, id) of the last change seen"""
+    payload = json.dumps([changed_at, issue_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_change_cursor(cursor: str) -> Tuple[int, int]:
+    """Decode a change feed cursor into (changed_at, id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        changed_at, issue_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+    if type(changed_at) is not int or type(issue_id) is not int:
+        raise InvalidCursorError("Malformed cursor")
+
+    return changed_at, issue_id
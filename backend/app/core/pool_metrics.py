@@ -0,0 +1,107 @@
+"""
+Connection pool metrics.
+
+Live gauges (checked out, idle, overflow) are read from the pool itself.
+Checkouts, new connections and invalidations are counted with SQLAlchemy
+pool events. Pool events only fire once a connection has been handed out,
+so the time spent waiting for one, and the waits that ended in a pool
+timeout, are measured by a thin subclass of the engine's pool class. Opening
+a new connection during a checkout is timed on its own and left out of the
+wait, so the wait measures contention for pooled connections only.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Type
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+from app.core.metrics import Histogram
+
+CHECKOUT_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Connect times of the checkout in progress; a ContextVar rather than a
+# thread local, so concurrent checkouts of the async pool stay apart
+_checkout_connects: ContextVar[Optional[List[float]]] = ContextVar("checkout_connects", default=None)
+
+
+class PoolMetrics:
+    def __init__(self, wait_buckets: Sequence[float] = CHECKOUT_WAIT_BUCKETS):
+        self.checkout_wait = Histogram(wait_buckets)
+        self.connect_time = Histogram(wait_buckets)
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def _increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def attach(self, engine: Engine) -> None:
+        """Count pool events of `engine`; wait times need `instrumented_pool_class` as its poolclass"""
+        event.listen(engine, "checkout", lambda *args: self._increment("checkouts"))
+        event.listen(engine, "connect", lambda *args: self._increment("connects"))
+        event.listen(engine, "invalidate", lambda *args: self._increment("invalidations"))
+
+    def stats(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+            }
+        if pool is not None and hasattr(pool, "checkedout"):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                # QueuePool counts overflow from -pool_size up
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            })
+        stats["checkout_wait_seconds"] = self.checkout_wait.snapshot()
+        stats["connect_seconds"] = self.connect_time.snapshot()
+        return stats
+
+
+def instrumented_pool_class(pool_class: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Subclass `pool_class` so every checkout records its wait in `metrics`,
+    and every new connection the time it took to open.
+    The metrics live on the class, so pools rebuilt by `Engine.dispose()`
+    (which calls `recreate()`, i.e. `self.__class__(...)`) keep reporting.
+    """
+
+    def _do_get(self):
+        connects: List[float] = []
+        token = _checkout_connects.set(connects)
+        started = time.perf_counter()
+        try:
+            return pool_class._do_get(self)
+        except exc.TimeoutError:
+            metrics._increment("timeouts")
+            raise
+        finally:
+            metrics.checkout_wait.observe(max(time.perf_counter() - started - sum(connects), 0.0))
+            _checkout_connects.reset(token)
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return pool_class._create_connection(self)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.connect_time.observe(elapsed)
+            connects = _checkout_connects.get()
+            if connects is not None:
+                connects.append(elapsed)
+
+    return type(
+        f"Instrumented{pool_class.__name__}",
+        (pool_class,),
+        {"_do_get": _do_get, "_create_connection": _create_connection},
+    )
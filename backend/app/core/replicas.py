@@ -0,0 +1,226 @@
+"""
+Read-replica routing.
+
+`ReplicaSet` hands out read sessions round-robin across the replicas it
+considers healthy. A replica whose connection cannot be established (the
+pool's pre-ping runs on that first checkout) is ejected for
+`eject_seconds` and the read moves on to the next one, then to the
+primary, so a dead replica costs one failed connect per ejection window.
+
+Reads right after a write can miss it on a lagging replica. After every
+successful write `ReadYourWritesMiddleware` hands the client a deadline,
+as a cookie and as a response header; a read that carries it back (either
+way) before the deadline is served by the primary. The deadline is the
+client's to send, so one further ahead than a write could have set is
+ignored rather than pinning every read. Such pinned reads also
+skip the response cache, and replica reads are never stored in it, so a
+lagging replica cannot hand the writer a stale page through the cache.
+"""
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+from sqlalchemy.exc import DBAPIError
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# session.info key naming the replica a read session is on
+REPLICA_INFO_KEY = "read_replica"
+# session.info key set on primary read sessions of clients that wrote recently
+PINNED_INFO_KEY = "read_primary_pinned"
+
+
+class Replica:
+    def __init__(self, name: str, session_factory: Callable[[], Any]):
+        self.name = name
+        self.session_factory = session_factory
+        self.ejected_until = 0.0
+        self.reads = 0
+        self.failures = 0
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        replicas: Sequence[Replica],
+        eject_seconds: float,
+        pin_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.replicas = list(replicas)
+        self.eject_seconds = eject_seconds
+        # ReadYourWritesMiddleware's window: the furthest deadline a client can hold
+        self.pin_seconds = pin_seconds
+        self._clock = clock
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self.primary_reads = 0
+
+    def candidates(self) -> List[Replica]:
+        """Healthy replicas, starting at the next one in round-robin order"""
+        if not self.replicas:
+            return []
+        now = self._clock()
+        start = next(self._next) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.ejected_until <= now]
+
+    def eject(self, replica: Replica, error: Exception) -> None:
+        with self._lock:
+            replica.failures += 1
+            replica.ejected_until = self._clock() + self.eject_seconds
+        logger.warning(f"Ejecting read replica {replica.name} for {self.eject_seconds:g}s: {error}")
+
+    def record_read(self, replica: Optional[Replica]) -> None:
+        with self._lock:
+            if replica is None:
+                self.primary_reads += 1
+            else:
+                replica.reads += 1
+
+    def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        with self._lock:
+            return {
+                "primary_reads": self.primary_reads,
+                "replicas": [
+                    {
+                        "name": replica.name,
+                        "healthy": replica.ejected_until <= now,
+                        "ejected_for_seconds": round(max(replica.ejected_until - now, 0.0), 1),
+                        "reads": replica.reads,
+                        "failures": replica.failures,
+                    }
+                    for replica in self.replicas
+                ],
+            }
+
+
+def reads_pinned_to_primary(
+    connection: HTTPConnection, window_seconds: float, clock: Callable[[], float] = time.time
+) -> bool:
+    """
+    Whether the client wrote recently enough that its reads must see the
+    primary. A deadline more than `window_seconds` ahead was not handed out
+    by ReadYourWritesMiddleware and is ignored.
+    """
+    value = connection.headers.get(READ_PRIMARY_HEADER) or connection.cookies.get(READ_PRIMARY_COOKIE)
+    if not value:
+        return False
+    try:
+        deadline = float(value)
+    except ValueError:
+        return False
+    now = clock()
+    return now < deadline <= now + window_seconds
+
+
+class ReadSource(NamedTuple):
+    """How a read session was routed, which decides how it may use the response cache"""
+    # The client wrote recently: it must see the primary, not a cached page
+    pinned: bool = False
+    # Served by a replica that may lag the primary: not fit to cache
+    replica: bool = False
+
+
+def read_source(session: Any) -> ReadSource:
+    """How `open_read_session` routed `session`"""
+    return ReadSource(session.info.get(PINNED_INFO_KEY, False), REPLICA_INFO_KEY in session.info)
+
+
+def _primary_read_session(primary_factory: Callable[[], Any], pinned: bool):
+    session = primary_factory()
+    if pinned:
+        session.info[PINNED_INFO_KEY] = True
+    return session
+
+
+def open_read_session(replica_set: ReplicaSet, primary_factory: Callable[[], Any], connection: HTTPConnection):
+    """A session on a healthy replica, or on the primary when pinned or when no replica can be reached"""
+    pinned = reads_pinned_to_primary(connection, replica_set.pin_seconds)
+    if not pinned:
+        for replica in replica_set.candidates():
+            session = replica.session_factory()
+            try:
+                # Check out (and pre-ping) the connection now, while we can still fall back
+                session.connection()
+            except DBAPIError as e:
+                session.close()
+                replica_set.eject(replica, e)
+                continue
+            replica_set.record_read(replica)
+            session.info[REPLICA_INFO_KEY] = replica.name
+            return session
+
+    replica_set.record_read(None)
+    return _primary_read_session(primary_factory, pinned)
+
+
+async def open_async_read_session(
+    replica_set: ReplicaSet, primary_factory: Callable[[], Any], connection: HTTPConnection
+):
+    """AsyncSession counterpart of `open_read_session`"""
+    pinned = reads_pinned_to_primary(connection, replica_set.pin_seconds)
+    if not pinned:
+        for replica in replica_set.candidates():
+            session = replica.session_factory()
+            try:
+                await session.connection()
+            except (DBAPIError, OSError) as e:
+                # asyncpg raises refused connects and timeouts unwrapped
+                await session.close()
+                replica_set.eject(replica, e)
+                continue
+            replica_set.record_read(replica)
+            session.info[REPLICA_INFO_KEY] = replica.name
+            return session
+
+    replica_set.record_read(None)
+    return _primary_read_session(primary_factory, pinned)
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a successful write, tell the client to read from the primary for
+    `window_seconds`. `read_only_paths` are POST endpoints that only read.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        window_seconds: float,
+        read_only_paths: Iterable[str] = (),
+        clock: Callable[[], float] = time.time
+    ):
+        self.app = app
+        self.window_seconds = window_seconds
+        self.read_only_paths = frozenset(read_only_paths)
+        self._clock = clock
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or scope["path"] in self.read_only_paths:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = f"{self._clock() + self.window_seconds:.3f}"
+                headers = MutableHeaders(scope=message)
+                headers.append(READ_PRIMARY_HEADER, until)
+                headers.append(
+                    "Set-Cookie",
+                    f"{READ_PRIMARY_COOKIE}={until}; Max-Age={math.ceil(self.window_seconds)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
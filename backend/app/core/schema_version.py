@@ -0,0 +1,39 @@
+"""
+Startup check of the database schema revision.
+
+The app no longer creates its tables: the schema is whatever `alembic
+upgrade head` left. At startup it reads the revision stamped in
+alembic_version (one single-row query) and compares it with
+SCHEMA_REVISION, the head of alembic/versions this code is written
+against, so a worker never serves against a schema that is behind or
+ahead of it. Alembic itself is not imported at runtime;
+tests/test_schema_version.py keeps SCHEMA_REVISION in step with the
+migrations.
+"""
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Bump together with every new migration
+SCHEMA_REVISION = "a8e5d3f1b6c9"
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def database_revision(connection: Connection) -> Optional[str]:
+    """The revision alembic stamped, or None when it never ran against this database"""
+    if connection.execute(text("SELECT to_regclass('alembic_version')")).scalar() is None:
+        return None
+    return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def check_schema_version(connection: Connection) -> None:
+    """Raise SchemaVersionError unless the database is at SCHEMA_REVISION"""
+    revision = database_revision(connection)
+    if revision != SCHEMA_REVISION:
+        found = f"revision {revision}" if revision else "no alembic revision"
+        raise SchemaVersionError(
+            f"Database schema has {found}, this code expects {SCHEMA_REVISION}; run `alembic upgrade head`"
+        )
@@ -0,0 +1,130 @@
+"""
+Per-request SQL instrumentation.
+
+Cursor events on the engines time every statement. While a request is
+being handled (`SQLTimingMiddleware` sets a context variable, which
+follows the request into the threadpool and into SQLAlchemy's greenlets)
+the query count and database time add up per request and go back to the
+client in a `Server-Timing` header. Statements slower than a threshold are
+logged with their parameters and the endpoint that ran them, and a request
+that runs the same statement many times gets an N+1 warning.
+"""
+import contextvars
+import logging
+import time
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Longest parameter repr written to the slow-query log
+MAX_LOGGED_PARAMETERS = 1000
+
+
+class RequestQueries:
+    """Statements run while handling one request"""
+
+    __slots__ = ("scope", "count", "seconds", "shapes")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        # Statement text (bound parameters are placeholders, so one text per query shape) -> executions
+        self.shapes: Dict[str, int] = {}
+
+    @property
+    def endpoint(self) -> str:
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {route.path if route is not None else self.scope['path']}"
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement] = self.shapes.get(statement, 0) + 1
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries"'
+
+
+current_request: contextvars.ContextVar[Optional[RequestQueries]] = contextvars.ContextVar(
+    "current_request_queries", default=None
+)
+
+
+class SQLInstrumentation:
+    def __init__(self, slow_query_seconds: float, repeat_threshold: int):
+        self.slow_query_seconds = slow_query_seconds
+        self.repeat_threshold = repeat_threshold
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def detach(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # On the statement's execution context, not the connection: a statement
+        # that fails never reaches after_cursor_execute, and its start time
+        # goes away with its context instead of staying on a pooled connection
+        context._query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context._query_started
+        request = current_request.get()
+        if request is not None:
+            request.record(statement, seconds)
+        if seconds >= self.slow_query_seconds:
+            logger.warning(
+                f"Slow query ({seconds * 1000:.1f} ms) in {request.endpoint if request else 'no request'}: "
+                f"{statement} | parameters: {_truncate(repr(parameters))}"
+            )
+
+    def report_repeats(self, request: RequestQueries) -> None:
+        """Warn about statements a single request ran `repeat_threshold` times or more (N+1 patterns)"""
+        for statement, count in request.shapes.items():
+            if count >= self.repeat_threshold:
+                logger.warning(
+                    f"Possible N+1: {request.endpoint} ran the same statement {count} times "
+                    f"({request.count} queries in total): {statement}"
+                )
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= MAX_LOGGED_PARAMETERS:
+        return text
+    return f"{text[:MAX_LOGGED_PARAMETERS]}... ({len(text)} chars)"
+
+
+class SQLTimingMiddleware:
+    """Collect the queries of each HTTP request and report them in a `Server-Timing` response header"""
+
+    def __init__(self, app: ASGIApp, instrumentation: SQLInstrumentation):
+        self.app = app
+        self.instrumentation = instrumentation
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestQueries(scope)
+        token = current_request.set(request)
+
+        async def send_wrapper(message: Message) -> None:
+            # Streamed bodies keep querying after this; the header covers what ran before the response started
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", request.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            self.instrumentation.report_repeats(request)
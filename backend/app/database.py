@@ -1,18 +1,163 @@
+import inspect
+import os
+import threading
+from functools import lru_cache
+from typing import Any, List
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.config import settings
+from app.core.pool_metrics import PoolMetrics, instrumented_pool_class
+from app.core.replicas import Replica, ReplicaSet, open_async_read_session, open_read_session
+from app.core.sql_instrumentation import SQLInstrumentation
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.ENVIRONMENT == "development"
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def engine_options() -> dict:
+    """Pool sizing and liveness options shared by the sync and async engines"""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.SQL_ECHO,
+    }
+
+
+pool_metrics = PoolMetrics()
+
+
+@lru_cache
+def get_sql_instrumentation() -> SQLInstrumentation:
+    """The process's SQL instrumentation, built on first use so importing the app reads no settings"""
+    return SQLInstrumentation(
+        slow_query_seconds=settings.SQL_SLOW_QUERY_MS / 1000,
+        repeat_threshold=settings.SQL_REPEATED_QUERY_THRESHOLD
+    )
+
 
 Base = declarative_base()
 
 
+def replica_name(database_url: str) -> str:
+    return make_url(database_url).render_as_string(hide_password=True)
+
+
+# Replicas of the selected stack, when DATABASE_REPLICA_URLS is set; without any, reads use the
+# primary. Filled, and its eject_seconds and pin_seconds set, by init_engines()
+replica_set = ReplicaSet([], eject_seconds=0.0)
+
+# The engines are built by init_engines() on first use rather than at import,
+# so a server that imports the app before forking its workers (gunicorn
+# --preload) gives every worker its own pools.
+engine = None
+async_engine = None
+AsyncSessionLocal = None
+async_pool_metrics = None
+# Engines built so far, replicas included, sync or async
+_created_engines: List[Any] = []
+_engines_lock = threading.Lock()
+
+
+class _EngineSessionmaker(sessionmaker):
+    """sessionmaker bound to the primary engine on its first call"""
+
+    def __call__(self, **local_kw):
+        if self.kw["bind"] is None and "bind" not in local_kw:
+            init_engines()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _EngineSessionmaker(autocommit=False, autoflush=False)
+
+
+def _track(created):
+    _created_engines.append(created)
+    if settings.SQL_INSTRUMENTATION:
+        get_sql_instrumentation().attach(getattr(created, "sync_engine", created))
+    return created
+
+
+def _replica_engine(database_url: str):
+    return _track(create_engine(database_url, **engine_options()))
+
+
+def _init_async_engines() -> None:
+    """The async stack is only built when selected, so asyncpg stays optional"""
+    global async_engine, AsyncSessionLocal, async_pool_metrics
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    async_pool_metrics = PoolMetrics()
+    async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_URL),
+        poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_metrics),
+        **engine_options()
+    )
+    async_pool_metrics.attach(_track(async_engine).sync_engine)
+
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def _async_replica_engine(database_url: str):
+        return _track(create_async_engine(get_async_database_url(database_url), **engine_options()))
+
+    replica_set.replicas = [
+        Replica(
+            replica_name(url),
+            async_sessionmaker(bind=_async_replica_engine(url), autoflush=False, expire_on_commit=False)
+        )
+        for url in settings.DATABASE_REPLICA_URLS
+    ]
+
+
+def init_engines() -> None:
+    """Create the engines of the selected stack, once per process. Opens no connection."""
+    global engine
+    if engine is not None:
+        return
+    with _engines_lock:
+        if engine is not None:
+            return
+        primary = create_engine(
+            settings.DATABASE_URL,
+            poolclass=instrumented_pool_class(QueuePool, pool_metrics),
+            **engine_options()
+        )
+        pool_metrics.attach(_track(primary))
+        SessionLocal.configure(bind=primary)
+
+        replica_set.eject_seconds = settings.REPLICA_EJECT_SECONDS
+        replica_set.pin_seconds = settings.READ_YOUR_WRITES_SECONDS
+
+        if settings.DATABASE_ASYNC:
+            _init_async_engines()
+        else:
+            replica_set.replicas = [
+                Replica(replica_name(url), sessionmaker(autocommit=False, autoflush=False, bind=_replica_engine(url)))
+                for url in settings.DATABASE_REPLICA_URLS
+            ]
+        engine = primary
+
+
+def _forget_inherited_connections() -> None:
+    """In a forked child, leave the parent's pooled connections to the parent"""
+    for inherited in _created_engines:
+        getattr(inherited, "sync_engine", inherited).dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_forget_inherited_connections)
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections, e.g. at shutdown; the engines reconnect if used again"""
+    for created in _created_engines:
+        disposed = created.dispose()
+        if inspect.isawaitable(disposed):
+            await disposed
+
+
 def get_db():
     """Dependency for getting database session"""
     db = SessionLocal()
@@ -20,3 +165,35 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request):
+    """Dependency for a read-only session: a healthy replica when configured, else the primary"""
+    init_engines()
+    db = open_read_session(replica_set, SessionLocal, request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Point a postgresql:// URL at the asyncpg driver"""
+    return make_url(database_url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    init_engines()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of `get_read_db`"""
+    init_engines()
+    db = await open_async_read_session(replica_set, AsyncSessionLocal, request)
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,28 +1,101 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from app import database
 from app.config import settings
-from app.database import engine, Base
-from app.api.v1.endpoints import issues
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="Joby Interview API",
-    description="FastAPI backend for Joby Interview project",
-    version="1.0.0",
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(
-    issues.router,
-    prefix="/api/v1",
-)
+from app.core.schema_version import SchemaVersionError, check_schema_version
+
+logger = logging.getLogger(__name__)
+
+# POST endpoints that only read, which need not pin the client to the primary
+READ_ONLY_POST_PATHS = ("/api/v1/issues/batch",)
+
+
+def _check_schema() -> None:
+    with database.engine.connect() as connection:
+        check_schema_version(connection)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in each worker after any fork, so the engines and their pools are the worker's own
+    database.init_engines()
+    if settings.SCHEMA_CHECK != "off":
+        try:
+            await run_in_threadpool(_check_schema)
+        except SchemaVersionError as e:
+            if settings.SCHEMA_CHECK == "error":
+                raise
+            logger.warning(str(e))
+    yield
+    await database.dispose_engines()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the application. Opens no database connection: the engines are
+    created and the schema revision checked on startup, in `lifespan`.
+    """
+    app = FastAPI(
+        title="Joby Interview API",
+        description="FastAPI backend for Joby Interview project",
+        version="1.0.0",
+        lifespan=lifespan,
+    )
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Only replicas can lag behind a client's own writes
+    if settings.DATABASE_REPLICA_URLS and settings.READ_YOUR_WRITES_SECONDS > 0:
+        from app.core.replicas import ReadYourWritesMiddleware
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            window_seconds=settings.READ_YOUR_WRITES_SECONDS,
+            read_only_paths=READ_ONLY_POST_PATHS,
+        )
+
+    if settings.SQL_INSTRUMENTATION:
+        from app.core.sql_instrumentation import SQLTimingMiddleware
+        app.add_middleware(SQLTimingMiddleware, instrumentation=database.get_sql_instrumentation())
+
+    # Only the selected stack's endpoints are imported
+    if settings.DATABASE_ASYNC:
+        from app.api.v1.endpoints import issues_async as issues
+    else:
+        from app.api.v1.endpoints import issues
+    app.include_router(issues.router, prefix="/api/v1")
+
+    # Imported here, like the routers above, since the caches it reports on are sized from settings
+    from app.api.v1.endpoints import diagnostics
+    app.include_router(
+        diagnostics.router,
+        prefix="/api/v1",
+    )
+
+    if settings.METRICS_ENABLED:
+        from app.api.v1.endpoints import metrics
+        from app.core.http_metrics import HTTPMetricsMiddleware
+        app.include_router(metrics.router)
+        # Outermost, so the measured latency includes every other middleware
+        app.add_middleware(HTTPMetricsMiddleware, metrics=metrics.http_metrics, routes=app.router.routes)
+
+    return app
+
+
+def __getattr__(name: str):
+    # `app.main:app` (uvicorn, tests) builds the app on first access, so that
+    # importing this module, e.g. for create_app, reads no settings
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
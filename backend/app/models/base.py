@@ -5,6 +5,6 @@ from app.database import Base
 class BaseModel(Base):
     __abstract__ = True
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     created_at = Column(Integer, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW())::INTEGER"))
     updated_at = Column(Integer, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW())::INTEGER"))
@@ -1,7 +1,17 @@
-from sqlalchemy import Column, String, Enum
+from sqlalchemy import Column, Computed, DDL, Integer, PrimaryKeyConstraint, String, Enum, Index, event, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import declared_attr, deferred
 from app.models.base import BaseModel
 import enum
 
+# Text search configuration for search_vector; queries must parse with the same one
+SEARCH_CONFIG = 'english'
+
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', description), 'B')"
+)
+
 class IssueStatus(enum.Enum):
     OPEN = "open"
     CLOSED = "closed"
@@ -13,6 +23,71 @@ class Issue(BaseModel):
     description = Column(String(5000), nullable=False)
     status = Column(
         Enum(IssueStatus, values_callable=lambda x: [e.value for e in x], name='issue_status', native_enum=True),
+        primary_key=True,
         nullable=False, 
         server_default='open'
     )
+    created_at = Column(
+        Integer, primary_key=True, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW())::INTEGER")
+    )
+    # Maintained by Postgres; deferred so normal reads don't carry it
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=False))
+
+    # Partitioned on status, then closed issues by created_at month (see
+    # app.services.issue_partitions). Postgres wants the partition keys in
+    # the primary key, so it cannot enforce id alone as unique; ids stay
+    # unique because they only come from issues_id_seq (see
+    # duplicate_issue_ids), and id alone is the ORM identity.
+    __table_args__ = (
+        PrimaryKeyConstraint('id', 'status', 'created_at', name='issues_pkey'),
+        {'postgresql_partition_by': 'LIST (status)'},
+    )
+
+    @declared_attr.directive
+    def __mapper_args__(cls):
+        return {'primary_key': [cls.__table__.c.id]}
+
+
+# Serve "order by created_at/id" as an index range scan per partition (read
+# backwards for sort=asc); a status filter prunes to that status's partitions,
+# so no (status, created_at, id) index is needed.
+Index('ix_issues_created_at_id', Issue.created_at.desc(), Issue.id.desc())
+Index('ix_issues_search_vector', Issue.search_vector, postgresql_using='gin')
+# The change feed's "(updated_at, id) > cursor" order (app.services.issue_changes)
+Index('ix_issues_updated_at_id', Issue.updated_at, Issue.id)
+# ix_issues_title_trgm (gin_trgm_ops on title, for /issues/suggest) is only
+# created by its migration, since it needs the pg_trgm extension installed.
+
+
+# The fixed partitions; monthly ones for closed issues are added by
+# app.services.issue_partitions. Mirrors the partition_issues_table migration.
+PARTITIONS_SQL = """
+CREATE TABLE issues_open PARTITION OF issues FOR VALUES IN ('open');
+CREATE TABLE issues_closed PARTITION OF issues FOR VALUES IN ('closed') PARTITION BY RANGE (created_at);
+CREATE TABLE issues_closed_default PARTITION OF issues_closed DEFAULT;
+"""
+
+event.listen(Issue.__table__, 'after_create', DDL(PARTITIONS_SQL))
+
+
+# Same trigger as the issues migration, so schemas built with create_all
+# (the test suite) also bump updated_at on every UPDATE, bulk ones included.
+UPDATED_AT_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = EXTRACT(EPOCH FROM NOW())::INTEGER;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+"""
+
+UPDATED_AT_TRIGGER_SQL = """
+CREATE TRIGGER update_issues_updated_at
+    BEFORE UPDATE ON issues
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+"""
+
+for statement in (UPDATED_AT_FUNCTION_SQL, UPDATED_AT_TRIGGER_SQL):
+    event.listen(Issue.__table__, 'after_create', DDL(statement))
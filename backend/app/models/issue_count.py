@@ -0,0 +1,96 @@
+from sqlalchemy import BigInteger, Column, DDL, Enum, event
+from app.database import Base
+from app.models.issue import Issue, IssueStatus
+
+
+class IssueCount(Base):
+    """Per-status issue totals, maintained by triggers on the issues table"""
+    __tablename__ = 'issue_counts'
+
+    status = Column(
+        Enum(IssueStatus, values_callable=lambda x: [e.value for e in x], name='issue_status', native_enum=True),
+        primary_key=True
+    )
+    count = Column(BigInteger, nullable=False, server_default='0')
+
+
+# The counters are seeded from, and triggered by, the issues table
+IssueCount.__table__.add_is_dependent_on(Issue.__table__)
+
+# Mirrors the create_issue_counts_table migration so that schemas built with
+# metadata.create_all (tests, local development) keep the counters current too.
+ISSUE_COUNTS_SEED_SQL = """
+    INSERT INTO issue_counts (status, count)
+    SELECT s.status, COUNT(i.id)
+    FROM unnest(enum_range(NULL::issue_status)) AS s(status)
+    LEFT JOIN issues i ON i.status = s.status
+    GROUP BY s.status
+    ON CONFLICT (status) DO UPDATE SET count = EXCLUDED.count
+"""
+
+ISSUE_COUNTS_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION update_issue_counts()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        changed RECORD;
+    BEGIN
+        -- Deltas are applied in status order so that concurrent statements
+        -- touching both counters always lock them in the same order.
+        IF TG_OP = 'INSERT' THEN
+            FOR changed IN
+                SELECT status, COUNT(*) AS delta FROM new_rows GROUP BY status ORDER BY status
+            LOOP
+                UPDATE issue_counts SET count = count + changed.delta WHERE status = changed.status;
+            END LOOP;
+        ELSIF TG_OP = 'DELETE' THEN
+            FOR changed IN
+                SELECT status, COUNT(*) AS delta FROM old_rows GROUP BY status ORDER BY status
+            LOOP
+                UPDATE issue_counts SET count = count - changed.delta WHERE status = changed.status;
+            END LOOP;
+        ELSE
+            FOR changed IN
+                SELECT status, SUM(delta) AS delta
+                FROM (
+                    SELECT status, 1 AS delta FROM new_rows
+                    UNION ALL
+                    SELECT status, -1 AS delta FROM old_rows
+                ) AS changes
+                GROUP BY status
+                HAVING SUM(delta) <> 0
+                ORDER BY status
+            LOOP
+                UPDATE issue_counts SET count = count + changed.delta WHERE status = changed.status;
+            END LOOP;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ language 'plpgsql';
+"""
+
+ISSUE_COUNTS_TRIGGERS_SQL = """
+    DROP TRIGGER IF EXISTS update_issue_counts_on_insert ON issues;
+    DROP TRIGGER IF EXISTS update_issue_counts_on_update ON issues;
+    DROP TRIGGER IF EXISTS update_issue_counts_on_delete ON issues;
+
+    CREATE TRIGGER update_issue_counts_on_insert
+        AFTER INSERT ON issues
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION update_issue_counts();
+
+    CREATE TRIGGER update_issue_counts_on_update
+        AFTER UPDATE ON issues
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION update_issue_counts();
+
+    CREATE TRIGGER update_issue_counts_on_delete
+        AFTER DELETE ON issues
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION update_issue_counts();
+"""
+
+for statement in (ISSUE_COUNTS_SEED_SQL, ISSUE_COUNTS_FUNCTION_SQL, ISSUE_COUNTS_TRIGGERS_SQL):
+    event.listen(IssueCount.__table__, 'after_create', DDL(statement))
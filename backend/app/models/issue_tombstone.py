@@ -0,0 +1,48 @@
+from sqlalchemy import Column, DDL, Index, Integer, event, text
+from app.database import Base
+from app.models.issue import Issue
+
+
+class IssueTombstone(Base):
+    """The ids of deleted issues, for the change feed; written by a trigger on the issues table"""
+    __tablename__ = 'issue_tombstones'
+
+    issue_id = Column(Integer, primary_key=True, autoincrement=False)
+    deleted_at = Column(Integer, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW())::INTEGER"))
+
+
+# Serves the change feed's "(deleted_at, issue_id) > cursor" range scans
+Index('ix_issue_tombstones_deleted_at_issue_id', IssueTombstone.deleted_at, IssueTombstone.issue_id)
+
+# Triggered by the issues table
+IssueTombstone.__table__.add_is_dependent_on(Issue.__table__)
+
+# Mirrors the add_issue_change_feed migration. A statement-level trigger on
+# the partitioned table fires for DELETE FROM issues only: rows that change
+# status move between partitions without firing it, and partition
+# maintenance deletes from the partitions themselves, so neither leaves a
+# tombstone for an issue that still exists.
+ISSUE_TOMBSTONES_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION record_issue_tombstones()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        INSERT INTO issue_tombstones (issue_id)
+        SELECT id FROM old_rows
+        ON CONFLICT (issue_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+        RETURN NULL;
+    END;
+    $$ language 'plpgsql';
+"""
+
+ISSUE_TOMBSTONES_TRIGGER_SQL = """
+    DROP TRIGGER IF EXISTS record_issue_tombstones_on_delete ON issues;
+
+    CREATE TRIGGER record_issue_tombstones_on_delete
+        AFTER DELETE ON issues
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION record_issue_tombstones();
+"""
+
+for statement in (ISSUE_TOMBSTONES_FUNCTION_SQL, ISSUE_TOMBSTONES_TRIGGER_SQL):
+    event.listen(IssueTombstone.__table__, 'after_create', DDL(statement))
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, Dict, List, Optional
 from app.schemas.base import BaseSchema, TimestampSchema
 from app.models.issue import IssueStatus
 
@@ -9,6 +9,9 @@ TITLE_FIELD_CONSTRAINTS = {
     "description": "Issue title (1-200 characters)"
 }
 
+# Largest value of a Postgres INTEGER, the type of ids and timestamps
+MAX_INTEGER = 2**31 - 1
+
 DESCRIPTION_FIELD_CONSTRAINTS = {
     "min_length": 1,
     "max_length": 5000,
@@ -52,6 +55,12 @@ class IssueCreate(IssueBase):
         return validate_and_strip_text(v)
 
 
+class IssueImportRecord(IssueCreate):
+    created_at: Optional[int] = Field(
+        default=None, ge=0, le=MAX_INTEGER, description="Original creation time (epoch seconds, not milliseconds)"
+    )
+
+
 class IssueUpdate(BaseSchema):
     title: Optional[str] = Field(default=None, **TITLE_FIELD_CONSTRAINTS)
     description: Optional[str] = Field(default=None, **DESCRIPTION_FIELD_CONSTRAINTS)
@@ -79,9 +88,86 @@ class IssueResponse(IssueBase, TimestampSchema):
     created_at: int
     updated_at: int
 
+class IssueSuggestion(BaseSchema):
+    id: int
+    title: str
+    status: IssueStatus
+
+
 class PaginatedIssueResponse(BaseModel):
     items: List[IssueResponse]
     total: int
     page: int
     per_page: int
     total_pages: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class PaginatedSparseIssueResponse(PaginatedIssueResponse):
+    """A list page narrowed with `fields` or `view=summary`: items hold only the requested keys"""
+    items: List[Dict[str, Any]]
+
+
+class IssueFilter(BaseModel):
+    status: Optional[IssueStatus] = Field(default=None, description="Only issues with this status")
+    created_before: Optional[int] = Field(default=None, description="Only issues created before this epoch second")
+    created_after: Optional[int] = Field(default=None, description="Only issues created at or after this epoch second")
+
+
+class IssueSelection(BaseModel):
+    """Selects issues by explicit ids, by filter, or both (combined with AND)"""
+    ids: Optional[List[int]] = Field(default=None, min_length=1)
+    filter: Optional[IssueFilter] = None
+
+    @model_validator(mode='after')
+    def validate_has_criteria(self):
+        has_filter = self.filter is not None and bool(self.filter.model_dump(exclude_none=True))
+        if not self.ids and not has_filter:
+            raise ValueError("Provide ids or at least one filter criterion")
+        return self
+
+
+class IssueBulkUpdate(IssueSelection):
+    patch: IssueUpdate
+
+    @field_validator('patch')
+    @classmethod
+    def validate_patch_not_empty(cls, v: IssueUpdate) -> IssueUpdate:
+        if not v.model_dump(exclude_unset=True, exclude_none=True):
+            raise ValueError("patch must set at least one field")
+        return v
+
+
+class IssueBulkResult(BaseModel):
+    ids: Optional[List[int]] = Field(..., description="The affected ids; null when more than BULK_MAX_ITEMS issues were affected")
+    count: int
+
+
+class IssueBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, description="Issue ids, in the order the items should come back")
+
+
+class IssueBatchResponse(BaseModel):
+    items: List[IssueResponse]
+    missing: List[int] = Field(default_factory=list, description="Requested ids with no issue, in request order")
+
+
+class IssueTombstoneResponse(BaseSchema):
+    id: int
+    deleted_at: int
+
+
+class IssueChangesResponse(BaseModel):
+    items: List[IssueResponse] = Field(..., description="Issues created or updated since the cursor, as they are now")
+    deleted: List[IssueTombstoneResponse] = Field(..., description="Issues deleted or archived since the cursor")
+    next_cursor: Optional[str] = Field(None, description="Pass as since= to continue; unchanged when nothing changed")
+    has_more: bool
+
+
+class IssueImportResult(BaseModel):
+    imported: int
+    rejected: int
+    seconds: float
+    rows_per_second: float
+    rejects: List[Dict[str, Any]] = Field(default_factory=list, description="The first rejected records, by line")
@@ -0,0 +1,109 @@
+"""
+Validation and statement building for multi-issue writes.
+"""
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import Delete, Insert, Select, String, Update, cast, delete, distinct, func, insert, select, update
+from app.models.issue import Issue
+from app.schemas.issue import IssueBulkResult, IssueCreate, IssueSelection, IssueUpdate
+from app.services.issue_writes import RESPONSE_COLUMNS
+
+
+class BulkValidationError(ValueError):
+    """Raised with the per-item errors when any item of a bulk request is invalid"""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__(f"{len(errors)} item(s) failed validation")
+        self.errors = errors
+
+
+def validate_bulk_create(items: List[Any]) -> List[IssueCreate]:
+    """Validate every item against IssueCreate, collecting all failures before raising"""
+    validated = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            validated.append(IssueCreate.model_validate(item))
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "errors": e.errors(include_url=False, include_context=False, include_input=False)
+            })
+
+    if errors:
+        raise BulkValidationError(errors)
+    return validated
+
+
+def bulk_insert_statement() -> Insert:
+    """
+    INSERT ... RETURNING of the response columns. Executed with a list of
+    parameter dicts, SQLAlchemy batches it into multi-row VALUES statements
+    and keeps the returned rows in parameter order. Plain rows, not ORM
+    instances: those would be expired by the commit and reloaded one
+    SELECT each while the response is serialized.
+    """
+    return insert(Issue).returning(*RESPONSE_COLUMNS, sort_by_parameter_order=True)
+
+
+def bulk_insert_params(issues: List[IssueCreate]) -> List[Dict[str, Any]]:
+    return [
+        {"title": issue.title, "description": issue.description, "status": issue.status}
+        for issue in issues
+    ]
+
+
+def selection_criteria(selection: IssueSelection) -> list:
+    criteria = []
+    if selection.ids:
+        criteria.append(Issue.id.in_(selection.ids))
+    if selection.filter is not None:
+        if selection.filter.status is not None:
+            criteria.append(Issue.status == selection.filter.status)
+        if selection.filter.created_before is not None:
+            criteria.append(Issue.created_at < selection.filter.created_before)
+        if selection.filter.created_after is not None:
+            criteria.append(Issue.created_at >= selection.filter.created_after)
+    return criteria
+
+
+def affected_summary_statement(statement: Update | Delete, id_limit: int) -> Select:
+    """
+    Run a bulk UPDATE/DELETE as a CTE and return one row: how many issues it
+    touched, their statuses, and at most `id_limit` + 1 of their ids. A
+    filter can match millions of rows; this keeps the response, and what
+    crosses the wire, bounded by `id_limit` however many were affected.
+    """
+    affected = statement.returning(Issue.id, Issue.status).cte("affected")
+    some_ids = select(affected.c.id).limit(id_limit + 1).subquery()
+    return select(
+        select(func.count()).select_from(affected).scalar_subquery().label("count"),
+        select(func.array_agg(distinct(cast(affected.c.status, String)))).scalar_subquery().label("statuses"),
+        select(func.array_agg(some_ids.c.id)).scalar_subquery().label("ids"),
+    )
+
+
+def bulk_result(summary, id_limit: int) -> IssueBulkResult:
+    """The response for an `affected_summary_statement` row; ids are left out past `id_limit`"""
+    ids: Optional[List[int]] = list(summary.ids or [])
+    if summary.count > id_limit:
+        ids = None
+    return IssueBulkResult(ids=ids, count=summary.count)
+
+
+def bulk_update_statement(selection: IssueSelection, patch: IssueUpdate, id_limit: int) -> Select:
+    """
+    One set-based UPDATE ... WHERE, summarized by `affected_summary_statement`.
+    Row triggers still fire, so updated_at is set per row and the status
+    counters stay current.
+    """
+    return affected_summary_statement(
+        update(Issue)
+        .where(*selection_criteria(selection))
+        .values(**patch.model_dump(exclude_unset=True, exclude_none=True)),
+        id_limit
+    )
+
+
+def bulk_delete_statement(selection: IssueSelection, id_limit: int) -> Select:
+    return affected_summary_statement(delete(Issue).where(*selection_criteria(selection)), id_limit)
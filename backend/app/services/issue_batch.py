@@ -0,0 +1,48 @@
+"""
+Fetching many issues by id in one query.
+
+The ids travel as a single array parameter (`id = ANY(:ids)`), so every
+batch size shares one statement text and one cached query plan, unlike an
+IN list with a placeholder per id. Ids outside the INTEGER range the array
+is cast to cannot exist; they are left out of the query and come back as
+missing.
+"""
+from typing import Iterable, List, Sequence
+from sqlalchemy import ARRAY, Integer, Select, any_, bindparam, select
+from app.models.issue import Issue
+from app.schemas.issue import MAX_INTEGER, IssueBatchResponse, IssueResponse
+from app.services.issue_writes import RESPONSE_COLUMNS
+
+
+class InvalidBatchIdsError(ValueError):
+    pass
+
+
+def parse_batch_ids(ids: str) -> List[int]:
+    """The ids of a comma-separated `ids` query parameter. Raises InvalidBatchIdsError."""
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise InvalidBatchIdsError("ids must be comma-separated integers")
+    if not parsed:
+        raise InvalidBatchIdsError("ids must name at least one issue")
+    return parsed
+
+
+def unique_ids(ids: Iterable[int]) -> List[int]:
+    """`ids` without repeats, in the order first requested"""
+    return list(dict.fromkeys(ids))
+
+
+def batch_statement(ids: Sequence[int]) -> Select:
+    in_range = [issue_id for issue_id in ids if 0 < issue_id <= MAX_INTEGER]
+    return select(*RESPONSE_COLUMNS).where(Issue.id == any_(bindparam("ids", in_range, type_=ARRAY(Integer))))
+
+
+def build_batch_response(ids: Sequence[int], rows) -> IssueBatchResponse:
+    """The rows in the order of `ids`, and the ids no row was found for"""
+    found = {row.id: row for row in rows}
+    return IssueBatchResponse(
+        items=[IssueResponse.model_validate(found[issue_id]) for issue_id in ids if issue_id in found],
+        missing=[issue_id for issue_id in ids if issue_id not in found],
+    )
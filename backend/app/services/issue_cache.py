@@ -0,0 +1,87 @@
+"""
+Response cache for issue reads.
+
+List pages are keyed by ("list", status_filter, sort, page, cursor, q) and
+details by ("detail", issue_id). Writes invalidate the detail entry plus
+only the list entries whose status bucket the written issue belongs to:
+the unfiltered lists and the lists filtered on its old or new status.
+
+Title suggestions live in their own `suggest_cache`, keyed by the
+lower-cased prefix and limit, so keystroke bursts don't evict list pages.
+Any write may change a title, so every write clears it.
+
+The cache is per process; with several workers, other processes may serve
+a page for up to CACHE_TTL_SECONDS after a write.
+"""
+from typing import Hashable, Iterable, NamedTuple, Optional, Tuple
+from app.config import settings
+from app.core.cache import TTLCache
+from app.models.issue import IssueStatus
+
+LIST_KEY = "list"
+DETAIL_KEY = "detail"
+SUGGEST_KEY = "suggest"
+
+
+class CachedResponse(NamedTuple):
+    """A serialized JSON response body with the validators it is served with"""
+    body: bytes
+    etag: str
+    last_modified: Optional[int] = None
+
+
+issue_cache = TTLCache(
+    max_entries=settings.CACHE_MAX_ENTRIES if settings.CACHE_ENABLED else 0,
+    ttl_seconds=settings.CACHE_TTL_SECONDS
+)
+
+suggest_cache = TTLCache(
+    max_entries=settings.SUGGEST_CACHE_MAX_ENTRIES if settings.CACHE_ENABLED else 0,
+    ttl_seconds=settings.SUGGEST_CACHE_TTL_SECONDS
+)
+
+
+def list_cache_key(
+    status_filter: Optional[str],
+    sort: Optional[str],
+    page: int,
+    cursor: Optional[str],
+    q: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
+) -> Hashable:
+    return (LIST_KEY, status_filter or None, "asc" if sort == "asc" else "desc", page, cursor, q, fields)
+
+
+def detail_cache_key(issue_id: int) -> Hashable:
+    return (DETAIL_KEY, issue_id)
+
+
+def suggest_cache_key(prefix: str, limit: int) -> Hashable:
+    # pg_trgm and ILIKE both ignore case, so neither does the key
+    return (SUGGEST_KEY, prefix.lower(), limit)
+
+
+def _status_value(issue_status) -> str:
+    return issue_status.value if isinstance(issue_status, IssueStatus) else issue_status
+
+
+def invalidate_issue(issue_id: Optional[int], statuses: Iterable) -> None:
+    """Drop the issue's detail entry and every list page that could contain it"""
+    invalidate_issues([] if issue_id is None else [issue_id], statuses)
+
+
+def invalidate_issues(issue_ids: Optional[Iterable[int]], statuses: Iterable) -> None:
+    """
+    Drop the detail entries for `issue_ids` (every detail entry when None)
+    and the list pages of `statuses`, in one pass
+    """
+    buckets = {None} | {_status_value(issue_status) for issue_status in statuses}
+    detail_keys = None if issue_ids is None else {detail_cache_key(issue_id) for issue_id in issue_ids}
+
+    def _is_affected(key) -> bool:
+        if key[0] == LIST_KEY:
+            return key[1] in buckets
+        return detail_keys is None or key in detail_keys
+
+    issue_cache.invalidate_where(_is_affected)
+    suggest_cache.clear()
@@ -0,0 +1,160 @@
+"""
+The change feed: issues created, updated and deleted after a cursor.
+
+Changes are ordered by (changed_at, id), where changed_at is updated_at
+for live issues (served by ix_issues_updated_at_id) and deleted_at for
+issue_tombstones rows, which a trigger writes on DELETE FROM issues
+(see app.models.issue_tombstone). Each side is one keyset range scan of
+at most limit + 1 rows; the two are merged here, and the cursor is the
+position of the last change returned.
+
+updated_at is set from the writing transaction's start time, with one
+second resolution, and becomes visible only when it commits, however long
+after that. So a page stops before the start of the oldest transaction
+still in flight, as well as `settle_seconds` short of the current time;
+settled_before_statement reads that bound from pg_stat_activity before the
+page's statements take their snapshots, and a change stamped at or before
+it has either committed and is visible to them or rolled back.
+
+Tombstones are pruned after the feed's retention (prune_tombstones), so a
+cursor older than that may have missed deletions and is refused. An empty
+page moves the cursor up to the bound it was read at, so a client polling
+a quiet feed keeps a cursor within the retention.
+"""
+import heapq
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import Integer, Select, bindparam, cast, column, delete, extract, func, literal, select, table, tuple_
+from sqlalchemy.orm import Session
+from app.core.pagination import decode_change_cursor, encode_change_cursor
+from app.models.issue import Issue
+from app.models.issue_tombstone import IssueTombstone
+from app.schemas.issue import MAX_INTEGER, IssueChangesResponse, IssueResponse, IssueTombstoneResponse
+from app.services.issue_partitions import DAY
+from app.services.issue_writes import RESPONSE_COLUMNS
+
+CHANGES_DEFAULT_LIMIT = 100
+CHANGES_MAX_LIMIT = 1000
+
+
+_pg_stat_activity = table(
+    "pg_stat_activity", column("datname"), column("pid"), column("backend_type"), column("xact_start")
+)
+
+
+class ExpiredCursorError(ValueError):
+    """The cursor is older than the tombstones kept for the feed"""
+
+
+class ChangeFeedQuery(NamedTuple):
+    changed: Select
+    deleted: Select
+    after: Optional[Tuple[int, int]]
+    limit: int
+
+
+def _epoch(timestamp):
+    return cast(extract("epoch", timestamp), Integer)
+
+
+def settled_before_statement(settle_seconds: int) -> Select:
+    """
+    The newest changed_at the feed returns yet, bound as `settled_before` in
+    the page's statements. Run it first: pg_stat_activity is read once per
+    transaction, and a writer that commits between this and their snapshots
+    is then visible to them. Sessions of other roles need pg_read_all_stats
+    to be seen, and a long transaction of any kind holds the feed back.
+    """
+    oldest_in_flight = (
+        select(func.min(_pg_stat_activity.c.xact_start))
+        .where(
+            _pg_stat_activity.c.datname == func.current_database(),
+            _pg_stat_activity.c.pid != func.pg_backend_pid(),
+            _pg_stat_activity.c.backend_type == "client backend",
+        )
+        .scalar_subquery()
+    )
+    # LEAST ignores the NULL of no transaction in flight
+    return select(func.least(_epoch(func.now()) - settle_seconds, _epoch(oldest_in_flight) - 1))
+
+
+def retention_horizon(now: int, retention_days: int) -> Optional[int]:
+    """The oldest deleted_at kept in issue_tombstones; None when they are kept forever"""
+    return now - retention_days * DAY if retention_days else None
+
+
+def prune_tombstones(db: Session, now: int, retention_days: int) -> int:
+    """Delete tombstones older than the feed's retention; returns how many"""
+    horizon = retention_horizon(now, retention_days)
+    if horizon is None:
+        return 0
+    return db.execute(delete(IssueTombstone).where(IssueTombstone.deleted_at < horizon)).rowcount
+
+
+def _after(key, after: Optional[Tuple[int, int]]):
+    return key > tuple_(literal(after[0]), literal(after[1]))
+
+
+def build_change_feed_query(since: Optional[str], limit: int, horizon: Optional[int]) -> ChangeFeedQuery:
+    """
+    The two statements of a change feed page, which take the result of
+    settled_before_statement as the `settled_before` parameter. Raises
+    InvalidCursorError, and ExpiredCursorError for a cursor before `horizon`.
+    """
+    after = decode_change_cursor(since) if since else None
+    if after is not None and horizon is not None and after[0] < horizon:
+        raise ExpiredCursorError(since)
+    settled_before = bindparam("settled_before", type_=Integer)
+
+    changed = (
+        select(*RESPONSE_COLUMNS)
+        .where(Issue.updated_at <= settled_before)
+        .order_by(Issue.updated_at, Issue.id)
+        .limit(limit + 1)
+    )
+    deleted = (
+        select(IssueTombstone.issue_id.label("id"), IssueTombstone.deleted_at)
+        .where(IssueTombstone.deleted_at <= settled_before)
+        .order_by(IssueTombstone.deleted_at, IssueTombstone.issue_id)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        changed = changed.where(_after(tuple_(Issue.updated_at, Issue.id), after))
+        deleted = deleted.where(_after(tuple_(IssueTombstone.deleted_at, IssueTombstone.issue_id), after))
+
+    return ChangeFeedQuery(changed, deleted, after, limit)
+
+
+def build_change_page(
+    query: ChangeFeedQuery, changed_rows: Sequence, deleted_rows: Sequence, settled_before: int
+) -> IssueChangesResponse:
+    """
+    The first `limit` changes of both statements' rows, in (changed_at, id)
+    order; `settled_before` is the bound the statements were run with.
+    """
+    merged = heapq.merge(
+        ((row.updated_at, row.id, False, row) for row in changed_rows),
+        ((row.deleted_at, row.id, True, row) for row in deleted_rows),
+    )
+    changes = list(merged)
+    has_more = len(changes) > query.limit
+    changes = changes[:query.limit]
+
+    items: List[IssueResponse] = []
+    deleted: List[IssueTombstoneResponse] = []
+    for _, _, is_deletion, row in changes:
+        if is_deletion:
+            deleted.append(IssueTombstoneResponse.model_validate(row))
+        else:
+            items.append(IssueResponse.model_validate(row))
+
+    if changes:
+        changed_at, issue_id, _, _ = changes[-1]
+        next_cursor = encode_change_cursor(changed_at, issue_id)
+    elif query.after is not None:
+        # Every change up to settled_before has been seen, and any later one
+        # is stamped after it
+        next_cursor = encode_change_cursor(*max(query.after, (settled_before, MAX_INTEGER)))
+    else:
+        next_cursor = None
+
+    return IssueChangesResponse(items=items, deleted=deleted, next_cursor=next_cursor, has_more=has_more)
@@ -0,0 +1,45 @@
+from typing import Dict, Optional
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.orm import Session
+from app.models.issue import Issue, IssueStatus
+from app.models.issue_count import IssueCount, ISSUE_COUNTS_SEED_SQL
+
+
+def issue_total_statement(status: Optional[str] = None) -> Select:
+    """SELECT the issue total from the trigger-maintained counters instead of COUNT(*)"""
+    statement = select(func.coalesce(func.sum(IssueCount.count), 0))
+    if status:
+        statement = statement.where(IssueCount.status == status)
+    return statement
+
+
+def get_issue_total(db: Session, status: Optional[str] = None) -> int:
+    return int(db.execute(issue_total_statement(status)).scalar_one())
+
+
+def reconcile_issue_counts(db: Session) -> Dict[str, Dict[str, int]]:
+    """
+    Rebuild issue_counts from the issues table.
+
+    Takes a SHARE lock on issues so no writes land between the COUNT and the
+    rewrite. Returns the stored and actual count per status, and leaves the
+    commit to the caller.
+    """
+    db.execute(text("LOCK TABLE issues IN SHARE MODE"))
+    db.execute(text("LOCK TABLE issue_counts IN EXCLUSIVE MODE"))
+
+    stored = {row.status.value: row.count for row in db.query(IssueCount)}
+    actual = {
+        issue_status.value: count
+        for issue_status, count in db.query(Issue.status, func.count(Issue.id)).group_by(Issue.status)
+    }
+
+    db.execute(text(ISSUE_COUNTS_SEED_SQL))
+
+    return {
+        issue_status.value: {
+            "stored": stored.get(issue_status.value, 0),
+            "actual": actual.get(issue_status.value, 0),
+        }
+        for issue_status in IssueStatus
+    }
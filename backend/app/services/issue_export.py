@@ -0,0 +1,66 @@
+"""
+Full-table issue export as NDJSON or CSV.
+
+Rows are read as plain column tuples through a server-side cursor in
+batches of EXPORT_BATCH_SIZE, so neither the ORM identity map nor the
+response buffer grows with the size of the table.
+"""
+import csv
+import io
+import json
+from typing import Iterable, List, Optional, Sequence
+from sqlalchemy import Select, select
+from app.models.issue import Issue
+from app.services.issues import keyset_order
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+EXPORT_COLUMNS = ("id", "title", "description", "status", "created_at", "updated_at")
+
+
+def export_statement(status_filter: Optional[str], sort: Optional[str]) -> Select:
+    statement = select(
+        Issue.id, Issue.title, Issue.description, Issue.status, Issue.created_at, Issue.updated_at
+    )
+    if status_filter:
+        statement = statement.where(Issue.status == status_filter)
+    return statement.order_by(*keyset_order(sort != "asc")).execution_options(
+        stream_results=True, yield_per=EXPORT_BATCH_SIZE
+    )
+
+
+def export_filename(export_format: str) -> str:
+    return f"issues.{export_format}"
+
+
+def _row_values(row: Sequence) -> List:
+    issue_id, title, description, issue_status, created_at, updated_at = row
+    return [issue_id, title, description, issue_status.value, created_at, updated_at]
+
+
+def export_header(export_format: str) -> str:
+    """Bytes written before the first row; CSV gets its header line, NDJSON nothing"""
+    if export_format == "csv":
+        return format_rows(export_format, [], header=True)
+    return ""
+
+
+def format_rows(export_format: str, rows: Iterable[Sequence], header: bool = False) -> str:
+    """Serialize one batch of rows into a single chunk of the response body"""
+    if export_format == "ndjson":
+        return "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, _row_values(row))), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(_row_values(row) for row in rows)
+    return buffer.getvalue()
@@ -0,0 +1,610 @@
+"""
+The /issues endpoints' logic, shared by the sync and async stacks.
+
+Each handler is driven by app.core.handlers.run_handler (Session) or
+run_handler_async (AsyncSession): validation, caching, conditional requests
+and error mapping live here once, and the endpoint modules only bind the
+request parameters and the session.
+"""
+import csv
+import io
+import logging
+import time
+from typing import Any, BinaryIO, Callable, List, NamedTuple, Optional
+from fastapi import HTTPException, Request, status
+from fastapi.responses import Response, StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import Select, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.handlers import COMMIT, ROLLBACK, Execute, Handler
+from app.core.http_cache import is_conditional, is_not_modified, json_response, not_modified_response
+from app.core.pagination import InvalidCursorError
+from app.core.replicas import ReadSource
+from app.models.issue import Issue, IssueStatus
+from app.schemas.issue import (
+    IssueBulkResult,
+    IssueBulkUpdate,
+    IssueCreate,
+    IssueImportResult,
+    IssueResponse,
+    IssueSelection,
+    IssueSuggestion,
+    IssueUpdate,
+)
+from app.services.bulk_issues import (
+    BulkValidationError,
+    bulk_delete_statement,
+    bulk_insert_params,
+    bulk_insert_statement,
+    bulk_result,
+    bulk_update_statement,
+    validate_bulk_create,
+)
+from app.services.issue_batch import InvalidBatchIdsError, batch_statement, build_batch_response, parse_batch_ids, unique_ids
+from app.services.issue_cache import (
+    CachedResponse,
+    detail_cache_key,
+    invalidate_issue,
+    invalidate_issues,
+    issue_cache,
+    list_cache_key,
+    suggest_cache,
+    suggest_cache_key,
+)
+from app.services.issue_changes import (
+    ExpiredCursorError,
+    build_change_feed_query,
+    build_change_page,
+    retention_horizon,
+    settled_before_statement,
+)
+from app.services.issue_export import EXPORT_MEDIA_TYPES, export_filename, export_header, export_statement, format_rows
+from app.services.issue_import import (
+    IMPORT_FORMATS,
+    IMPORT_MAX_REPORTED_REJECTS,
+    ImportReport,
+    RejectedRecord,
+    import_format_for,
+    import_issues,
+    import_issues_async,
+)
+from app.services.issue_suggest import SUGGEST_MIN_LENGTH, suggest_statement
+from app.services.issue_writes import create_statement, delete_statement, select_statement, update_statement
+from app.services.issues import (
+    VALID_STATUS_FILTERS,
+    InvalidFieldsError,
+    build_issue_page,
+    build_issue_page_query,
+    detail_etag,
+    detail_etag_for,
+    detail_validator_statement,
+    issue_count_statement,
+    issue_row_versions,
+    list_etag,
+    list_validator_statement,
+    normalize_search,
+    parse_list_fields,
+    sparse_page_statement,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _validate_status_filter(status_filter: Optional[str]) -> None:
+    if status_filter and status_filter not in VALID_STATUS_FILTERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="status_filter must be 'open' or 'closed'"
+        )
+
+
+def _cache_lookup(cache: TTLCache, key, source: ReadSource):
+    """`cache.lookup`, except that reads pinned to the primary never get a cached response"""
+    if source.pinned:
+        return None, cache.generation
+    return cache.lookup(key)
+
+
+def _cache_store(cache: TTLCache, key, value, generation: int, source: ReadSource) -> None:
+    # A lagging replica's result would outlive the invalidation of the write it misses
+    if not source.replica:
+        cache.store(key, value, generation)
+
+
+def list_issues(
+    request: Request,
+    source: ReadSource,
+    status_filter: Optional[str],
+    sort: Optional[str],
+    page: int,
+    cursor: Optional[str],
+    q: Optional[str],
+    fields: Optional[str],
+    view: Optional[str]
+) -> Handler[Response]:
+    try:
+        _validate_status_filter(status_filter)
+
+        try:
+            item_fields = parse_list_fields(fields, view)
+        except InvalidFieldsError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        q = normalize_search(q)
+        cache_key = list_cache_key(status_filter, sort, page, cursor, q, item_fields)
+        cached, cache_generation = _cache_lookup(issue_cache, cache_key, source)
+        if cached is not None:
+            if is_not_modified(request, cached.etag):
+                return not_modified_response(cached.etag)
+            return json_response(cached.body, cached.etag)
+
+        try:
+            page_query = build_issue_page_query(status_filter, sort, page, cursor, q)
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="cursor is invalid"
+            )
+
+        total = int((yield Execute(issue_count_statement(status_filter, q))).scalar_one())
+
+        if item_fields is not None:
+            # The narrow rows are as cheap as the validator query, and are the page's validator
+            issues = (yield Execute(sparse_page_statement(page_query, item_fields))).all()
+            etag = list_etag(cache_key, total, issues)
+            if is_not_modified(request, etag):
+                return not_modified_response(etag)
+        else:
+            if is_conditional(request):
+                validator_rows = (yield Execute(list_validator_statement(page_query))).all()
+                etag = list_etag(cache_key, total, validator_rows)
+                if is_not_modified(request, etag):
+                    return not_modified_response(etag)
+
+            issues = (yield Execute(page_query.statement)).scalars().all()
+            etag = list_etag(cache_key, total, issue_row_versions(issues))
+
+        body = to_json(build_issue_page(page_query, issues, total, item_fields))
+        _cache_store(issue_cache, cache_key, CachedResponse(body, etag), cache_generation, source)
+        return json_response(body, etag)
+    except HTTPException:
+        raise
+    except SQLAlchemyError as e:
+        logger.error(f"Database error listing issues: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred while fetching issues"
+        )
+
+
+class IssueExport(NamedTuple):
+    """A validated export request; the endpoint streams `statement` through `chunk`"""
+    export_format: str
+    statement: Select
+    # Sent before the query runs, so the first byte does not wait on the database
+    header: str
+
+    def chunk(self, rows) -> str:
+        return format_rows(self.export_format, rows)
+
+    def failed(self, error: SQLAlchemyError) -> None:
+        logger.error(f"Database error exporting issues: {error}")
+
+    def response(self, body) -> StreamingResponse:
+        return StreamingResponse(
+            body,
+            media_type=EXPORT_MEDIA_TYPES[self.export_format],
+            headers={"Content-Disposition": f'attachment; filename="{export_filename(self.export_format)}"'}
+        )
+
+
+def export_issues(export_format: str, status_filter: Optional[str], sort: Optional[str]) -> IssueExport:
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="format must be 'ndjson' or 'csv'"
+        )
+    _validate_status_filter(status_filter)
+
+    return IssueExport(export_format, export_statement(status_filter, sort), export_header(export_format))
+
+
+def suggest_issues(prefix: str, limit: int, source: ReadSource) -> Handler[List[IssueSuggestion]]:
+    prefix = prefix.strip()
+    if len(prefix) < SUGGEST_MIN_LENGTH:
+        return []
+
+    cache_key = suggest_cache_key(prefix, limit)
+    cached, cache_generation = _cache_lookup(suggest_cache, cache_key, source)
+    if cached is not None:
+        return cached
+
+    try:
+        rows = (yield Execute(suggest_statement(prefix, limit))).all()
+    except SQLAlchemyError as e:
+        logger.error(f"Database error suggesting issues for {prefix!r}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred while fetching suggestions"
+        )
+
+    suggestions = [IssueSuggestion.model_validate(row) for row in rows]
+    _cache_store(suggest_cache, cache_key, suggestions, cache_generation, source)
+    return suggestions
+
+
+def list_issue_changes(since: Optional[str], limit: int) -> Handler[Response]:
+    horizon = retention_horizon(int(time.time()), settings.CHANGE_FEED_RETENTION_DAYS)
+    try:
+        query = build_change_feed_query(since, limit, horizon)
+    except ExpiredCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="since is older than the change feed keeps deletions; start again without it"
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since is not a valid cursor"
+        )
+
+    try:
+        settled_before = (yield Execute(settled_before_statement(settings.CHANGE_FEED_SETTLE_SECONDS))).scalar_one()
+        params = {"settled_before": settled_before}
+        changed_rows = (yield Execute(query.changed, params)).all()
+        deleted_rows = (yield Execute(query.deleted, params)).all()
+    except SQLAlchemyError as e:
+        logger.error(f"Database error reading issue changes: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred while fetching changes"
+        )
+
+    return Response(content=to_json(build_change_page(query, changed_rows, deleted_rows, settled_before)), media_type="application/json")
+
+
+def get_issues_batch(ids: str) -> Handler[Response]:
+    try:
+        requested = parse_batch_ids(ids)
+    except InvalidBatchIdsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return (yield from post_issues_batch(requested))
+
+
+def post_issues_batch(ids: List[int]) -> Handler[Response]:
+    ids = unique_ids(ids)
+    if len(ids) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may request at most {settings.BULK_MAX_ITEMS} issues"
+        )
+
+    try:
+        rows = (yield Execute(batch_statement(ids))).all()
+    except SQLAlchemyError as e:
+        logger.error(f"Database error fetching a batch of {len(ids)} issues: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred while fetching issues"
+        )
+
+    return Response(content=to_json(build_batch_response(ids, rows)), media_type="application/json")
+
+
+def get_issue(issue_id: int, request: Request, source: ReadSource) -> Handler[Response]:
+    try:
+        cache_key = detail_cache_key(issue_id)
+        cached, cache_generation = _cache_lookup(issue_cache, cache_key, source)
+        if cached is not None:
+            if is_not_modified(request, cached.etag, cached.last_modified):
+                return not_modified_response(cached.etag, cached.last_modified)
+            return json_response(cached.body, cached.etag, cached.last_modified)
+
+        if is_conditional(request):
+            validator = (yield Execute(detail_validator_statement(issue_id))).first()
+            if validator is not None:
+                etag = detail_etag(issue_id, validator.updated_at, validator.version)
+                if is_not_modified(request, etag, validator.updated_at):
+                    return not_modified_response(etag, validator.updated_at)
+
+        issue = (yield Execute(select(Issue).where(Issue.id == issue_id))).scalars().first()
+
+        if not issue:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Issue with id {issue_id} not found"
+            )
+
+        issue_response = IssueResponse.model_validate(issue)
+        etag = detail_etag_for(issue_response)
+        body = to_json(issue_response)
+        _cache_store(issue_cache, cache_key, CachedResponse(body, etag, issue.updated_at), cache_generation, source)
+        return json_response(body, etag, issue.updated_at)
+    except HTTPException as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail="An unexpected error occurred while fetching the issue"
+        )
+    except SQLAlchemyError as e:
+        logger.error(f"Database error fetching issue {issue_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred while fetching the issue"
+        )
+
+
+def create_issue(issue_data: IssueCreate) -> Handler[IssueResponse]:
+    try:
+        issue_response = IssueResponse.model_validate((yield Execute(create_statement(issue_data))).one())
+        yield COMMIT
+    except IntegrityError as e:
+        yield ROLLBACK
+        logger.error(f"Database integrity error creating issue: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to create issue due to data integrity constraint violation"
+        )
+    except SQLAlchemyError as e:
+        yield ROLLBACK
+        logger.error(f"Database error creating issue: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred"
+        )
+
+    invalidate_issue(issue_response.id, [issue_response.status])
+
+    return issue_response
+
+
+def create_issues_bulk(items: List[Any]) -> Handler[List[IssueResponse]]:
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A bulk request may contain at most {settings.BULK_MAX_ITEMS} issues"
+        )
+
+    try:
+        issues_data = validate_bulk_create(items)
+    except BulkValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": str(e), "errors": e.errors}
+        )
+
+    if not issues_data:
+        return []
+
+    try:
+        rows = yield Execute(bulk_insert_statement(), bulk_insert_params(issues_data))
+        issues = [IssueResponse.model_validate(row) for row in rows]
+        yield COMMIT
+    except IntegrityError as e:
+        yield ROLLBACK
+        logger.error(f"Database integrity error bulk creating issues: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to create issues due to data integrity constraint violation"
+        )
+    except SQLAlchemyError as e:
+        yield ROLLBACK
+        logger.error(f"Database error bulk creating issues: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred"
+        )
+
+    invalidate_issue(None, {issue.status for issue in issues})
+
+    return issues
+
+
+def _check_selection_size(selection: IssueSelection) -> None:
+    if selection.ids is not None and len(selection.ids) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A bulk request may select at most {settings.BULK_MAX_ITEMS} ids"
+        )
+
+
+def update_issues_bulk(bulk_data: IssueBulkUpdate) -> Handler[IssueBulkResult]:
+    _check_selection_size(bulk_data)
+
+    try:
+        summary = (yield Execute(bulk_update_statement(bulk_data, bulk_data.patch, settings.BULK_MAX_ITEMS))).one()
+        yield COMMIT
+    except IntegrityError as e:
+        yield ROLLBACK
+        logger.error(f"Database integrity error bulk updating issues: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to update issues due to data integrity constraint violation"
+        )
+    except SQLAlchemyError as e:
+        yield ROLLBACK
+        logger.error(f"Database error bulk updating issues: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred"
+        )
+
+    result = bulk_result(summary, settings.BULK_MAX_ITEMS)
+    # A status patch may have moved rows out of any bucket
+    statuses = list(IssueStatus) if bulk_data.patch.status is not None else summary.statuses or []
+    invalidate_issues(result.ids, statuses)
+
+    return result
+
+
+def delete_issues_bulk(selection: IssueSelection) -> Handler[IssueBulkResult]:
+    _check_selection_size(selection)
+
+    try:
+        summary = (yield Execute(bulk_delete_statement(selection, settings.BULK_MAX_ITEMS))).one()
+        yield COMMIT
+    except IntegrityError as e:
+        yield ROLLBACK
+        logger.error(f"Database integrity error bulk deleting issues: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to delete issues due to data integrity constraint violation"
+        )
+    except SQLAlchemyError as e:
+        yield ROLLBACK
+        logger.error(f"Database error bulk deleting issues: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred"
+        )
+
+    result = bulk_result(summary, settings.BULK_MAX_ITEMS)
+    invalidate_issues(result.ids, summary.statuses or [])
+
+    return result
+
+
+class ImportIssues(NamedTuple):
+    """COPY a stream of records into issues: import_issues or its asyncpg counterpart"""
+    stream: io.TextIOBase
+    import_format: str
+    on_reject: Callable[[RejectedRecord], None]
+
+    def run(self, db: Session) -> ImportReport:
+        return import_issues(db, self.stream, self.import_format, self.on_reject)
+
+    async def run_async(self, db: AsyncSession) -> ImportReport:
+        return await import_issues_async(db, self.stream, self.import_format, self.on_reject)
+
+
+def import_issues_upload(upload: BinaryIO, filename: Optional[str], import_format: Optional[str]) -> Handler[IssueImportResult]:
+    import_format = import_format or import_format_for(filename)
+    if import_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="format must be 'csv' or 'ndjson'"
+        )
+
+    rejects = []
+
+    def _on_reject(rejected: RejectedRecord):
+        if len(rejects) < IMPORT_MAX_REPORTED_REJECTS:
+            rejects.append(rejected._asdict())
+
+    stream = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    try:
+        report = yield ImportIssues(stream, import_format, _on_reject)
+        yield COMMIT
+    except (UnicodeDecodeError, csv.Error) as e:
+        yield ROLLBACK
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File could not be parsed as UTF-8 {import_format}: {e}"
+        )
+    except IntegrityError as e:
+        yield ROLLBACK
+        logger.error(f"Database integrity error importing issues: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to import issues due to data integrity constraint violation"
+        )
+    except SQLAlchemyError as e:
+        yield ROLLBACK
+        logger.error(f"Database error importing issues: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred"
+        )
+    finally:
+        # Leave closing the upload to Starlette
+        stream.detach()
+
+    if report.imported:
+        invalidate_issue(None, list(IssueStatus))
+
+    return IssueImportResult(
+        imported=report.imported,
+        rejected=report.rejected,
+        seconds=report.seconds,
+        rows_per_second=report.rows_per_second,
+        rejects=rejects
+    )
+
+
+def update_issue(issue_id: int, issue_data: IssueUpdate) -> Handler[IssueResponse]:
+    update_data = issue_data.model_dump(exclude_unset=True, exclude_none=True)
+
+    try:
+        if update_data:
+            issue = (yield Execute(update_statement(issue_id, update_data))).one_or_none()
+        else:
+            issue = (yield Execute(select_statement(issue_id))).one_or_none()
+
+        if not issue:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Issue with id {issue_id} not found"
+            )
+
+        issue_response = IssueResponse.model_validate(issue)
+        yield COMMIT
+    except IntegrityError as e:
+        yield ROLLBACK
+        logger.error(f"Database integrity error updating issue {issue_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to update issue due to data integrity constraint violation"
+        )
+    except SQLAlchemyError as e:
+        yield ROLLBACK
+        logger.error(f"Database error updating issue {issue_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred"
+        )
+
+    # RETURNING only has the new status; a status change may have left either bucket
+    statuses = list(IssueStatus) if "status" in update_data else [issue_response.status]
+    invalidate_issue(issue_id, statuses)
+
+    return issue_response
+
+
+def delete_issue(issue_id: int) -> Handler[None]:
+    try:
+        deleted = (yield Execute(delete_statement(issue_id))).first()
+
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Issue with id {issue_id} not found"
+            )
+
+        yield COMMIT
+    except IntegrityError as e:
+        yield ROLLBACK
+        logger.error(f"Database integrity error deleting issue {issue_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to delete issue due to data integrity constraint violation"
+        )
+    except SQLAlchemyError as e:
+        yield ROLLBACK
+        logger.error(f"Database error deleting issue {issue_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected database error occurred"
+        )
+
+    invalidate_issue(issue_id, [deleted.status])
+
+    return None
@@ -0,0 +1,230 @@
+"""
+Streaming issue import through PostgreSQL COPY.
+
+Records are parsed and validated one at a time with the IssueCreate rules
+and fed straight into `COPY issues (...) FROM STDIN`, so an import of any
+size runs in constant memory. Rejected records never reach COPY; they are
+handed to an `on_reject` callback (the CLI writes them to a side file).
+"""
+import asyncio
+import csv
+import io
+import itertools
+import json
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+import psycopg2
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.schemas.issue import IssueImportRecord
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+IMPORT_COLUMNS = ("title", "description", "status", "created_at")
+
+COPY_SQL = f"COPY issues ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+
+# Rows validated and handed to COPY per chunk
+COPY_CHUNK_ROWS = 1000
+
+# How many rejected records the upload endpoint echoes back
+IMPORT_MAX_REPORTED_REJECTS = 100
+
+
+class RejectedRecord(NamedTuple):
+    line: int
+    errors: List[Dict[str, Any]]
+    record: Any
+
+    def to_json(self) -> str:
+        return json.dumps(self._asdict(), ensure_ascii=False, default=str)
+
+
+class ImportReport(NamedTuple):
+    imported: int
+    rejected: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.imported / self.seconds if self.seconds > 0 else 0.0
+
+
+class ImportCounter:
+    def __init__(self):
+        self.imported = 0
+        self.rejected = 0
+
+    def report(self, seconds: float) -> ImportReport:
+        return ImportReport(self.imported, self.rejected, seconds)
+
+
+def import_format_for(filename: Optional[str]) -> Optional[str]:
+    """Guess the import format from a file extension"""
+    if filename:
+        extension = filename.rsplit(".", 1)[-1].lower()
+        if extension in IMPORT_FORMATS:
+            return extension
+        if extension in ("jsonl", "json"):
+            return "ndjson"
+    return None
+
+
+def iter_records(stream: TextIO, import_format: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, parsed record) pairs; unparseable NDJSON lines yield a RejectedRecord"""
+    if import_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            # Empty cells mean "use the default", as an omitted NDJSON key does
+            yield reader.line_num, {key: value for key, value in row.items() if value != ""}
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, RejectedRecord(
+                line_number, [{"type": "json_invalid", "loc": [], "msg": str(e)}], line.rstrip("\n")
+            )
+
+
+def validated_rows(
+    records: Iterator[Tuple[int, Any]],
+    counter: ImportCounter,
+    on_reject: Callable[[RejectedRecord], None],
+    default_created_at: Optional[int] = None
+) -> Iterator[Tuple[str, str, str, int]]:
+    """Validate records against IssueCreate, yielding COPY-ready tuples and reporting the rest"""
+    if default_created_at is None:
+        default_created_at = int(time.time())
+
+    for line_number, record in records:
+        if isinstance(record, RejectedRecord):
+            counter.rejected += 1
+            on_reject(record)
+            continue
+        try:
+            issue = IssueImportRecord.model_validate(record)
+        except ValidationError as e:
+            counter.rejected += 1
+            on_reject(RejectedRecord(
+                line_number,
+                e.errors(include_url=False, include_context=False, include_input=False),
+                record
+            ))
+            continue
+
+        counter.imported += 1
+        created_at = issue.created_at if issue.created_at is not None else default_created_at
+        yield issue.title, issue.description, issue.status.value, created_at
+
+
+class CopyStream(io.TextIOBase):
+    """File-like view of row tuples as CSV text, read by COPY one chunk at a time"""
+
+    def __init__(self, rows: Iterator[Tuple]):
+        self._rows = rows
+        self._buffer = ""
+        self._exhausted = False
+        # psycopg2 reports a failing read() as a cancelled COPY; keep the cause
+        self.error: Optional[Exception] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self) -> None:
+        chunk = io.StringIO()
+        writer = csv.writer(chunk, lineterminator="\n")
+        for _ in range(COPY_CHUNK_ROWS):
+            row = next(self._rows, None)
+            if row is None:
+                self._exhausted = True
+                break
+            writer.writerow(row)
+        self._buffer += chunk.getvalue()
+
+    def read(self, size: int = -1) -> str:
+        try:
+            while not self._exhausted and (size < 0 or len(self._buffer) < size):
+                self._fill()
+        except Exception as e:
+            self.error = e
+            raise
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def import_issues(
+    db: Session,
+    stream: TextIO,
+    import_format: str,
+    on_reject: Callable[[RejectedRecord], None],
+    clock: Callable[[], float] = time.perf_counter
+) -> ImportReport:
+    """
+    COPY every valid record of `stream` into issues on the session's
+    connection. Leaves the commit to the caller, so a failed COPY imports
+    nothing.
+    """
+    counter = ImportCounter()
+    started = clock()
+
+    copy_stream = CopyStream(validated_rows(iter_records(stream, import_format), counter, on_reject))
+    try:
+        with db.connection().connection.cursor() as cursor:
+            cursor.copy_expert(COPY_SQL, copy_stream)
+    except psycopg2.Error as e:
+        if copy_stream.error is not None:
+            raise copy_stream.error from e
+        # Raw DBAPI cursor, so wrap the way SQLAlchemy would (IntegrityError, DataError, ...)
+        raise DBAPIError.instance(COPY_SQL, None, e, psycopg2.Error)
+
+    return counter.report(clock() - started)
+
+
+async def import_issues_async(
+    db: AsyncSession,
+    stream: TextIO,
+    import_format: str,
+    on_reject: Callable[[RejectedRecord], None],
+    clock: Callable[[], float] = time.perf_counter
+) -> ImportReport:
+    """
+    asyncpg counterpart of `import_issues`. Parsing and validation run in a
+    worker thread one chunk at a time, so the event loop only moves rows.
+    """
+    # Only the async stack needs asyncpg installed
+    import asyncpg
+
+    counter = ImportCounter()
+    started = clock()
+
+    rows = validated_rows(iter_records(stream, import_format), counter, on_reject)
+
+    async def _records():
+        while True:
+            chunk = await asyncio.to_thread(list, itertools.islice(rows, COPY_CHUNK_ROWS))
+            if not chunk:
+                return
+            for row in chunk:
+                yield row
+
+    connection = await db.connection()
+    # The asyncpg dialect only sends BEGIN with the first statement it runs;
+    # without one, COPY on the driver connection would autocommit on its own.
+    await connection.exec_driver_sql("SELECT 1")
+    raw_connection = await connection.get_raw_connection()
+    try:
+        await raw_connection.driver_connection.copy_records_to_table(
+            "issues", records=_records(), columns=list(IMPORT_COLUMNS)
+        )
+    except asyncpg.PostgresError as e:
+        raise DBAPIError.instance(COPY_SQL, None, e, asyncpg.PostgresError)
+
+    return counter.report(clock() - started)
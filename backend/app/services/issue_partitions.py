@@ -0,0 +1,204 @@
+"""
+Partition maintenance for the issues table.
+
+issues is LIST-partitioned on status: issues_open holds every open issue,
+and issues_closed is RANGE-partitioned on created_at into calendar months
+(issues_closed_2024_05, UTC), with issues_closed_default catching closed
+issues that no month partition covers. Nearly all traffic reads open or
+recent issues, so a status filter or a created_at bound lets Postgres skip
+the partitions holding years of closed ones.
+
+`ensure_partitions` creates month partitions from the current month up to
+`months_ahead` months ahead, plus one for every month the default partition
+holds rows of, moving those rows into it. `archive_partitions` detaches the
+month partitions that ended before the archive cutoff into the `archive`
+schema, where they stay as plain tables (drop them once exported), and moves
+older stragglers from the default partition to archive.issues_closed_default.
+Archived issues are no longer served or counted, and the change feed
+reports them as deleted.
+
+Both take brief exclusive locks on issues_closed and leave the commit to the
+caller; run them with a lock_timeout so they give up instead of queueing
+behind long-running queries.
+
+The primary key has to include the partition keys, so Postgres only
+enforces (id, status, created_at) as unique, per partition. Ids stay unique
+because they only ever come from the shared issues_id_seq sequence, and
+rows that move between partitions keep theirs; nothing may insert an
+explicit id. `duplicate_issue_ids` checks that this still holds.
+"""
+import re
+from datetime import date, datetime, timezone
+from typing import Dict, List, NamedTuple, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+ARCHIVE_SCHEMA = "archive"
+CLOSED_PARENT = "issues_closed"
+CLOSED_DEFAULT = "issues_closed_default"
+
+# Every column but the generated search_vector, which is recomputed on insert
+MOVED_COLUMNS = "id, title, description, status, created_at, updated_at"
+
+_MONTH_PARTITION = re.compile(rf"^{CLOSED_PARENT}_(\d{{4}})_(\d{{2}})$")
+
+DAY = 24 * 60 * 60
+
+
+class ArchivedPartition(NamedTuple):
+    name: str
+    rows: int
+
+
+def month_of(timestamp: int) -> date:
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month_start(month: date) -> int:
+    return int(datetime(month.year, month.month, 1, tzinfo=timezone.utc).timestamp())
+
+
+def month_bounds(month: date) -> Tuple[int, int]:
+    """The month's [lower, upper) created_at range in epoch seconds"""
+    return _month_start(month), _month_start(add_months(month, 1))
+
+
+def partition_name(month: date) -> str:
+    return f"{CLOSED_PARENT}_{month:%Y_%m}"
+
+
+def month_partitions(db: Session) -> Dict[date, str]:
+    """The month partitions currently attached to issues_closed"""
+    names = db.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:parent AS regclass)
+    """), {"parent": CLOSED_PARENT}).scalars()
+
+    partitions = {}
+    for name in names:
+        match = _MONTH_PARTITION.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def _create_month_partition(db: Session, month: date) -> None:
+    name = partition_name(month)
+    lower, upper = month_bounds(month)
+    in_range = {"lower": lower, "upper": upper}
+
+    stray = db.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {CLOSED_DEFAULT} WHERE created_at >= :lower AND created_at < :upper)"),
+        in_range
+    ).scalar_one()
+    if not stray:
+        db.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {CLOSED_PARENT} FOR VALUES FROM ({lower}) TO ({upper})"
+        ))
+        return
+
+    # Postgres refuses a partition for rows the default partition holds, so
+    # the month's rows move into a standalone table that is attached after.
+    # Deleting from the partition itself leaves no tombstones for them.
+    db.execute(text(f"CREATE TABLE {name} (LIKE {CLOSED_PARENT} INCLUDING DEFAULTS INCLUDING GENERATED)"))
+    db.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {CLOSED_DEFAULT} WHERE created_at >= :lower AND created_at < :upper
+            RETURNING {MOVED_COLUMNS}
+        )
+        INSERT INTO {name} ({MOVED_COLUMNS}) SELECT {MOVED_COLUMNS} FROM moved
+    """), in_range)
+    db.execute(text(f"ALTER TABLE {CLOSED_PARENT} ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper})"))
+
+
+def ensure_partitions(db: Session, now: int, months_ahead: int) -> List[str]:
+    """Create missing month partitions; returns the names created, oldest first"""
+    existing = month_partitions(db)
+
+    wanted = {add_months(month_of(now), ahead) for ahead in range(months_ahead + 1)}
+    # The default partition should stay empty; give the months it holds their own partitions
+    stray_months = db.execute(text(f"""
+        SELECT DISTINCT CAST(EXTRACT(YEAR FROM moment) AS INTEGER), CAST(EXTRACT(MONTH FROM moment) AS INTEGER)
+        FROM (SELECT to_timestamp(created_at) AT TIME ZONE 'UTC' AS moment FROM {CLOSED_DEFAULT}) AS stray
+    """))
+    wanted.update(date(year, month, 1) for year, month in stray_months)
+
+    created = []
+    for month in sorted(wanted):
+        if month not in existing:
+            _create_month_partition(db, month)
+            created.append(partition_name(month))
+    return created
+
+
+def _archive_table_exists(db: Session, name: str) -> bool:
+    return db.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f"{ARCHIVE_SCHEMA}.{name}"}
+    ).scalar_one()
+
+
+def archive_partitions(db: Session, now: int, archive_after_days: int) -> List[ArchivedPartition]:
+    """
+    Move closed issues created before the start of the month that was
+    `archive_after_days` ago out of the issues table. Returns what was
+    archived, default partition stragglers last.
+    """
+    cutoff_month = month_of(now - archive_after_days * DAY)
+    cutoff = _month_start(cutoff_month)
+    db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+
+    archived = []
+    for month, name in sorted(month_partitions(db).items()):
+        if month >= cutoff_month:
+            break
+        # Detached rows leave without firing the count and tombstone triggers
+        db.execute(text(f"ALTER TABLE {CLOSED_PARENT} DETACH PARTITION {name}"))
+        rows = db.execute(text(f"SELECT count(*) FROM {name}")).scalar_one()
+        db.execute(text("UPDATE issue_counts SET count = count - :rows WHERE status = 'closed'"), {"rows": rows})
+        db.execute(text(f"""
+            INSERT INTO issue_tombstones (issue_id) SELECT id FROM {name}
+            ON CONFLICT (issue_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at
+        """))
+
+        if _archive_table_exists(db, name):
+            # Archived before, then recreated for issues closed later
+            db.execute(text(f"INSERT INTO {ARCHIVE_SCHEMA}.{name} ({MOVED_COLUMNS}) SELECT {MOVED_COLUMNS} FROM {name}"))
+            db.execute(text(f"DROP TABLE {name}"))
+        else:
+            db.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        archived.append(ArchivedPartition(name, rows))
+
+    # Old issues closed after their month was archived land in the default
+    # partition; deleting them from issues fires the tombstone trigger
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.{CLOSED_DEFAULT} (LIKE issues INCLUDING GENERATED)"
+    ))
+    stragglers = db.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM issues WHERE status = 'closed' AND created_at < :cutoff
+            RETURNING {MOVED_COLUMNS}
+        )
+        INSERT INTO {ARCHIVE_SCHEMA}.{CLOSED_DEFAULT} ({MOVED_COLUMNS}) SELECT {MOVED_COLUMNS} FROM moved
+    """), {"cutoff": cutoff}).rowcount
+    if stragglers:
+        archived.append(ArchivedPartition(CLOSED_DEFAULT, stragglers))
+
+    return archived
+
+
+def duplicate_issue_ids(db: Session, limit: int = 10) -> List[int]:
+    """
+    Up to `limit` ids held by more than one row of issues. One pass over the
+    PK indexes of every partition, so it belongs in maintenance, not requests.
+    """
+    return db.execute(text("""
+        SELECT id FROM issues GROUP BY id HAVING count(*) > 1 ORDER BY id LIMIT :limit
+    """), {"limit": limit}).scalars().all()
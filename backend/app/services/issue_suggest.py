@@ -0,0 +1,39 @@
+"""
+Title suggestions for as-you-type search, served by the pg_trgm GIN index
+on issues.title (see the add_issue_title_trigram_index migration).
+"""
+from sqlalchemy import Select, case, func, or_, select
+from app.models.issue import Issue
+
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 50
+# Shorter text has no trigram to look up, so the index would be read in full on every early keystroke
+SUGGEST_MIN_LENGTH = 3
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def suggest_statement(prefix: str, limit: int) -> Select:
+    """
+    Titles containing `prefix` anywhere (ILIKE '%prefix%'), or a word close
+    to it (`%>`, word similarity, for typos). Both operators are served by
+    the gin_trgm_ops index. Titles starting with the prefix rank first, then
+    by word similarity.
+    """
+    escaped = _escape_like(prefix)
+    starts_with = Issue.title.ilike(f"{escaped}%", escape="\\")
+    contains = Issue.title.ilike(f"%{escaped}%", escape="\\")
+    similar_word = Issue.title.bool_op("%>")(prefix)
+
+    return (
+        select(Issue.id, Issue.title, Issue.status)
+        .where(or_(contains, similar_word))
+        .order_by(
+            case((starts_with, 0), else_=1),
+            func.word_similarity(prefix, Issue.title).desc(),
+            Issue.id.desc()
+        )
+        .limit(limit)
+    )
@@ -0,0 +1,38 @@
+"""
+Single-statement writes for one issue.
+
+Each write is one INSERT/UPDATE/DELETE ... RETURNING round trip instead of
+a SELECT before and a refresh SELECT after. RETURNING sees the row after
+BEFORE triggers ran, so the trigger-maintained updated_at comes back too.
+
+Statements return plain rows of RESPONSE_COLUMNS rather than ORM instances:
+a row is shaped straight into IssueResponse, and an instance the session
+already holds would keep its stale values instead of the returned ones.
+"""
+from typing import Any, Dict
+from sqlalchemy import Delete, Insert, Select, Update, delete, insert, select, update
+from app.models.issue import Issue
+from app.schemas.issue import IssueCreate
+
+RESPONSE_COLUMNS = (Issue.id, Issue.title, Issue.description, Issue.status, Issue.created_at, Issue.updated_at)
+
+
+def create_statement(issue_data: IssueCreate) -> Insert:
+    return insert(Issue).values(
+        title=issue_data.title,
+        description=issue_data.description,
+        status=issue_data.status
+    ).returning(*RESPONSE_COLUMNS)
+
+
+def update_statement(issue_id: int, update_data: Dict[str, Any]) -> Update:
+    return update(Issue).where(Issue.id == issue_id).values(**update_data).returning(*RESPONSE_COLUMNS)
+
+
+def select_statement(issue_id: int) -> Select:
+    """What an empty patch runs instead of an UPDATE that would only bump updated_at"""
+    return select(*RESPONSE_COLUMNS).where(Issue.id == issue_id)
+
+
+def delete_statement(issue_id: int) -> Delete:
+    return delete(Issue).where(Issue.id == issue_id).returning(Issue.id, Issue.status)
@@ -0,0 +1,282 @@
+"""
+Issue list query building shared by the sync and async endpoint stacks.
+
+Functions here only build SQLAlchemy statements and shape results, so the
+same logic runs on a sync Session and an AsyncSession.
+"""
+import hashlib
+from math import ceil
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import Select, String, cast, func, literal, select, tuple_
+from app.core.pagination import CURSOR_NEXT, CURSOR_PREV, InvalidCursorError, decode_cursor, encode_cursor
+from app.models.issue import SEARCH_CONFIG, Issue, IssueStatus
+from app.schemas.issue import PaginatedIssueResponse, PaginatedSparseIssueResponse
+from app.services.issue_counts import issue_total_statement
+
+PER_PAGE = 20
+VALID_STATUS_FILTERS = ["open", "closed"]
+
+# Item fields a list page can be narrowed to with `fields`; excerpt is the
+# start of the description, cut to EXCERPT_LENGTH characters
+LIST_FIELDS = ("id", "title", "description", "status", "created_at", "updated_at", "excerpt")
+SUMMARY_FIELDS = ("id", "title", "status", "created_at", "updated_at", "excerpt")
+VALID_VIEWS = ["full", "summary"]
+EXCERPT_LENGTH = 150
+
+
+# Separates fields in the content digest so ("ab", "c") and ("a", "bc") differ
+_VERSION_SEPARATOR = "\x1f"
+_VERSION_LENGTH = 12
+
+# The same digest computed by Postgres, so validators can be checked with a
+# narrow SELECT instead of loading and serializing the description
+ISSUE_VERSION_COLUMN = func.left(
+    func.md5(func.concat_ws(_VERSION_SEPARATOR, Issue.title, Issue.description, cast(Issue.status, String))),
+    _VERSION_LENGTH
+).label("version")
+
+
+class InvalidFieldsError(ValueError):
+    pass
+
+
+class IssuePageQuery(NamedTuple):
+    statement: Select
+    page: int
+    # None in page/offset mode, otherwise whether the cursor walks forward
+    forward: Optional[bool]
+
+
+def keyset_order(descending: bool):
+    """Order by created_at with id as tiebreaker, since created_at has 1s resolution"""
+    if descending:
+        return Issue.created_at.desc(), Issue.id.desc()
+    return Issue.created_at.asc(), Issue.id.asc()
+
+
+def cursor_for(issue: Issue, direction: str) -> str:
+    return encode_cursor(issue.created_at, issue.id, direction)
+
+
+def normalize_search(q: Optional[str]) -> Optional[str]:
+    """Blank search terms mean no search"""
+    if q is None:
+        return None
+    return q.strip() or None
+
+
+def search_condition(q: str):
+    """Match against search_vector, so the GIN index serves it"""
+    return Issue.search_vector.bool_op("@@")(func.websearch_to_tsquery(SEARCH_CONFIG, q))
+
+
+def search_rank(q: str):
+    return func.ts_rank(Issue.search_vector, func.websearch_to_tsquery(SEARCH_CONFIG, q))
+
+
+def issue_count_statement(status_filter: Optional[str], q: Optional[str] = None) -> Select:
+    """
+    The list total: the trigger-maintained counters when not searching,
+    otherwise a COUNT over the GIN index matches.
+    """
+    if not q:
+        return issue_total_statement(status_filter)
+
+    statement = select(func.count()).select_from(Issue).where(search_condition(q))
+    if status_filter:
+        statement = statement.where(Issue.status == status_filter)
+    return statement
+
+
+def parse_list_fields(fields: Optional[str], view: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    The item fields a list page returns, in LIST_FIELDS order, or None for
+    full items. Raises InvalidFieldsError.
+    """
+    if view is not None and view not in VALID_VIEWS:
+        raise InvalidFieldsError("view must be 'full' or 'summary'")
+    if fields is None:
+        return SUMMARY_FIELDS if view == "summary" else None
+    if view is not None:
+        raise InvalidFieldsError("fields cannot be combined with view")
+
+    requested = {name.strip() for name in fields.split(",")} - {""}
+    if not requested or not requested <= set(LIST_FIELDS):
+        raise InvalidFieldsError(f"fields must be a comma-separated subset of: {', '.join(LIST_FIELDS)}")
+    return tuple(name for name in LIST_FIELDS if name in requested)
+
+
+def build_issue_page_query(
+    status_filter: Optional[str],
+    sort: Optional[str],
+    page: int,
+    cursor: Optional[str],
+    q: Optional[str] = None
+) -> IssuePageQuery:
+    """Build the SELECT for one list page. Raises InvalidCursorError for a bad cursor."""
+    statement = select(Issue)
+    if status_filter:
+        statement = statement.where(Issue.status == status_filter)
+
+    descending = sort != "asc"
+
+    if q:
+        # Results are ranked, so `sort` only orders ties and paging is by page number
+        if cursor:
+            raise InvalidCursorError("cursor cannot be combined with q")
+        offset = (page - 1) * PER_PAGE
+        statement = (
+            statement.where(search_condition(q))
+            .order_by(search_rank(q).desc(), *keyset_order(descending))
+            .offset(offset)
+            .limit(PER_PAGE)
+        )
+        return IssuePageQuery(statement, page, None)
+
+    if not cursor:
+        offset = (page - 1) * PER_PAGE
+        statement = statement.order_by(*keyset_order(descending)).offset(offset).limit(PER_PAGE)
+        return IssuePageQuery(statement, page, None)
+
+    cursor_created_at, cursor_id, direction = decode_cursor(cursor)
+
+    # Walking "prev" is a forward walk in the opposite sort order,
+    # reversed afterwards so items always come back in `sort` order.
+    forward = direction == CURSOR_NEXT
+    scan_descending = descending if forward else not descending
+
+    key = tuple_(Issue.created_at, Issue.id)
+    boundary = tuple_(literal(cursor_created_at), literal(cursor_id))
+    statement = statement.where(key < boundary if scan_descending else key > boundary)
+    # Implied by the row comparison, but partitions are only pruned on plain column bounds
+    statement = statement.where(
+        Issue.created_at <= cursor_created_at if scan_descending else Issue.created_at >= cursor_created_at
+    )
+    statement = statement.order_by(*keyset_order(scan_descending)).limit(PER_PAGE + 1)
+    return IssuePageQuery(statement, page, forward)
+
+
+def _field_column(name: str):
+    if name == "excerpt":
+        # One character more than the excerpt shows, to tell whether it was cut
+        return func.substr(Issue.description, 1, EXCERPT_LENGTH + 1).label("excerpt")
+    return getattr(Issue, name)
+
+
+def sparse_page_statement(page_query: IssuePageQuery, fields: Sequence[str]) -> Select:
+    """
+    The page's SELECT narrowed to `fields`, plus the id and created_at its
+    cursors are built from, so other columns are never read.
+    """
+    names = dict.fromkeys(("id", "created_at", *fields))
+    return page_query.statement.with_only_columns(*(_field_column(name) for name in names))
+
+
+def excerpt(text: str) -> str:
+    """Cut `text` to EXCERPT_LENGTH characters, at a word boundary when there is one nearby"""
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    cut = text[:EXCERPT_LENGTH]
+    space = cut.rfind(" ")
+    if space > EXCERPT_LENGTH * 2 // 3:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def sparse_item(row, fields: Sequence[str]) -> Dict[str, Any]:
+    item = {name: getattr(row, name) for name in fields}
+    if "excerpt" in item:
+        item["excerpt"] = excerpt(item["excerpt"])
+    return item
+
+
+def build_issue_page(
+    page_query: IssuePageQuery,
+    issues: List[Any],
+    total: int,
+    fields: Optional[Sequence[str]] = None
+) -> PaginatedIssueResponse:
+    """
+    Shape the rows fetched for `page_query` into the paginated response:
+    Issue instances, or with `fields` the rows of its sparse_page_statement.
+    """
+    issues = list(issues)
+
+    if page_query.forward is None:
+        has_next = (page_query.page - 1) * PER_PAGE + len(issues) < total
+        has_prev = page_query.page > 1
+    else:
+        has_more = len(issues) > PER_PAGE
+        issues = issues[:PER_PAGE]
+        if not page_query.forward:
+            issues.reverse()
+
+        has_next = has_more if page_query.forward else True
+        has_prev = True if page_query.forward else has_more
+
+    if total == 0:
+        total_pages = 1
+    else:
+        total_pages = ceil(total / PER_PAGE)
+
+    if fields is None:
+        page_class, items = PaginatedIssueResponse, issues
+    else:
+        page_class, items = PaginatedSparseIssueResponse, [sparse_item(row, fields) for row in issues]
+
+    return page_class(
+        items=items,
+        total=total,
+        page=page_query.page,
+        per_page=PER_PAGE,
+        total_pages=total_pages,
+        next_cursor=cursor_for(issues[-1], CURSOR_NEXT) if issues and has_next else None,
+        prev_cursor=cursor_for(issues[0], CURSOR_PREV) if issues and has_prev else None
+    )
+
+
+def issue_version(title: str, description: str, issue_status) -> str:
+    """Content digest that matches ISSUE_VERSION_COLUMN"""
+    status_value = issue_status.value if isinstance(issue_status, IssueStatus) else issue_status
+    content = _VERSION_SEPARATOR.join((title, description, status_value))
+    return hashlib.md5(content.encode(), usedforsecurity=False).hexdigest()[:_VERSION_LENGTH]
+
+
+def detail_etag(issue_id: int, updated_at: int, version: str) -> str:
+    """
+    Strong ETag for one issue. updated_at only has 1s resolution, so the
+    content digest keeps two edits within the same second distinguishable.
+    """
+    return f'"{issue_id}-{updated_at}-{version}"'
+
+
+def detail_etag_for(issue) -> str:
+    return detail_etag(issue.id, issue.updated_at, issue_version(issue.title, issue.description, issue.status))
+
+
+def detail_validator_statement(issue_id: int) -> Select:
+    return select(Issue.updated_at, ISSUE_VERSION_COLUMN).where(Issue.id == issue_id)
+
+
+def list_validator_statement(page_query: IssuePageQuery) -> Select:
+    """The page's SELECT narrowed to the columns its ETag is derived from"""
+    return page_query.statement.with_only_columns(Issue.id, Issue.updated_at, ISSUE_VERSION_COLUMN)
+
+
+def issue_row_versions(issues: Iterable[Issue]) -> List[Tuple[int, int, str]]:
+    return [
+        (issue.id, issue.updated_at, issue_version(issue.title, issue.description, issue.status))
+        for issue in issues
+    ]
+
+
+def list_etag(params: Hashable, total: int, row_versions: Iterable[Tuple]) -> str:
+    """
+    Strong ETag for one list page, derived from the request parameters, the
+    total and the (id, updated_at, version) of every row the page query
+    returned (including the look-ahead row in cursor mode). Sparse pages pass
+    their rows as fetched: they hold exactly what the page shows.
+    """
+    row_versions = [tuple(row_version) for row_version in row_versions]
+    digest = hashlib.blake2b(repr((params, total, row_versions)).encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
@@ -0,0 +1,6 @@
+"""
+Benchmarks package.
+
+This package contains load and micro benchmarks run with `python -m benchmarks.<name>`
+against a local PostgreSQL database.
+"""
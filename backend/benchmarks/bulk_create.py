@@ -0,0 +1,57 @@
+"""
+Compare creating issues one request at a time with POST /issues/bulk.
+
+    python -m benchmarks.bulk_create --count 10000 --batch-size 1000
+
+Both paths insert `--count` real rows into the configured database.
+"""
+import argparse
+import time
+
+import httpx
+
+from benchmarks.common import Server
+
+ISSUES_PATH = "/api/v1/issues"
+
+
+def _payload(i):
+    return {"title": f"Benchmark issue {i}", "description": f"Created by benchmarks.bulk_create ({i})"}
+
+
+def _single(client, count):
+    for i in range(count):
+        client.post(ISSUES_PATH, json=_payload(i)).raise_for_status()
+
+
+def _bulk(client, count, batch_size):
+    for start in range(0, count, batch_size):
+        batch = [_payload(i) for i in range(start, min(start + batch_size, count))]
+        client.post(f"{ISSUES_PATH}/bulk", json=batch).raise_for_status()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    with Server(args.port, env={"BULK_MAX_ITEMS": str(args.batch_size)}) as server:
+        with httpx.Client(base_url=server.base_url, timeout=120) as client:
+            results = {}
+            for name, run in (
+                ("single", lambda: _single(client, args.count)),
+                ("bulk", lambda: _bulk(client, args.count, args.batch_size)),
+            ):
+                started = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - started
+                results[name] = elapsed
+                print(f"{name:<8}{args.count} issues in {elapsed:.2f}s ({args.count / elapsed:,.0f} issues/s)")
+
+    print(f"\nbulk speedup: {results['single'] / results['bulk']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
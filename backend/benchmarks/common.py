@@ -0,0 +1,139 @@
+"""
+Shared helpers for benchmarks: starting the API under uvicorn and driving
+concurrent HTTP load against it.
+"""
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class LoadResult:
+    duration: float
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    # Per-label results when `next_request` labels its requests
+    labels: Dict[str, "LoadResult"] = field(default_factory=dict)
+
+    def record(self, latency: Optional[float], label: Optional[str] = None) -> None:
+        """Count one request: its latency, or None for an error"""
+        targets = [self]
+        if label is not None:
+            if label not in self.labels:
+                self.labels[label] = LoadResult(duration=self.duration)
+            targets.append(self.labels[label])
+        for target in targets:
+            if latency is None:
+                target.errors += 1
+            else:
+                target.latencies.append(latency)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.requests_per_second, 1),
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 2),
+        }
+
+
+class Server:
+    """Run `app.main:app` under uvicorn in a subprocess for the duration of a `with` block"""
+
+    def __init__(self, port: int, env: Optional[Dict[str, str]] = None, workers: int = 1):
+        self.port = port
+        self.env = {**os.environ, "ENVIRONMENT": "benchmark", **(env or {})}
+        self.workers = workers
+        self.process = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "Server":
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--port", str(self.port),
+                "--workers", str(self.workers),
+                "--log-level", "warning",
+                "--no-access-log",
+            ],
+            cwd=BACKEND_DIR,
+            env=self.env,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(f"{self.base_url}/docs", timeout=1).status_code == 200:
+                    return self
+            except httpx.TransportError:
+                pass
+            time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"Server on port {self.port} did not start")
+
+    def __exit__(self, *exc_info) -> None:
+        self.process.terminate()
+        self.process.wait(timeout=30)
+
+
+async def run_load(
+    base_url: str,
+    next_request: Callable[[random.Random], Tuple[str, str, Dict[str, Any]]],
+    concurrency: int,
+    duration: float,
+    seed: int = 0,
+) -> LoadResult:
+    """
+    Keep `concurrency` clients busy for `duration` seconds. Each client loops
+    issuing the (method, path, httpx kwargs) returned by `next_request` and
+    records its latency. A fourth item, if returned, labels the request and
+    its latency is also recorded under `LoadResult.labels[label]`.
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        result = LoadResult(duration=duration)
+        deadline = time.perf_counter() + duration
+
+        async def _client(client_id: int) -> None:
+            rng = random.Random(seed * 100003 + client_id)
+            while time.perf_counter() < deadline:
+                method, path, kwargs, *label = next_request(rng)
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    ok = response.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                result.record(time.perf_counter() - started if ok else None, label[0] if label else None)
+
+        await asyncio.gather(*(_client(i) for i in range(concurrency)))
+        return result
@@ -0,0 +1,75 @@
+"""
+Compare two `benchmarks.load` result files and flag regressions.
+
+    python -m benchmarks.compare results/main.json results/HEAD.json --threshold 10
+
+For every operation present in both files, prints requests/sec and p50/p95/p99
+latency side by side with the relative change. An operation regresses when
+its p95 or p99 latency grows, or its requests/sec drops, by more than
+`--threshold` percent; the command then exits with status 1, so it can gate
+CI. Runs with different table sizes, concurrency or mix are compared with a
+warning, since their numbers are not comparable.
+"""
+import argparse
+import json
+import sys
+
+COMPARED_SETTINGS = ("rows", "concurrency", "workers", "cache", "mix")
+
+
+def _change(before, after):
+    if not before:
+        return 0.0
+    return (after - before) / before * 100
+
+
+def compare(baseline, candidate, threshold):
+    """Print the comparison and return the names of regressed operations"""
+    for name in COMPARED_SETTINGS:
+        if baseline.get(name) != candidate.get(name):
+            print(f"warning: {name} differs ({baseline.get(name)} vs {candidate.get(name)})")
+
+    print(f"baseline  {baseline.get('commit')} ({baseline.get('timestamp')})")
+    print(f"candidate {candidate.get('commit')} ({candidate.get('timestamp')})\n")
+    print(f"{'operation':<16}{'metric':<8}{'baseline':>12}{'candidate':>12}{'change':>10}")
+
+    regressions = []
+    for operation, before in baseline["results"].items():
+        after = candidate["results"].get(operation)
+        if after is None:
+            continue
+        regressed = False
+        for metric, higher_is_worse in (("rps", False), ("p50_ms", True), ("p95_ms", True), ("p99_ms", True)):
+            change = _change(before[metric], after[metric])
+            worse = change > threshold if higher_is_worse else change < -threshold
+            # p50 is reported but too noisy to gate on
+            if worse and metric != "p50_ms":
+                regressed = True
+            flag = "  !" if worse else ""
+            print(f"{operation:<16}{metric:<8}{before[metric]:>12}{after[metric]:>12}{change:>+9.1f}%{flag}")
+        if regressed:
+            regressions.append(operation)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed change in percent")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    regressions = compare(baseline, candidate, args.threshold)
+    if regressions:
+        print(f"\nRegressed beyond {args.threshold:g}%: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:g}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Mixed-workload load test for the issues API.
+
+    python -m benchmarks.load --dataset 1m --concurrency 50 --duration 60 --output results/HEAD.json
+    python -m benchmarks.compare results/main.json results/HEAD.json
+
+`--dataset` (10k, 1m, 10m) or `--rows` tops the issues table up to that many
+rows with the synthetic data generator (alembic/seeds/seed_issues.py)
+before measuring; rows already there are kept, so later runs reuse the
+table. The server is then driven with a weighted mix (see
+`--mix`) of:
+
+- list_first / list_shallow / list_deep: GET /issues at page 1, pages
+  2-10, and pages deep into the table (offset pagination);
+- list_cursor: the second page through a keyset cursor;
+- list_filtered: a status_filter page;
+- get: GET /issues/{id} for random ids of the dataset;
+- create, patch, delete: writes. Patches rewrite the description of random
+  dataset issues; deletes only hit issues created for the run, and
+  everything the run created is removed at the end.
+
+Latency percentiles and requests/sec are reported per operation and
+overall, and `--output` writes them as JSON together with the commit, the
+table size and the run settings, for `benchmarks.compare`. The response
+cache is disabled unless `--cache` is passed, so reads reach Postgres.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import subprocess
+import sys
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from benchmarks.common import BACKEND_DIR, Server, run_load
+
+ISSUES_PATH = "/api/v1/issues"
+PAGE_SIZE = 20
+
+# Marks every row the run itself writes, so it can be cleaned up afterwards
+RUN_TITLE_PREFIX = "Load test"
+
+DATASETS = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+DEFAULT_MIX = {
+    "list_first": 20,
+    "list_shallow": 10,
+    "list_deep": 5,
+    "list_cursor": 5,
+    "list_filtered": 10,
+    "get": 35,
+    "create": 6,
+    "patch": 6,
+    "delete": 3,
+}
+
+SEED_SCRIPT = os.path.join(BACKEND_DIR, "alembic", "seeds", "seed_issues.py")
+
+
+def _seed(engine, rows):
+    with engine.connect() as connection:
+        existing = connection.execute(text("SELECT count(*) FROM issues")).scalar_one()
+    missing = rows - existing
+    if missing > 0:
+        print(f"Seeding {missing:,} issues ({existing:,} present)...")
+        # Three years of issues; seeded by the current size so a top-up adds new rows
+        subprocess.run(
+            [sys.executable, SEED_SCRIPT, "--count", str(missing), "--days", "1095", "--seed", str(existing)],
+            check=True
+        )
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}; choose from {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight)
+    return mix
+
+
+class Workload:
+    """Builds the next request of the mix; shared by all simulated clients"""
+
+    def __init__(self, mix, id_range, delete_pool, cursor, deep_pages):
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.min_id, self.max_id = id_range
+        self.delete_pool = delete_pool
+        self.cursor = cursor
+        self.deep_pages = deep_pages
+        self.created = 0
+
+    def _random_id(self, rng):
+        return rng.randint(self.min_id, self.max_id)
+
+    def __call__(self, rng):
+        operation = rng.choices(self.operations, self.weights)[0]
+        if operation == "delete" and not self.delete_pool:
+            operation = "get"
+
+        if operation == "list_first":
+            return "GET", ISSUES_PATH, {}, operation
+        if operation == "list_shallow":
+            return "GET", ISSUES_PATH, {"params": {"page": rng.randint(2, 10)}}, operation
+        if operation == "list_deep":
+            return "GET", ISSUES_PATH, {"params": {"page": rng.randint(*self.deep_pages)}}, operation
+        if operation == "list_cursor":
+            return "GET", ISSUES_PATH, {"params": {"cursor": self.cursor}}, operation
+        if operation == "list_filtered":
+            params = {"status_filter": rng.choice(["open", "closed"]), "page": rng.randint(1, 5)}
+            return "GET", ISSUES_PATH, {"params": params}, operation
+        if operation == "get":
+            return "GET", f"{ISSUES_PATH}/{self._random_id(rng)}", {}, operation
+        if operation == "create":
+            self.created += 1
+            payload = {"title": f"{RUN_TITLE_PREFIX} {self.created}", "description": "Created by benchmarks.load"}
+            return "POST", ISSUES_PATH, {"json": payload}, operation
+        if operation == "patch":
+            payload = {"description": f"Patched by benchmarks.load ({rng.random():.6f})"}
+            return "PATCH", f"{ISSUES_PATH}/{self._random_id(rng)}", {"json": payload}, operation
+        return "DELETE", f"{ISSUES_PATH}/{self.delete_pool.pop()}", {}, operation
+
+
+def _prepare(client, engine, delete_pool_size, bulk_size):
+    with engine.connect() as connection:
+        id_range = connection.execute(text("SELECT min(id), max(id) FROM issues")).one()
+    if id_range[0] is None:
+        raise SystemExit("The issues table is empty; pass --dataset or --rows")
+
+    delete_pool = []
+    for start in range(0, delete_pool_size, bulk_size):
+        batch = [
+            {"title": f"{RUN_TITLE_PREFIX} delete {i}", "description": "Deleted by benchmarks.load"}
+            for i in range(start, min(start + bulk_size, delete_pool_size))
+        ]
+        response = client.post(f"{ISSUES_PATH}/bulk", json=batch)
+        response.raise_for_status()
+        delete_pool.extend(item["id"] for item in response.json())
+
+    cursor = client.get(ISSUES_PATH).json().get("next_cursor")
+    return id_range, delete_pool, cursor
+
+
+def _cleanup(engine):
+    with engine.begin() as connection:
+        deleted = connection.execute(
+            text("DELETE FROM issues WHERE title LIKE :prefix"), {"prefix": f"{RUN_TITLE_PREFIX} %"}
+        ).rowcount
+    print(f"Removed {deleted:,} issues created by the run")
+
+
+def _print_table(results):
+    print(f"\n{'operation':<16}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, summary in results.items():
+        print(
+            f"{name:<16}{summary['requests']:>10}{summary['errors']:>8}{summary['rps']:>10}"
+            f"{summary['p50_ms']:>10}{summary['p95_ms']:>10}{summary['p99_ms']:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--dataset", choices=DATASETS, help="Seed the table up to this preset size")
+    size.add_argument("--rows", type=int, help="Seed the table up to this many issues")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds of unmeasured load first")
+    parser.add_argument("--mix", type=_parse_mix, default=DEFAULT_MIX,
+                        help="Weights as op=weight,... (default: %(default)s)")
+    parser.add_argument("--delete-pool", type=int, default=5000,
+                        help="Issues created up front for deletes; once used up, deletes turn into gets")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache enabled")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the request mix")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    target_rows = DATASETS.get(args.dataset) or args.rows
+    if target_rows:
+        _seed(engine, target_rows)
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT count(*) FROM issues")).scalar_one()
+    print(f"Table holds {rows:,} issues")
+
+    env = {"CACHE_ENABLED": "true" if args.cache else "false"}
+    total_pages = max(rows // PAGE_SIZE, 1)
+
+    try:
+        with Server(args.port, env=env, workers=args.workers) as server:
+            with httpx.Client(base_url=server.base_url, timeout=120) as client:
+                id_range, delete_pool, cursor = _prepare(
+                    client, engine, args.delete_pool if args.mix.get("delete") else 0, settings.BULK_MAX_ITEMS
+                )
+            workload = Workload(args.mix, id_range, delete_pool, cursor, (max(total_pages // 2, 1), total_pages))
+
+            if args.warmup:
+                asyncio.run(run_load(server.base_url, workload, args.concurrency, args.warmup, seed=args.seed + 1))
+            print(f"Running {args.concurrency} clients for {args.duration:.0f}s...")
+            result = asyncio.run(run_load(server.base_url, workload, args.concurrency, args.duration, seed=args.seed))
+    finally:
+        _cleanup(engine)
+        engine.dispose()
+
+    results = {name: result.labels[name].summary() for name in args.mix if name in result.labels}
+    results["overall"] = result.summary()
+    _print_table(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        report = {
+            "commit": _commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "rows": rows,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "workers": args.workers,
+            "cache": args.cache,
+            "mix": args.mix,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Measure what HTTPMetricsMiddleware adds to each request.
+
+    python -m benchmarks.metrics_overhead
+    python -m benchmarks.metrics_overhead --e2e --duration 20
+
+The microbenchmark drives the middleware in-process around a stub ASGI app
+that answers immediately (after setting the matched route the way FastAPI's
+router does), next to the bare stub, and reports the difference per request
+for a single worker and for a registry that also writes multiprocess files.
+`--e2e` additionally serves GET /issues/{id} with METRICS_ENABLED on and off
+and compares requests/sec.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+
+import httpx
+
+from app.core.http_metrics import HTTPMetrics, HTTPMetricsMiddleware
+from app.main import app
+from benchmarks.common import Server, run_load
+
+ISSUES_PATH = "/api/v1/issues"
+ROUTE_TEMPLATE = f"{ISSUES_PATH}/{{issue_id}}"
+
+
+def _stub_app():
+    route = next(route for route in app.router.routes if getattr(route, "path", None) == ROUTE_TEMPLATE)
+
+    async def _app(scope, receive, send):
+        scope["route"] = route
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    return _app
+
+
+async def _receive():
+    return {"type": "http.request"}
+
+
+async def _send(message):
+    pass
+
+
+async def _per_request(asgi_app, iterations):
+    scope = {"type": "http", "method": "GET", "path": f"{ISSUES_PATH}/1", "query_string": b"", "headers": []}
+    await asgi_app(dict(scope), _receive, _send)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await asgi_app(dict(scope), _receive, _send)
+    return (time.perf_counter() - started) / iterations
+
+
+async def microbenchmark(iterations, rounds, multiprocess_dir):
+    stub = _stub_app()
+    variants = {
+        "single": HTTPMetricsMiddleware(stub, HTTPMetrics(), app.router.routes),
+        "multiprocess": HTTPMetricsMiddleware(stub, HTTPMetrics(multiprocess_dir=multiprocess_dir), app.router.routes),
+    }
+    for name, middleware in variants.items():
+        overheads = []
+        for _ in range(rounds):
+            bare = await _per_request(stub, iterations)
+            overheads.append(await _per_request(middleware, iterations) - bare)
+        print(f"{name:<14}{min(overheads) * 1e6:8.2f} µs/request (best of {rounds})")
+
+
+def _issue_id(base_url):
+    with httpx.Client(base_url=base_url) as client:
+        response = client.post(ISSUES_PATH, json={"title": "Metrics overhead", "description": "Benchmark issue"})
+        response.raise_for_status()
+        return response.json()["id"]
+
+
+def end_to_end(args):
+    for enabled in ("false", "true"):
+        with Server(args.port, env={"METRICS_ENABLED": enabled}) as server:
+            path = f"{ISSUES_PATH}/{_issue_id(server.base_url)}"
+            result = asyncio.run(run_load(
+                server.base_url, lambda rng: ("GET", path, {}), concurrency=args.concurrency, duration=args.duration
+            ))
+        print(f"metrics={enabled:<6}{result.summary()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--e2e", action="store_true", help="Also compare requests/sec with metrics on and off")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    # Outlives the event loop, so a pending multiprocess flush never finds it gone
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(microbenchmark(args.iterations, args.rounds, directory))
+    if args.e2e:
+        end_to_end(args)
+
+
+if __name__ == "__main__":
+    main()
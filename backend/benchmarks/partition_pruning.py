@@ -0,0 +1,158 @@
+"""
+Show which partitions of the issues table each list query reads.
+
+    python -m app.cli.maintain_issue_partitions
+    python -m benchmarks.partition_pruning --repeat 20 --json results/partitions.json
+
+Builds every shape of GET /issues with the same code as the endpoint (first
+page, sort=asc, status filters, a deep page, cursor pages at a few depths
+into history) plus the lookup by id behind GET /issues/{id}, and runs
+EXPLAIN (ANALYZE, BUFFERS) on each against the configured database. For each
+it reports the leaf partitions left in the plan after pruning, the ones that
+actually returned rows, the shared buffers touched and the median planning
+and execution time over --repeat runs.
+
+Run the maintenance command after seeding, so closed issues sit in their
+month partitions rather than in issues_closed_default.
+
+id alone prunes nothing, so the lookup by id probes the primary key index
+of every leaf partition. `--grow 12,60,120` measures how that scales: it
+adds that many empty month partitions ahead, re-runs the lookup, and rolls
+the partitions back afterwards.
+"""
+import argparse
+import json
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.pagination import CURSOR_NEXT, CURSOR_PREV, encode_cursor
+from app.services.issue_partitions import ensure_partitions
+from app.services.issue_writes import select_statement
+from app.services.issues import build_issue_page_query
+
+# Cursor positions as a fraction of the created_at range, newest first
+CURSOR_DEPTHS = (0.1, 0.5, 0.9)
+
+
+def _cursor(low, high, depth, direction):
+    # Any (created_at, id) works as a position; the largest id keeps that whole second
+    return encode_cursor(int(high - (high - low) * depth), 2 ** 31 - 1, direction)
+
+
+def _queries(connection):
+    low, high = connection.execute(text("SELECT min(created_at), max(created_at) FROM issues")).one()
+    some_id = connection.execute(text("SELECT max(id) FROM issues")).scalar_one()
+
+    queries = {
+        "first page": build_issue_page_query(None, None, 1, None),
+        "sort=asc": build_issue_page_query(None, "asc", 1, None),
+        "status=open": build_issue_page_query("open", None, 1, None),
+        "status=closed": build_issue_page_query("closed", None, 1, None),
+        "page=50": build_issue_page_query(None, None, 50, None),
+    }
+    queries = {name: page_query.statement for name, page_query in queries.items()}
+    for depth in CURSOR_DEPTHS:
+        for status_filter in (None, "closed"):
+            label = f"cursor {depth:.0%}" + (" closed" if status_filter else "")
+            queries[label] = build_issue_page_query(
+                status_filter, None, 2, _cursor(low, high, depth, CURSOR_NEXT)
+            ).statement
+        queries[f"cursor {depth:.0%} prev"] = build_issue_page_query(
+            None, None, 2, _cursor(low, high, depth, CURSOR_PREV)
+        ).statement
+    queries["get by id"] = select_statement(some_id)
+    return queries
+
+
+def _scans(node):
+    """Yield (relation, loops) for every scan in a plan"""
+    if "Relation Name" in node:
+        yield node["Relation Name"], node.get("Actual Loops", 0)
+    for child in node.get("Plans", []):
+        yield from _scans(child)
+
+
+def _explain(connection, statement, repeat):
+    compiled = statement.compile(connection)
+    planning, execution = [], []
+    for _ in range(repeat):
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        planning.append(plan[0]["Planning Time"])
+        execution.append(plan[0]["Execution Time"])
+
+    root = plan[0]["Plan"]
+    scans = list(_scans(root))
+    return {
+        "partitions_planned": len({name for name, _ in scans}),
+        "partitions_executed": len({name for name, loops in scans if loops}),
+        "shared_buffers": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+        "planning_ms": round(statistics.median(planning), 3),
+        "execution_ms": round(statistics.median(execution), 3),
+    }
+
+
+def _leaf_count(connection):
+    return connection.execute(text("SELECT count(*) FROM pg_partition_tree('issues') WHERE isleaf")).scalar_one()
+
+
+def _lookup_growth(connection, months_ahead, repeat):
+    """The lookup by id with `months_ahead` months of partitions in place; rolled back after"""
+    some_id = connection.execute(text("SELECT max(id) FROM issues")).scalar_one()
+    results = []
+    for months in sorted(months_ahead):
+        ensure_partitions(Session(bind=connection), int(time.time()), months)
+        result = _explain(connection, select_statement(some_id), repeat)
+        results.append({"leaf_partitions": _leaf_count(connection), **result})
+    connection.rollback()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="EXPLAIN ANALYZE runs per query")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    parser.add_argument("--grow", default="", help="Comma-separated months of partitions to add for the lookup by id")
+    args = parser.parse_args()
+    grow = [int(months) for months in args.grow.split(",") if months.strip()]
+
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.connect() as connection:
+        total = connection.execute(text("SELECT count(*) FROM issues")).scalar_one()
+        leaves = _leaf_count(connection)
+        print(f"Table holds {total:,} issues in {leaves} leaf partitions")
+
+        results = {"rows": total, "leaf_partitions": leaves, "queries": {}}
+        print(f"{'query':<22}{'planned':>8}{'executed':>10}{'buffers':>9}{'plan ms':>9}{'exec ms':>9}")
+        for name, statement in _queries(connection).items():
+            result = _explain(connection, statement, args.repeat)
+            results["queries"][name] = result
+            print(
+                f"{name:<22}{result['partitions_planned']:>8}{result['partitions_executed']:>10}"
+                f"{result['shared_buffers']:>9}{result['planning_ms']:>9}{result['execution_ms']:>9}"
+            )
+
+        if grow:
+            results["get_by_id_growth"] = _lookup_growth(connection, grow, args.repeat)
+            print(f"\n{'leaves':<8}{'get by id buffers':>18}{'plan ms':>9}{'exec ms':>9}")
+            for result in results["get_by_id_growth"]:
+                print(
+                    f"{result['leaf_partitions']:<8}{result['shared_buffers']:>18}"
+                    f"{result['planning_ms']:>9}{result['execution_ms']:>9}"
+                )
+    engine.dispose()
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Measure GET /issues?q= latency against a large table, next to the
+`ILIKE '%term%'` scan it replaces.
+
+    python -m benchmarks.search --seed-rows 3000000 --requests 500
+
+`--seed-rows` first inserts that many generated issues into the configured
+database; omit it to reuse an already seeded table. Every issue mentions a
+few words from a small shared vocabulary (each matching several percent of
+the table) and one of MODULE_COUNT module names (each matching a handful of
+rows), and latency is reported separately for both kinds of term: ranking
+and counting cost grows with the number of matching rows. The response cache
+is disabled so every request reaches Postgres.
+"""
+import argparse
+import json
+import random
+import time
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from benchmarks.common import Server, percentile
+
+ISSUES_PATH = "/api/v1/issues"
+MODULE_COUNT = 20000
+
+VOCABULARY = [
+    "login", "logout", "crash", "timeout", "export", "import", "search", "upload", "download", "payment",
+    "invoice", "email", "notification", "dashboard", "report", "filter", "calendar", "permission", "token",
+    "session", "cache", "database", "migration", "latency", "memory", "mobile", "browser", "safari", "firefox",
+    "android", "ios", "layout", "font", "translation", "checkout", "webhook", "retry", "duplicate", "missing",
+    "broken", "slow", "blank", "error", "warning", "sync", "offline", "avatar", "profile", "password", "billing",
+]
+
+SEED_SQL = """
+    INSERT INTO issues (title, description, status, created_at, updated_at)
+    SELECT
+        initcap(w[1 + (n * 7) % cardinality(w)]) || ' ' || w[1 + (n * 13) % cardinality(w)]
+            || ' in module m' || (n::bigint * 7919) % :modules || ' (issue ' || n || ')',
+        'Users report ' || w[1 + (n * 17) % cardinality(w)] || ' and ' || w[1 + (n * 31) % cardinality(w)]
+            || ' problems after the ' || w[1 + (n * 3) % cardinality(w)] || ' change. Ticket ' || n || '.',
+        CASE WHEN n % 3 = 0 THEN 'closed' ELSE 'open' END::issue_status,
+        1600000000 + n,
+        1600000000 + n
+    FROM generate_series(:start, :stop) AS n, (SELECT CAST(:words AS text[]) AS w) AS vocabulary
+"""
+
+
+def _seed(engine, rows, batch_size=250000):
+    with engine.begin() as connection:
+        start = int(connection.execute(text("SELECT coalesce(max(id), 0) FROM issues")).scalar_one()) + 1
+    for offset in range(0, rows, batch_size):
+        stop = start + min(batch_size, rows - offset) - 1
+        with engine.begin() as connection:
+            connection.execute(
+                text(SEED_SQL), {"start": start, "stop": stop, "words": VOCABULARY, "modules": MODULE_COUNT}
+            )
+        print(f"  seeded {offset + stop - start + 1:,} / {rows:,}")
+        start = stop + 1
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE issues"))
+
+
+def _common_query(rng):
+    """Single words, two-word AND queries, a phrase and a negation over the shared vocabulary"""
+    first, second = rng.sample(VOCABULARY, 2)
+    return rng.choice([first, f"{first} {second}", f'"{first} {second}"', f"{first} -{second}"])
+
+
+def _selective_query(rng):
+    module = f"m{rng.randrange(MODULE_COUNT)}"
+    return rng.choice([module, f"{module} {rng.choice(VOCABULARY)}"])
+
+
+def _params(rng, q):
+    params = {"q": q, "page": rng.randint(1, 3)}
+    if rng.random() < 0.5:
+        params["status_filter"] = rng.choice(["open", "closed"])
+    return params
+
+
+def _ilike_latencies(engine, rng, count):
+    latencies = []
+    with engine.connect() as connection:
+        for _ in range(count):
+            term = f"module m{rng.randrange(MODULE_COUNT)} "
+            started = time.perf_counter()
+            connection.execute(
+                text(
+                    "SELECT id FROM issues WHERE title ILIKE :pattern OR description ILIKE :pattern "
+                    "ORDER BY created_at DESC LIMIT 20"
+                ),
+                {"pattern": f"%{term}%"}
+            ).all()
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _summary(latencies):
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed-rows", type=int, default=0, help="Insert this many issues before measuring")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--ilike-queries", type=int, default=10, help="ILIKE baseline queries to time (0 to skip)")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    if args.seed_rows:
+        print(f"Seeding {args.seed_rows:,} issues...")
+        _seed(engine, args.seed_rows)
+    with engine.connect() as connection:
+        total = connection.execute(text("SELECT count(*) FROM issues")).scalar_one()
+    print(f"Table holds {total:,} issues")
+
+    rng = random.Random(0)
+    results = {"rows": total}
+    with Server(args.port, env={"CACHE_ENABLED": "false"}) as server:
+        with httpx.Client(base_url=server.base_url, timeout=60) as client:
+            for name, next_query in (("selective", _selective_query), ("common", _common_query)):
+                latencies = []
+                for _ in range(args.requests):
+                    params = _params(rng, next_query(rng))
+                    started = time.perf_counter()
+                    client.get(ISSUES_PATH, params=params).raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                results[name] = _summary(latencies)
+                print(f"q= {name:<10}{results[name]}")
+
+    if args.ilike_queries:
+        results["ilike"] = _summary(_ilike_latencies(engine, rng, args.ilike_queries))
+        print(f"ILIKE       {results['ilike']}")
+    engine.dispose()
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
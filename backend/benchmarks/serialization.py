@@ -0,0 +1,123 @@
+"""
+Measure the cost of turning a 20-item page of issues into response bytes.
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --e2e --seed --duration 20
+
+The microbenchmark compares, for the same ORM rows:
+
+- fastapi: build PaginatedIssueResponse, then let FastAPI validate it again
+  against response_model and encode it (serialize_response + JSONResponse),
+  which is what returning the model from the endpoint does;
+- to_json: build PaginatedIssueResponse once and serialize it with
+  pydantic-core's to_json, as the list/detail endpoints now do.
+
+`--e2e` also drives GET /issues with the response cache disabled and reports
+requests/sec; run it on an older revision for the "before" number. `--seed`
+first creates enough issues with `--description-length` descriptions.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic_core import to_json
+
+from app.models.issue import Issue, IssueStatus
+from app.schemas.issue import PaginatedIssueResponse
+from benchmarks.common import Server, run_load
+
+ISSUES_PATH = "/api/v1/issues"
+PAGE_SIZE = 20
+
+
+def _issues(description_length):
+    return [
+        Issue(
+            id=i,
+            title=f"Issue {i}",
+            description=("x" * (description_length - 10)) + f" issue {i:04d}",
+            status=IssueStatus.OPEN if i % 3 else IssueStatus.CLOSED,
+            created_at=1700000000 + i,
+            updated_at=1700000000 + i,
+        )
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def _page(issues):
+    return PaginatedIssueResponse(items=issues, total=1000, page=1, per_page=PAGE_SIZE, total_pages=50)
+
+
+def _time(fn, iterations):
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def microbenchmark(description_length, iterations):
+    issues = _issues(description_length)
+    field = create_response_field(name="Response_List_Issues", type_=PaginatedIssueResponse)
+    loop = asyncio.new_event_loop()
+
+    def _fastapi():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=_page(issues)))
+        return JSONResponse(content).body
+
+    def _to_json():
+        return to_json(_page(issues))
+
+    assert len(_fastapi()) > 0 and len(_to_json()) > 0
+
+    results = {"fastapi": _time(_fastapi, iterations), "to_json": _time(_to_json, iterations)}
+    loop.close()
+    for name, seconds in results.items():
+        print(f"{name:<10}{seconds * 1e6:10.1f} µs/page")
+    print(f"speedup   {results['fastapi'] / results['to_json']:10.1f}x")
+
+
+def _seed(base_url, count, description_length):
+    payload = [
+        {"title": f"Serialization benchmark {i}", "description": "y" * description_length}
+        for i in range(count)
+    ]
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        client.post(f"{ISSUES_PATH}/bulk", json=payload).raise_for_status()
+
+
+def end_to_end(args):
+    with Server(args.port, env={"CACHE_ENABLED": "false"}) as server:
+        if args.seed:
+            _seed(server.base_url, PAGE_SIZE * 5, args.description_length)
+        result = asyncio.run(run_load(
+            server.base_url,
+            lambda rng: ("GET", ISSUES_PATH, {"params": {"page": rng.randint(1, 5)}}),
+            concurrency=args.concurrency,
+            duration=args.duration,
+        ))
+    print(f"e2e       {result.summary()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--description-length", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--e2e", action="store_true", help="Also measure requests/sec against a running server")
+    parser.add_argument("--seed", action="store_true", help="Create long-description issues before --e2e")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    microbenchmark(args.description_length, args.iterations)
+    if args.e2e:
+        end_to_end(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Measure how long the API takes to start.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --workers 4 --json results/startup.json
+
+Import time is `import app.main` in a fresh interpreter. Time to first
+request runs uvicorn in a subprocess and polls GET /api/v1/issues until it
+answers 200, from the moment the process is launched, so it covers the
+interpreter, the imports, the startup schema check and the first query.
+Every figure is the median over --runs fresh processes. The configured
+database must be migrated (`alembic upgrade head`), or startup is refused.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import BACKEND_DIR
+
+ISSUES_PATH = "/api/v1/issues"
+
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import app.main; print(time.perf_counter() - started)"
+
+
+def _import_seconds():
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output)
+
+
+def _first_request_seconds(port, workers, timeout=60):
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+            "--no-access-log",
+        ],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "ENVIRONMENT": "benchmark"},
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}{ISSUES_PATH}", timeout=1).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError(f"Server on port {port} did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def _summary(seconds):
+    return {
+        "runs": len(seconds),
+        "median_ms": round(statistics.median(seconds) * 1000, 1),
+        "min_ms": round(min(seconds) * 1000, 1),
+        "max_ms": round(max(seconds) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    results = {
+        "import": _summary([_import_seconds() for _ in range(args.runs)]),
+        "first_request": _summary([_first_request_seconds(args.port, args.workers) for _ in range(args.runs)]),
+    }
+    print(f"import app.main      {results['import']}")
+    print(f"first 200 response   {results['first_request']}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare throughput and tail latency of the sync (psycopg2) and async
+(asyncpg) issue endpoint stacks.
+
+Seed the database first, then run:
+
+    python -m benchmarks.sync_vs_async --concurrency 500 --duration 30
+
+Each stack is started in its own uvicorn process and driven with the same
+read-heavy mix of list pages and detail lookups. The response cache is
+turned off, since its hits would skip the database paths being compared.
+"""
+import argparse
+import asyncio
+import json
+
+import httpx
+
+from benchmarks.common import Server, run_load
+
+ISSUES_PATH = "/api/v1/issues"
+
+
+def _request_mix(issue_ids):
+    def _next(rng):
+        if rng.random() < 0.5:
+            return "GET", f"{ISSUES_PATH}/{rng.choice(issue_ids)}", {}
+        return "GET", ISSUES_PATH, {"params": {"page": rng.randint(1, 5)}}
+    return _next
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load per stack")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for mode, database_async in (("sync", "false"), ("async", "true")):
+        with Server(args.port, env={"DATABASE_ASYNC": database_async, "CACHE_ENABLED": "false"}) as server:
+            issue_ids = [item["id"] for item in httpx.get(f"{server.base_url}{ISSUES_PATH}").json()["items"]]
+            if not issue_ids:
+                raise SystemExit("No issues found; seed the database before benchmarking")
+
+            print(f"Running {mode} stack: {args.concurrency} clients for {args.duration:.0f}s...")
+            result = asyncio.run(run_load(server.base_url, _request_mix(issue_ids), args.concurrency, args.duration))
+            results[mode] = result.summary()
+
+    print(f"\n{'stack':<8}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for mode, summary in results.items():
+        print(f"{mode:<8}{summary['rps']:>10}{summary['p50_ms']:>10}{summary['p99_ms']:>10}{summary['errors']:>8}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"concurrency": args.concurrency, "duration": args.duration, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
+import os
 import pytest
+
+# The test database is built with create_all below, not migrated; the app's own engine is never used
+os.environ.setdefault("SCHEMA_CHECK", "off")
+
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_read_db
 from app.config import settings
+from app.services.issue_cache import issue_cache, suggest_cache
 
 # Determine test database URL
 def get_test_database_url():
@@ -82,13 +88,23 @@ def override_get_db(db_session):
             pass  # Session cleanup handled by db_session fixture
     
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_read_db] = _get_test_db
     yield
     app.dependency_overrides.clear()
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_issue_cache():
+    # Fixtures write through db_session and bypass invalidation, so start each test cold
+    issue_cache.clear()
+    suggest_cache.clear()
+    yield
+    issue_cache.clear()
+    suggest_cache.clear()
+
 @pytest.fixture(scope="function")
 def client():
     with TestClient(app) as test_client:
         yield test_client
 
 # ==================== DOMAIN FIXTURES ====================
-from tests.fixtures.issues import create_issue, create_multiple_issues
+from tests.fixtures.issues import create_issue, create_multiple_issues, seed_bulk_issues
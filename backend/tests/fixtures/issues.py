@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import text
 from app.models.issue import Issue, IssueStatus
 
 @pytest.fixture
@@ -39,3 +40,25 @@ def create_multiple_issues(db_session):
         db_session.commit()
         return issues
     return _create_multiple
+
+
+@pytest.fixture
+def seed_bulk_issues(db_session):
+    """Insert `count` issues server-side, spread over time, and refresh planner statistics"""
+    def _seed(count, closed_every=3, seconds_apart=60):
+        db_session.execute(
+            text("""
+                INSERT INTO issues (title, description, status, created_at, updated_at)
+                SELECT
+                    'Issue ' || n,
+                    repeat('Description ' || n || ' ', 20),
+                    CASE WHEN n % :closed_every = 0 THEN 'closed' ELSE 'open' END::issue_status,
+                    1700000000 + (n / 3) * :seconds_apart,
+                    1700000000 + (n / 3) * :seconds_apart
+                FROM generate_series(1, :count) AS n
+            """),
+            {"count": count, "closed_every": closed_every, "seconds_apart": seconds_apart}
+        )
+        db_session.execute(text("ANALYZE issues"))
+        db_session.commit()
+    return _seed
@@ -0,0 +1,94 @@
+from fastapi import status
+from app.core.http_cache import format_http_date
+from app.models.issue import IssueStatus
+from app.services.issue_cache import issue_cache
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+
+# ==================== DETAIL (GET /api/v1/issues/{id}) ====================
+
+def test_get_issue_sends_validators(client, create_issue):
+    issue = create_issue(title="Validators")
+
+    response = client.get(f"{ISSUES_ENDPOINT}/{issue.id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"].startswith(f'"{issue.id}-{issue.updated_at}-')
+    assert response.headers["last-modified"] == format_http_date(issue.updated_at)
+
+def test_get_issue_if_none_match_from_database(client, create_issue):
+    # Non-ASCII content checks the SQL digest matches the Python one byte for byte
+    issue = create_issue(title="Überprüfung ✓", description="Beschreibung — ß")
+    etag = client.get(f"{ISSUES_ENDPOINT}/{issue.id}").headers["etag"]
+    issue_cache.clear()
+
+    response = client.get(f"{ISSUES_ENDPOINT}/{issue.id}", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+def test_get_issue_if_none_match_from_cache(client, create_issue):
+    issue = create_issue()
+    etag = client.get(f"{ISSUES_ENDPOINT}/{issue.id}").headers["etag"]
+
+    response = client.get(f"{ISSUES_ENDPOINT}/{issue.id}", headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+def test_get_issue_etag_changes_on_same_second_update(client, create_issue):
+    issue = create_issue(title="Before")
+    etag = client.get(f"{ISSUES_ENDPOINT}/{issue.id}").headers["etag"]
+
+    client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={"title": "After"})
+
+    response = client.get(f"{ISSUES_ENDPOINT}/{issue.id}", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "After"
+    assert response.headers["etag"] != etag
+
+def test_get_issue_if_modified_since(client, create_issue):
+    issue = create_issue()
+
+    response = client.get(
+        f"{ISSUES_ENDPOINT}/{issue.id}",
+        headers={"If-Modified-Since": format_http_date(issue.updated_at)}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = client.get(
+        f"{ISSUES_ENDPOINT}/{issue.id}",
+        headers={"If-Modified-Since": format_http_date(issue.updated_at - 1)}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+def test_get_issue_conditional_not_found(client):
+    response = client.get(f"{ISSUES_ENDPOINT}/99999", headers={"If-None-Match": '"1-1-x"'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+# ==================== LIST (GET /api/v1/issues) ====================
+
+def test_list_issues_if_none_match(client, create_multiple_issues):
+    create_multiple_issues(25, status=IssueStatus.OPEN)
+    etag = client.get(f"{ISSUES_ENDPOINT}?status_filter=open").headers["etag"]
+    issue_cache.clear()
+
+    response = client.get(f"{ISSUES_ENDPOINT}?status_filter=open", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+def test_list_issues_cursor_page_if_none_match(client, create_multiple_issues):
+    create_multiple_issues(45, status=IssueStatus.OPEN)
+    next_cursor = client.get(ISSUES_ENDPOINT).json()["next_cursor"]
+    etag = client.get(f"{ISSUES_ENDPOINT}?cursor={next_cursor}").headers["etag"]
+    issue_cache.clear()
+
+    response = client.get(f"{ISSUES_ENDPOINT}?cursor={next_cursor}", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+def test_list_issues_etag_changes_with_content_and_params(client, create_issue):
+    issue = create_issue(status=IssueStatus.OPEN)
+    etag = client.get(ISSUES_ENDPOINT).headers["etag"]
+
+    assert client.get(f"{ISSUES_ENDPOINT}?sort=asc").headers["etag"] != etag
+
+    client.delete(f"{ISSUES_ENDPOINT}/{issue.id}")
+    response = client.get(ISSUES_ENDPOINT, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
@@ -0,0 +1,51 @@
+import pytest
+from app.core.handlers import run_handler, run_handler_async
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class _Step:
+    def __init__(self, outcome=None, error=None):
+        self.outcome = outcome
+        self.error = error
+
+    def run(self, db):
+        db.append(self)
+        if self.error is not None:
+            raise self.error
+        return self.outcome
+
+    async def run_async(self, db):
+        return self.run(db)
+
+
+def _handler(first, second):
+    try:
+        a = yield first
+        b = yield second
+    except LookupError as e:
+        return f"recovered from {e}"
+    return a + b
+
+
+def test_run_handler_sends_step_results_back():
+    ran = []
+    assert run_handler(ran, _handler(_Step(1), _Step(2))) == 3
+    assert len(ran) == 2
+
+def test_run_handler_throws_step_errors_into_the_handler():
+    ran = []
+    assert run_handler(ran, _handler(_Step(error=KeyError("k")), _Step(2))) == "recovered from 'k'"
+    assert len(ran) == 1
+
+def test_run_handler_propagates_unhandled_errors():
+    with pytest.raises(RuntimeError):
+        run_handler([], _handler(_Step(1), _Step(error=RuntimeError("boom"))))
+
+@pytest.mark.anyio
+async def test_run_handler_async_matches_run_handler():
+    assert await run_handler_async([], _handler(_Step(1), _Step(2))) == 3
+    assert await run_handler_async([], _handler(_Step(error=KeyError("k")), _Step(2))) == "recovered from 'k'"
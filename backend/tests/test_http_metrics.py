@@ -0,0 +1,108 @@
+import json
+import subprocess
+import sys
+import pytest
+from fastapi import status
+from app.core.http_metrics import HTTPMetrics, UNMATCHED_ROUTE
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+METRICS_ENDPOINT = "/metrics"
+
+
+def _samples(text):
+    """Map each `name{labels}` of a Prometheus text exposition to its value"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def _record(metrics, route, status_code, seconds, method="GET"):
+    scope = {"method": method, "route": route}
+    metrics.start(scope)
+    metrics.finish(scope, status_code, seconds)
+
+
+class FakeRoute:
+    def __init__(self, path):
+        self.path = path
+
+
+def _registry(**kwargs):
+    metrics = HTTPMetrics(buckets=[0.1, 1.0], **kwargs)
+    metrics.route_template = lambda scope: scope["route"].path if scope.get("route") else UNMATCHED_ROUTE
+    return metrics
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+# ==================== REGISTRY ====================
+
+def test_render_counts_statuses_and_buckets():
+    metrics = _registry()
+    route = FakeRoute("/items/{item_id}")
+    _record(metrics, route, 200, 0.05)
+    _record(metrics, route, 200, 0.5)
+    _record(metrics, route, 404, 3.0)
+
+    samples = _samples(metrics.render())
+    labels = 'method="GET",route="/items/{item_id}"'
+    assert samples[f'http_requests_total{{{labels},status="200"}}'] == 2
+    assert samples[f'http_requests_total{{{labels},status="404"}}'] == 1
+    assert samples[f'http_request_duration_seconds_bucket{{{labels},le="0.1"}}'] == 1
+    assert samples[f'http_request_duration_seconds_bucket{{{labels},le="1.0"}}'] == 2
+    assert samples[f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}'] == 3
+    assert samples[f"http_request_duration_seconds_count{{{labels}}}"] == 3
+    assert samples[f"http_request_duration_seconds_sum{{{labels}}}"] == pytest.approx(3.55)
+    assert samples[f"http_requests_in_progress{{{labels}}}"] == 0
+
+def test_in_flight_follows_running_requests():
+    metrics = _registry()
+    scope = {"method": "POST", "route": FakeRoute("/items")}
+    metrics.start(scope)
+
+    assert _samples(metrics.render())['http_requests_in_progress{method="POST",route="/items"}'] == 1
+    metrics.finish(scope, 201, 0.01)
+    assert _samples(metrics.render())['http_requests_in_progress{method="POST",route="/items"}'] == 0
+
+def test_multiprocess_render_merges_worker_files(tmp_path):
+    metrics = _registry(multiprocess_dir=str(tmp_path))
+    _record(metrics, FakeRoute("/items"), 200, 0.05)
+
+    # A worker that has exited: its counts stay, its in-flight requests don't
+    other_worker = {
+        "pid": _dead_pid(),
+        "buckets": [0.1, 1.0],
+        "routes": [["GET", "/items", {"statuses": {"200": 2}, "in_flight": 3, "buckets": [1, 1, 0], "sum": 0.6}]],
+    }
+    (tmp_path / f"{other_worker['pid']}.json").write_text(json.dumps(other_worker))
+
+    samples = _samples(metrics.render())
+    assert samples['http_requests_total{method="GET",route="/items",status="200"}'] == 3
+    assert samples['http_request_duration_seconds_bucket{method="GET",route="/items",le="0.1"}'] == 2
+    assert samples['http_requests_in_progress{method="GET",route="/items"}'] == 0
+
+# ==================== MIDDLEWARE ====================
+
+def test_metrics_are_labelled_by_route_template(client, create_issue):
+    issue = create_issue(title="Measured")
+    client.get(f"{ISSUES_ENDPOINT}/{issue.id}")
+    client.get(f"{ISSUES_ENDPOINT}/999999")
+    client.get("/no/such/path")
+
+    response = client.get(METRICS_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    samples = _samples(response.text)
+    labels = 'method="GET",route="/api/v1/issues/{issue_id}"'
+    assert samples[f'http_requests_total{{{labels},status="200"}}'] >= 1
+    assert samples[f'http_requests_total{{{labels},status="404"}}'] >= 1
+    assert f'method="GET",route="{UNMATCHED_ROUTE}",status="404"' in response.text
+    assert f"{ISSUES_ENDPOINT}/{issue.id}\"" not in response.text
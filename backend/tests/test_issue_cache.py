@@ -0,0 +1,116 @@
+from fastapi import status
+from app.core.cache import TTLCache
+from app.models.issue import IssueStatus
+from app.services.issue_cache import detail_cache_key, issue_cache, list_cache_key
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+CACHE_STATS_ENDPOINT = "/api/v1/diagnostics/cache"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# ==================== TTLCache ====================
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    for key in ("a", "b"):
+        _, generation = cache.lookup(key)
+        cache.store(key, key.upper(), generation)
+
+    cache.lookup("a")
+    _, generation = cache.lookup("c")
+    cache.store("c", "C", generation)
+
+    assert cache.lookup("a")[0] == "A"
+    assert cache.lookup("b")[0] is None
+    assert cache.evictions == 1
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=10, ttl_seconds=5, clock=clock)
+    _, generation = cache.lookup("a")
+    cache.store("a", "A", generation)
+
+    clock.now = 4.9
+    assert cache.lookup("a")[0] == "A"
+    clock.now = 5.0
+    assert cache.lookup("a")[0] is None
+    assert cache.expirations == 1
+
+def test_ttl_cache_drops_store_after_concurrent_invalidation():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    _, generation = cache.lookup("a")
+    cache.invalidate_where(lambda key: True)
+    cache.store("a", "stale", generation)
+
+    assert cache.lookup("a")[0] is None
+
+def test_disabled_ttl_cache_never_stores():
+    cache = TTLCache(max_entries=0, ttl_seconds=60)
+    _, generation = cache.lookup("a")
+    cache.store("a", "A", generation)
+
+    assert cache.lookup("a")[0] is None
+
+# ==================== ENDPOINT CACHING ====================
+
+def test_repeat_list_is_served_from_cache(client, create_issue):
+    create_issue(title="Cached")
+    before = client.get(CACHE_STATS_ENDPOINT).json()
+
+    client.get(ISSUES_ENDPOINT)
+    response = client.get(ISSUES_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"][0]["title"] == "Cached"
+
+    after = client.get(CACHE_STATS_ENDPOINT).json()
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+
+def test_cache_hit_serves_the_serialized_body(client, create_issue):
+    issue = create_issue(title="Serialized once")
+
+    first = client.get(f"{ISSUES_ENDPOINT}/{issue.id}")
+    cached = issue_cache.lookup(detail_cache_key(issue.id))[0]
+    second = client.get(f"{ISSUES_ENDPOINT}/{issue.id}")
+
+    assert isinstance(cached.body, bytes)
+    assert second.content == first.content == cached.body
+    assert second.headers["content-type"] == "application/json"
+    assert second.headers["etag"] == first.headers["etag"]
+
+def test_update_invalidates_detail_and_affected_status_buckets(client, create_issue):
+    issue = create_issue(status=IssueStatus.OPEN)
+    for query in ("", "?status_filter=open", "?status_filter=closed"):
+        client.get(f"{ISSUES_ENDPOINT}{query}")
+    client.get(f"{ISSUES_ENDPOINT}/{issue.id}")
+
+    client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={"status": "closed"})
+
+    for status_filter in (None, "open", "closed"):
+        assert issue_cache.lookup(list_cache_key(status_filter, "desc", 1, None))[0] is None
+    assert issue_cache.lookup(detail_cache_key(issue.id))[0] is None
+    assert client.get(f"{ISSUES_ENDPOINT}?status_filter=closed").json()["total"] == 1
+
+def test_write_keeps_unaffected_status_bucket(client, create_issue):
+    create_issue(status=IssueStatus.CLOSED)
+    client.get(f"{ISSUES_ENDPOINT}?status_filter=closed")
+
+    client.post(ISSUES_ENDPOINT, json={"title": "New", "description": "Open issue"})
+
+    assert issue_cache.lookup(list_cache_key("closed", "desc", 1, None))[0] is not None
+    assert issue_cache.lookup(list_cache_key(None, "desc", 1, None))[0] is None
+
+def test_delete_invalidates_detail(client, create_issue):
+    issue = create_issue()
+    client.get(f"{ISSUES_ENDPOINT}/{issue.id}")
+
+    client.delete(f"{ISSUES_ENDPOINT}/{issue.id}")
+
+    assert client.get(f"{ISSUES_ENDPOINT}/{issue.id}").status_code == status.HTTP_404_NOT_FOUND
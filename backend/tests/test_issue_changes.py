@@ -0,0 +1,167 @@
+import pytest
+from fastapi import status
+from sqlalchemy import text
+from app.config import settings
+from app.core.pagination import encode_change_cursor
+from app.models.issue import IssueStatus
+from app.services.issue_changes import prune_tombstones, settled_before_statement
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+CHANGES_ENDPOINT = f"{ISSUES_ENDPOINT}/changes"
+
+# Before the test transaction's NOW(), which stamps every write the test makes
+LONG_AGO = 1700000000
+
+
+@pytest.fixture(autouse=True)
+def settled_immediately(monkeypatch):
+    # Every write in a test shares its transaction's timestamp, so none would settle,
+    # and cursors at LONG_AGO would be past the retention
+    monkeypatch.setattr(settings, "CHANGE_FEED_SETTLE_SECONDS", 0)
+    monkeypatch.setattr(settings, "CHANGE_FEED_RETENTION_DAYS", 0)
+
+
+def _changes(client, since=None, **params):
+    if since is not None:
+        params["since"] = since
+    response = client.get(CHANGES_ENDPOINT, params=params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+def _ids(page):
+    return [item["id"] for item in page["items"]]
+
+# ==================== CHANGE FEED (GET /api/v1/issues/changes) ====================
+
+def test_changes_come_in_updated_at_order(client, create_issue):
+    newest = create_issue(title="Newest", updated_at=LONG_AGO + 300)
+    oldest = create_issue(title="Oldest", updated_at=LONG_AGO + 100)
+    middle = create_issue(title="Middle", updated_at=LONG_AGO + 200)
+
+    page = _changes(client)
+    assert _ids(page) == [oldest.id, middle.id, newest.id]
+    assert page["items"][0]["title"] == "Oldest"
+    assert page["deleted"] == []
+    assert page["has_more"] is False
+
+def test_cursor_resumes_after_the_last_change(client, create_issue, monkeypatch):
+    create_issue(updated_at=LONG_AGO)
+    cursor = _changes(client)["next_cursor"]
+
+    # The test's own writes are stamped now; settling a second keeps them past the bound
+    monkeypatch.setattr(settings, "CHANGE_FEED_SETTLE_SECONDS", 1)
+    # Nothing new: the cursor moves up to the bound the page was read at
+    page = _changes(client, cursor)
+    assert page["items"] == [] and page["deleted"] == []
+    assert page["next_cursor"] != cursor
+
+    created = client.post(ISSUES_ENDPOINT, json={"title": "Created", "description": "d"}).json()
+    monkeypatch.setattr(settings, "CHANGE_FEED_SETTLE_SECONDS", 0)
+    assert _ids(_changes(client, page["next_cursor"])) == [created["id"]]
+
+def test_changes_page_with_limit(client, create_issue):
+    expected = [create_issue(updated_at=LONG_AGO + i).id for i in range(5)]
+
+    seen, cursor, has_more = [], None, True
+    while has_more:
+        page = _changes(client, cursor, limit=2)
+        assert len(page["items"]) <= 2
+        seen += _ids(page)
+        cursor, has_more = page["next_cursor"], page["has_more"]
+
+    assert seen == expected
+
+def test_updated_issue_is_reported_again(client, create_issue):
+    issue = create_issue(updated_at=LONG_AGO)
+    cursor = _changes(client)["next_cursor"]
+
+    client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={"title": "Renamed"})
+
+    page = _changes(client, cursor)
+    assert [item["title"] for item in page["items"]] == ["Renamed"]
+
+def test_deletions_are_reported(client, create_issue):
+    create_issue(updated_at=LONG_AGO)
+    deleted_id = create_issue(updated_at=LONG_AGO).id
+    bulk_deleted_id = create_issue(updated_at=LONG_AGO).id
+    cursor = _changes(client)["next_cursor"]
+
+    assert client.delete(f"{ISSUES_ENDPOINT}/{deleted_id}").status_code == status.HTTP_204_NO_CONTENT
+    client.post(f"{ISSUES_ENDPOINT}/bulk/delete", json={"ids": [bulk_deleted_id]})
+
+    page = _changes(client, cursor)
+    assert page["items"] == []
+    assert [tombstone["id"] for tombstone in page["deleted"]] == [deleted_id, bulk_deleted_id]
+
+def test_closing_an_issue_is_an_update_not_a_deletion(client, create_issue):
+    issue = create_issue(status=IssueStatus.OPEN, updated_at=LONG_AGO)
+    cursor = _changes(client)["next_cursor"]
+
+    client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={"status": "closed"})
+
+    page = _changes(client, cursor)
+    assert [item["status"] for item in page["items"]] == ["closed"]
+    assert page["deleted"] == []
+
+def test_unsettled_changes_wait(client, create_issue, monkeypatch):
+    settled = create_issue(updated_at=LONG_AGO)
+    recent = create_issue()
+    monkeypatch.setattr(settings, "CHANGE_FEED_SETTLE_SECONDS", 60)
+
+    page = _changes(client)
+    assert _ids(page) == [settled.id]
+
+    monkeypatch.setattr(settings, "CHANGE_FEED_SETTLE_SECONDS", 0)
+    assert _ids(_changes(client, page["next_cursor"])) == [recent.id]
+
+def test_changes_stop_before_transactions_in_flight(db_session, test_engine):
+    def _settled_before():
+        # pg_stat_activity is read once per transaction, and the test's is long
+        db_session.execute(text("SELECT pg_stat_clear_snapshot()"))
+        # A negative settle takes the current time out of the bound
+        return db_session.execute(settled_before_statement(-3600)).scalar_one()
+
+    with test_engine.connect() as writer:
+        started = writer.execute(text("SELECT CAST(EXTRACT(EPOCH FROM NOW()) AS INTEGER)")).scalar_one()
+        assert _settled_before() == started - 1
+        writer.rollback()
+        assert _settled_before() > started
+
+def test_cursor_past_the_retention_is_gone(client, monkeypatch):
+    monkeypatch.setattr(settings, "CHANGE_FEED_RETENTION_DAYS", 30)
+    response = client.get(CHANGES_ENDPOINT, params={"since": encode_change_cursor(LONG_AGO, 1)})
+    assert response.status_code == status.HTTP_410_GONE
+
+def test_polling_a_quiet_feed_keeps_the_cursor_within_the_retention(client, create_issue, monkeypatch):
+    create_issue(updated_at=LONG_AGO)
+    stale = _changes(client)["next_cursor"]
+
+    monkeypatch.setattr(settings, "CHANGE_FEED_RETENTION_DAYS", 30)
+    assert client.get(CHANGES_ENDPOINT, params={"since": stale}).status_code == status.HTTP_410_GONE
+
+    # A client that kept polling holds the cursor of its last, empty, page
+    monkeypatch.setattr(settings, "CHANGE_FEED_RETENTION_DAYS", 0)
+    polled = _changes(client, stale)["next_cursor"]
+    monkeypatch.setattr(settings, "CHANGE_FEED_RETENTION_DAYS", 30)
+    page = _changes(client, polled)
+    assert page["items"] == [] and page["deleted"] == []
+
+def test_prune_tombstones_keeps_the_retention(db_session):
+    day = 24 * 60 * 60
+    db_session.execute(text("""
+        INSERT INTO issue_tombstones (issue_id, deleted_at) VALUES (1, :old), (2, :kept)
+    """), {"old": LONG_AGO - 31 * day, "kept": LONG_AGO - 29 * day})
+
+    assert prune_tombstones(db_session, LONG_AGO, 0) == 0
+    assert prune_tombstones(db_session, LONG_AGO, 30) == 1
+    remaining = db_session.execute(text("SELECT issue_id FROM issue_tombstones")).scalars().all()
+    assert remaining == [2]
+
+def test_empty_feed_has_no_cursor(client):
+    page = _changes(client)
+    assert page == {"items": [], "deleted": [], "next_cursor": None, "has_more": False}
+
+def test_changes_rejects_malformed_cursor(client):
+    assert client.get(f"{CHANGES_ENDPOINT}?since=not-a-cursor").status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get(f"{CHANGES_ENDPOINT}?limit=0").status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
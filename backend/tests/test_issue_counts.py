@@ -0,0 +1,55 @@
+from sqlalchemy import text
+from app.models.issue import IssueStatus
+from app.services.issue_counts import get_issue_total, reconcile_issue_counts
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+
+
+def _stored_counts(db_session):
+    rows = db_session.execute(text("SELECT status, count FROM issue_counts"))
+    return {row.status: row.count for row in rows}
+
+
+def test_counts_follow_inserts(db_session, create_issue, create_multiple_issues):
+    create_issue(status=IssueStatus.OPEN)
+    create_multiple_issues(3, status=IssueStatus.CLOSED)
+
+    assert _stored_counts(db_session) == {"open": 1, "closed": 3}
+    assert get_issue_total(db_session) == 4
+    assert get_issue_total(db_session, "closed") == 3
+
+
+def test_counts_follow_status_changes_and_deletes(client, db_session, create_issue):
+    issue = create_issue(status=IssueStatus.OPEN)
+    other = create_issue(status=IssueStatus.OPEN)
+
+    client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={"status": "closed"})
+    assert _stored_counts(db_session) == {"open": 1, "closed": 1}
+
+    client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={"title": "No status change"})
+    assert _stored_counts(db_session) == {"open": 1, "closed": 1}
+
+    client.delete(f"{ISSUES_ENDPOINT}/{other.id}")
+    assert _stored_counts(db_session) == {"open": 0, "closed": 1}
+
+
+def test_list_total_reads_counters(client, db_session, create_multiple_issues):
+    create_multiple_issues(3, status=IssueStatus.OPEN)
+    db_session.execute(text("UPDATE issue_counts SET count = 42 WHERE status = 'open'"))
+
+    data = client.get(f"{ISSUES_ENDPOINT}?status_filter=open").json()
+    assert data["total"] == 42
+    assert data["total_pages"] == 3
+
+
+def test_reconcile_repairs_drift(db_session, create_multiple_issues):
+    create_multiple_issues(2, status=IssueStatus.OPEN)
+    db_session.execute(text("UPDATE issue_counts SET count = 7"))
+
+    result = reconcile_issue_counts(db_session)
+
+    assert result == {
+        "open": {"stored": 7, "actual": 2},
+        "closed": {"stored": 7, "actual": 0},
+    }
+    assert _stored_counts(db_session) == {"open": 2, "closed": 0}
@@ -0,0 +1,169 @@
+import json
+from fastapi import status
+from sqlalchemy import text
+from app.models.issue import IssueStatus
+from app.services.issue_partitions import ArchivedPartition, archive_partitions, duplicate_issue_ids, ensure_partitions
+from app.services.issue_writes import select_statement
+from app.services.issues import build_issue_page_query
+from app.core.pagination import CURSOR_NEXT, encode_cursor
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+
+# 2023-11-14 and 2030-01-15, both UTC
+NOVEMBER_2023 = 1700000000
+NOW = 1894665600
+
+
+def _partition_of(db_session, issue_id):
+    return db_session.execute(
+        text("SELECT tableoid::regclass::text FROM issues WHERE id = :id"), {"id": issue_id}
+    ).scalar_one()
+
+
+def _stored_counts(db_session):
+    return {row.status: row.count for row in db_session.execute(text("SELECT status, count FROM issue_counts"))}
+
+
+def _tombstones(db_session):
+    return db_session.execute(text("SELECT issue_id FROM issue_tombstones ORDER BY issue_id")).scalars().all()
+
+
+def _scans(db_session, statement):
+    """{relation: scan node type} for every relation the plan reads"""
+    compiled = statement.compile(db_session.connection())
+    plan = db_session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    def _nodes(node):
+        yield node
+        for child in node.get("Plans", []):
+            yield from _nodes(child)
+
+    return {node["Relation Name"]: node["Node Type"] for node in _nodes(plan[0]["Plan"]) if "Relation Name" in node}
+
+
+def _scanned_partitions(db_session, statement):
+    return set(_scans(db_session, statement))
+
+
+def _leaf_partitions(db_session):
+    return set(db_session.execute(text("SELECT relid::text FROM pg_partition_tree('issues') WHERE isleaf")).scalars())
+
+
+def test_issues_land_in_their_status_partition(db_session, create_issue):
+    open_issue = create_issue(status=IssueStatus.OPEN)
+    closed_issue = create_issue(status=IssueStatus.CLOSED, created_at=NOVEMBER_2023)
+
+    assert _partition_of(db_session, open_issue.id) == "issues_open"
+    # No month partition for it yet
+    assert _partition_of(db_session, closed_issue.id) == "issues_closed_default"
+
+def test_closing_an_issue_moves_it_and_keeps_triggers_working(client, db_session, create_issue):
+    issue = create_issue(status=IssueStatus.OPEN, created_at=NOW, updated_at=NOW)
+    ensure_partitions(db_session, NOW, months_ahead=0)
+
+    response = client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={"status": "closed"})
+    assert response.status_code == status.HTTP_200_OK
+    # update_issues_updated_at fired on the way from issues_open to issues_closed_2030_01
+    assert response.json()["updated_at"] != NOW
+
+    assert _partition_of(db_session, issue.id) == "issues_closed_2030_01"
+    assert _stored_counts(db_session) == {"open": 0, "closed": 1}
+    # Moving partitions is not a deletion
+    assert _tombstones(db_session) == []
+
+    response = client.get(f"{ISSUES_ENDPOINT}?status_filter=closed")
+    assert [item["id"] for item in response.json()["items"]] == [issue.id]
+
+def test_ensure_partitions_creates_upcoming_months(db_session):
+    created = ensure_partitions(db_session, NOW, months_ahead=2)
+    assert created == ["issues_closed_2030_01", "issues_closed_2030_02", "issues_closed_2030_03"]
+
+    assert ensure_partitions(db_session, NOW, months_ahead=2) == []
+
+def test_ensure_partitions_moves_rows_out_of_the_default_partition(client, db_session, create_issue):
+    issue = create_issue(status=IssueStatus.CLOSED, created_at=NOVEMBER_2023)
+
+    created = ensure_partitions(db_session, NOW, months_ahead=0)
+
+    assert created == ["issues_closed_2023_11", "issues_closed_2030_01"]
+    assert _partition_of(db_session, issue.id) == "issues_closed_2023_11"
+    assert _stored_counts(db_session) == {"open": 0, "closed": 1}
+    assert _tombstones(db_session) == []
+    assert client.get(f"{ISSUES_ENDPOINT}/{issue.id}").status_code == status.HTTP_200_OK
+
+def test_archive_detaches_old_months(client, db_session, create_issue):
+    old_closed_id = create_issue(status=IssueStatus.CLOSED, created_at=NOVEMBER_2023).id
+    old_open_id = create_issue(status=IssueStatus.OPEN, created_at=NOVEMBER_2023).id
+    recent_closed_id = create_issue(status=IssueStatus.CLOSED, created_at=NOW - 10 * 24 * 3600).id
+    ensure_partitions(db_session, NOW, months_ahead=0)
+
+    archived = archive_partitions(db_session, NOW, archive_after_days=365)
+
+    assert archived == [ArchivedPartition("issues_closed_2023_11", 1)]
+    assert _stored_counts(db_session) == {"open": 1, "closed": 1}
+    assert client.get(f"{ISSUES_ENDPOINT}/{old_closed_id}").status_code == status.HTTP_404_NOT_FOUND
+    assert client.get(f"{ISSUES_ENDPOINT}/{old_open_id}").status_code == status.HTTP_200_OK
+    assert client.get(f"{ISSUES_ENDPOINT}/{recent_closed_id}").status_code == status.HTTP_200_OK
+
+    archived_ids = db_session.execute(text("SELECT id FROM archive.issues_closed_2023_11")).scalars().all()
+    assert archived_ids == [old_closed_id]
+    # The change feed reports archived issues as deleted
+    assert _tombstones(db_session) == [old_closed_id]
+
+def test_archive_moves_issues_closed_after_their_month_was_archived(client, db_session, create_issue):
+    old_open_id = create_issue(status=IssueStatus.OPEN, created_at=NOVEMBER_2023).id
+    old_closed_id = create_issue(status=IssueStatus.CLOSED, created_at=NOVEMBER_2023).id
+    ensure_partitions(db_session, NOW, months_ahead=0)
+    archive_partitions(db_session, NOW, archive_after_days=365)
+
+    client.patch(f"{ISSUES_ENDPOINT}/{old_open_id}", json={"status": "closed"})
+    assert _partition_of(db_session, old_open_id) == "issues_closed_default"
+
+    archived = archive_partitions(db_session, NOW, archive_after_days=365)
+
+    assert archived == [ArchivedPartition("issues_closed_default", 1)]
+    assert _stored_counts(db_session) == {"open": 0, "closed": 0}
+    assert db_session.execute(text("SELECT id FROM archive.issues_closed_default")).scalars().all() == [old_open_id]
+    assert _tombstones(db_session) == sorted([old_open_id, old_closed_id])
+
+def test_list_queries_skip_partitions(db_session):
+    # November 2029 to January 2030
+    ensure_partitions(db_session, NOW - 62 * 24 * 3600, months_ahead=2)
+
+    open_page = build_issue_page_query("open", None, 1, None).statement
+    assert _scanned_partitions(db_session, open_page) == {"issues_open"}
+
+    # A cursor from December 2029 rules out the January 2030 partition
+    cursor = encode_cursor(NOW - 40 * 24 * 3600, 1, CURSOR_NEXT)
+    cursor_page = build_issue_page_query("closed", None, 1, cursor).statement
+    assert _scanned_partitions(db_session, cursor_page) == {
+        "issues_closed_2029_11", "issues_closed_2029_12", "issues_closed_default"
+    }
+
+def test_lookup_by_id_probes_the_index_of_every_partition(db_session):
+    # id alone cannot prune, so the lookup costs one index probe per leaf
+    # partition; archiving is what keeps their number bounded
+    for months_ahead in (0, 24):
+        ensure_partitions(db_session, NOW, months_ahead=months_ahead)
+
+        scans = _scans(db_session, select_statement(1))
+        assert set(scans) == _leaf_partitions(db_session)
+        assert set(scans.values()) <= {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+    assert len(scans) == 27
+
+def test_issue_ids_stay_unique_across_partitions(client, db_session, create_issue):
+    moved_id = create_issue(status=IssueStatus.CLOSED, created_at=NOVEMBER_2023).id
+    closed_id = create_issue(status=IssueStatus.OPEN, created_at=NOW).id
+    ensure_partitions(db_session, NOW, months_ahead=0)
+    client.patch(f"{ISSUES_ENDPOINT}/{closed_id}", json={"status": "closed"})
+
+    assert _partition_of(db_session, moved_id) == "issues_closed_2023_11"
+    assert duplicate_issue_ids(db_session) == []
+
+    # The primary key alone would let an explicit id repeat in another partition
+    db_session.execute(text(
+        "INSERT INTO issues (id, title, description, status) VALUES (:id, 'Copy', 'd', 'open')"
+    ), {"id": moved_id})
+    assert duplicate_issue_ids(db_session) == [moved_id]
@@ -0,0 +1,74 @@
+"""
+Each single-issue write should reach Postgres as exactly one statement
+(plus transaction control), with RETURNING supplying the response.
+"""
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from app.models.issue import IssueStatus
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+
+
+@pytest.fixture
+def issued_statements(test_engine):
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")):
+            statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(test_engine, "before_cursor_execute", _capture)
+
+
+def test_create_is_one_insert_returning(client, issued_statements):
+    response = client.post(ISSUES_ENDPOINT, json={"title": "One trip", "description": "d"})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["id"] and response.json()["updated_at"]
+
+    assert len(issued_statements) == 1
+    assert issued_statements[0].startswith("INSERT INTO issues") and "RETURNING" in issued_statements[0]
+
+def test_update_is_one_update_returning_trigger_updated_at(client, create_issue, issued_statements):
+    issue = create_issue(title="Before", created_at=1600000000, updated_at=1600000000)
+    issued_statements.clear()
+
+    response = client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={"title": "After"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["title"] == "After"
+    assert data["description"] == "Test Description"
+    # Set by the BEFORE UPDATE trigger and returned by the same statement
+    assert data["updated_at"] > 1600000000
+
+    assert len(issued_statements) == 1
+    assert issued_statements[0].startswith("UPDATE issues") and "RETURNING" in issued_statements[0]
+
+def test_update_status_change_refreshes_both_buckets(client, create_issue):
+    issue = create_issue(status=IssueStatus.OPEN)
+    assert client.get(f"{ISSUES_ENDPOINT}?status_filter=open").json()["total"] == 1
+
+    client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={"status": "closed"})
+
+    assert client.get(f"{ISSUES_ENDPOINT}?status_filter=open").json()["total"] == 0
+    assert client.get(f"{ISSUES_ENDPOINT}?status_filter=closed").json()["total"] == 1
+
+def test_empty_update_returns_issue_unchanged(client, create_issue):
+    issue = create_issue(title="Same", updated_at=1600000000)
+
+    response = client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "Same"
+    assert response.json()["updated_at"] == 1600000000
+
+def test_delete_is_one_delete_returning(client, create_issue, issued_statements):
+    issue_id = create_issue().id
+    issued_statements.clear()
+
+    response = client.delete(f"{ISSUES_ENDPOINT}/{issue_id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert len(issued_statements) == 1
+    assert issued_statements[0].startswith("DELETE FROM issues") and "RETURNING" in issued_statements[0]
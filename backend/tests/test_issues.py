@@ -69,6 +69,7 @@ def test_list_issues_filter_by_status(client, create_issue, status_filter, expec
 def test_list_issues_invalid_status_filter(client):
     response = client.get(f"{ISSUES_ENDPOINT}?status_filter=invalid")
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "status_filter must be 'open' or 'closed'"
 
 def test_list_issues_sorting(client, create_issue):
     import time
@@ -104,6 +105,146 @@ def test_list_issues_sorting(client, create_issue):
     assert data["items"][0]["title"] == "First"
     assert data["items"][1]["title"] == "Second"
 
+def _walk_cursor_pages(client, query, cursor_key):
+    ids = []
+    url = f"{ISSUES_ENDPOINT}?{query}"
+    while True:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        ids.extend(item["id"] for item in data["items"])
+        if not data[cursor_key]:
+            return ids
+        url = f"{ISSUES_ENDPOINT}?{query}&cursor={data[cursor_key]}"
+
+@pytest.mark.parametrize("sort", ["asc", "desc"])
+def test_list_issues_cursor_walks_all_items_with_shared_created_at(client, create_multiple_issues, sort):
+    # All rows share one created_at second, so only the id tiebreaker keeps pages disjoint
+    issues = create_multiple_issues(PAGINATION_TEST_ISSUE_COUNT * 2, status=IssueStatus.OPEN)
+    expected = sorted((issue.id for issue in issues), reverse=sort == "desc")
+
+    assert _walk_cursor_pages(client, f"sort={sort}", "next_cursor") == expected
+
+def test_list_issues_cursor_prev_returns_previous_page(client, create_multiple_issues):
+    create_multiple_issues(PAGINATION_TEST_ISSUE_COUNT * 2, status=IssueStatus.OPEN)
+
+    first_page = client.get(ISSUES_ENDPOINT).json()
+    assert first_page["prev_cursor"] is None
+    second_page = client.get(f"{ISSUES_ENDPOINT}?cursor={first_page['next_cursor']}").json()
+    back_page = client.get(f"{ISSUES_ENDPOINT}?cursor={second_page['prev_cursor']}").json()
+
+    assert [item["id"] for item in back_page["items"]] == [item["id"] for item in first_page["items"]]
+    assert back_page["prev_cursor"] is None
+    assert back_page["next_cursor"] is not None
+
+def test_list_issues_cursor_with_status_filter(client, create_multiple_issues):
+    open_issues = create_multiple_issues(PAGINATION_TEST_ISSUE_COUNT, status=IssueStatus.OPEN)
+    create_multiple_issues(PAGINATION_TEST_ISSUE_COUNT, status=IssueStatus.CLOSED)
+
+    ids = _walk_cursor_pages(client, "status_filter=open&sort=asc", "next_cursor")
+    assert ids == sorted(issue.id for issue in open_issues)
+
+def test_list_issues_invalid_cursor(client):
+    response = client.get(f"{ISSUES_ENDPOINT}?cursor=not-a-cursor")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "cursor is invalid"
+
+def test_list_issues_search_ranks_title_matches_first(client, create_issue):
+    create_issue(title="Crash on save", description="The editor stops responding")
+    create_issue(title="Slow startup", description="Startup crashes sometimes when saving")
+    create_issue(title="Unrelated", description="Nothing to see here")
+
+    response = client.get(f"{ISSUES_ENDPOINT}?q=crash")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    # Stemmed match in both, but the title weighs more than the description
+    assert [item["title"] for item in data["items"]] == ["Crash on save", "Slow startup"]
+    assert data["total"] == 2
+
+def test_list_issues_search_with_status_filter_and_pages(client, create_multiple_issues, create_issue):
+    create_multiple_issues(25, description="Login page timeout", status=IssueStatus.OPEN)
+    create_issue(title="Closed timeout", description="Login page timeout", status=IssueStatus.CLOSED)
+
+    first_page = client.get(f"{ISSUES_ENDPOINT}?q=timeout&status_filter=open").json()
+    assert first_page["total"] == 25
+    assert len(first_page["items"]) == 20
+    assert first_page["total_pages"] == 2
+
+    second_page = client.get(f"{ISSUES_ENDPOINT}?q=timeout&status_filter=open&page=2").json()
+    assert len(second_page["items"]) == 5
+    ids = {item["id"] for item in first_page["items"]} | {item["id"] for item in second_page["items"]}
+    assert len(ids) == 25
+
+def test_list_issues_search_sees_updates(client, create_issue):
+    issue = create_issue(title="Original title")
+    assert client.get(f"{ISSUES_ENDPOINT}?q=renamed").json()["total"] == 0
+
+    client.patch(f"{ISSUES_ENDPOINT}/{issue.id}", json={"title": "Renamed title"})
+
+    assert client.get(f"{ISSUES_ENDPOINT}?q=renamed").json()["total"] == 1
+
+def test_list_issues_blank_search_lists_everything(client, create_multiple_issues):
+    create_multiple_issues(3)
+
+    assert client.get(f"{ISSUES_ENDPOINT}?q=%20%20").json()["total"] == 3
+
+def test_list_issues_search_rejects_cursor(client, create_multiple_issues):
+    create_multiple_issues(25)
+    next_cursor = client.get(ISSUES_ENDPOINT).json()["next_cursor"]
+
+    response = client.get(f"{ISSUES_ENDPOINT}?q=test&cursor={next_cursor}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_list_issues_returns_only_requested_fields(client, create_issue):
+    create_issue(title="Sparse", status=IssueStatus.CLOSED)
+
+    response = client.get(f"{ISSUES_ENDPOINT}?fields=status, title,id")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert list(data["items"][0]) == ["id", "title", "status"]
+    assert data["items"][0]["status"] == "closed"
+    assert data["total"] == 1
+
+def test_list_issues_summary_view_truncates_the_description(client, create_issue):
+    create_issue(title="Long", description="word " * 100)
+    create_issue(title="Short", description="Fits whole")
+
+    items = client.get(f"{ISSUES_ENDPOINT}?view=summary&sort=asc").json()["items"]
+
+    assert set(items[0]) == {"id", "title", "status", "created_at", "updated_at", "excerpt"}
+    assert items[0]["excerpt"].endswith("word…")
+    assert len(items[0]["excerpt"]) <= 151
+    assert items[1]["excerpt"] == "Fits whole"
+
+@pytest.mark.parametrize("query, detail", [
+    ("fields=id,secret", "fields must be a comma-separated subset of: "),
+    ("fields=,", "fields must be a comma-separated subset of: "),
+    ("view=compact", "view must be 'full' or 'summary'"),
+    ("fields=id&view=summary", "fields cannot be combined with view"),
+])
+def test_list_issues_rejects_invalid_fields(client, query, detail):
+    response = client.get(f"{ISSUES_ENDPOINT}?{query}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"].startswith(detail)
+
+def test_list_issues_sparse_pages_walk_with_cursors(client, create_multiple_issues):
+    issues = create_multiple_issues(PAGINATION_TEST_ISSUE_COUNT, status=IssueStatus.OPEN)
+
+    ids = _walk_cursor_pages(client, "fields=id&sort=asc", "next_cursor")
+    assert ids == sorted(issue.id for issue in issues)
+
+def test_list_issues_sparse_and_full_pages_are_cached_apart(client, create_issue):
+    create_issue(title="Cached")
+
+    sparse = client.get(f"{ISSUES_ENDPOINT}?fields=title")
+    full = client.get(ISSUES_ENDPOINT)
+
+    assert sparse.json()["items"] == [{"title": "Cached"}]
+    assert "description" in full.json()["items"][0]
+    assert sparse.headers["etag"] != full.headers["etag"]
+    response = client.get(f"{ISSUES_ENDPOINT}?fields=title", headers={"If-None-Match": sparse.headers["etag"]})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
 # ==================== CREATE ISSUE (POST /api/v1/issues) ====================
 
 def test_create_issue_success(client):
@@ -0,0 +1,172 @@
+import json
+import pytest
+import httpx
+from fastapi import FastAPI, status
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.api.v1.endpoints import issues_async
+from app.config import settings
+from app.database import get_async_db, get_async_database_url, get_async_read_db
+from app.services.issue_cache import issue_cache
+from tests.conftest import TEST_DATABASE_URL
+
+pytest.importorskip("asyncpg")
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+NONEXISTENT_ID = 99999
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_client(test_engine):
+    engine = create_async_engine(get_async_database_url(TEST_DATABASE_URL))
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, autoflush=False, expire_on_commit=False)
+
+        app = FastAPI()
+        app.include_router(issues_async.router, prefix="/api/v1")
+
+        async def _get_test_db():
+            yield session
+
+        app.dependency_overrides[get_async_db] = _get_test_db
+        app.dependency_overrides[get_async_read_db] = _get_test_db
+
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            yield client
+
+        await session.close()
+        await transaction.rollback()
+    await engine.dispose()
+
+
+async def test_async_crud_round_trip(async_client):
+    response = await async_client.post(ISSUES_ENDPOINT, json={"title": "  Async  ", "description": "Via asyncpg"})
+    assert response.status_code == status.HTTP_201_CREATED
+    issue = response.json()
+    assert issue["title"] == "Async"
+
+    response = await async_client.get(f"{ISSUES_ENDPOINT}/{issue['id']}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["description"] == "Via asyncpg"
+
+    response = await async_client.patch(f"{ISSUES_ENDPOINT}/{issue['id']}", json={"status": "closed"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "closed"
+
+    response = await async_client.delete(f"{ISSUES_ENDPOINT}/{issue['id']}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await async_client.get(f"{ISSUES_ENDPOINT}/{issue['id']}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_async_list_issues_filter_and_cursor(async_client):
+    for i in range(25):
+        await async_client.post(ISSUES_ENDPOINT, json={"title": f"Issue {i}", "description": "d", "status": "open"})
+    await async_client.post(ISSUES_ENDPOINT, json={"title": "Closed", "description": "d", "status": "closed"})
+
+    first_page = (await async_client.get(f"{ISSUES_ENDPOINT}?status_filter=open")).json()
+    assert first_page["total"] == 25
+    assert len(first_page["items"]) == 20
+
+    second_page = (await async_client.get(
+        f"{ISSUES_ENDPOINT}?status_filter=open&cursor={first_page['next_cursor']}"
+    )).json()
+    assert len(second_page["items"]) == 5
+    assert second_page["next_cursor"] is None
+
+
+async def test_async_invalid_status_filter(async_client):
+    response = await async_client.get(f"{ISSUES_ENDPOINT}?status_filter=invalid")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "status_filter must be 'open' or 'closed'"
+
+
+async def test_async_list_issues_summary_view(async_client):
+    await async_client.post(ISSUES_ENDPOINT, json={"title": "Summary", "description": "x" * 500})
+
+    item = (await async_client.get(f"{ISSUES_ENDPOINT}?view=summary")).json()["items"][0]
+    assert "description" not in item
+    assert item["excerpt"] == "x" * 150 + "…"
+
+
+async def test_async_update_issue_not_found(async_client):
+    response = await async_client.patch(f"{ISSUES_ENDPOINT}/{NONEXISTENT_ID}", json={"title": "Updated"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_async_get_issue_if_none_match(async_client):
+    issue = (await async_client.post(ISSUES_ENDPOINT, json={"title": "ETag", "description": "d"})).json()
+    etag = (await async_client.get(f"{ISSUES_ENDPOINT}/{issue['id']}")).headers["etag"]
+    issue_cache.clear()
+
+    response = await async_client.get(f"{ISSUES_ENDPOINT}/{issue['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+async def test_async_batch_get(async_client):
+    first = (await async_client.post(ISSUES_ENDPOINT, json={"title": "First", "description": "d"})).json()
+    second = (await async_client.post(ISSUES_ENDPOINT, json={"title": "Second", "description": "d"})).json()
+
+    response = await async_client.get(f"{ISSUES_ENDPOINT}/batch?ids={second['id']},{NONEXISTENT_ID},{first['id']}")
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["title"] for item in response.json()["items"]] == ["Second", "First"]
+    assert response.json()["missing"] == [NONEXISTENT_ID]
+
+    response = await async_client.post(f"{ISSUES_ENDPOINT}/batch", json={"ids": [first["id"], first["id"]]})
+    assert [item["id"] for item in response.json()["items"]] == [first["id"]]
+
+
+async def test_async_bulk_update_and_delete(async_client, monkeypatch):
+    created = (await async_client.post(f"{ISSUES_ENDPOINT}/bulk", json=[{"title": "t", "description": "d"}] * 3)).json()
+    ids = [issue["id"] for issue in created]
+
+    response = await async_client.patch(f"{ISSUES_ENDPOINT}/bulk", json={"ids": ids[:2], "patch": {"status": "closed"}})
+    assert sorted(response.json()["ids"]) == ids[:2]
+
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+    response = await async_client.post(f"{ISSUES_ENDPOINT}/bulk/delete", json={"filter": {"created_after": 0}})
+    assert response.json() == {"ids": None, "count": 3}
+
+
+async def test_async_changes(async_client, monkeypatch):
+    monkeypatch.setattr(settings, "CHANGE_FEED_SETTLE_SECONDS", 0)
+    deleted = (await async_client.post(ISSUES_ENDPOINT, json={"title": "Deleted", "description": "d"})).json()
+    kept = (await async_client.post(ISSUES_ENDPOINT, json={"title": "Kept", "description": "d"})).json()
+    await async_client.delete(f"{ISSUES_ENDPOINT}/{deleted['id']}")
+
+    page = (await async_client.get(f"{ISSUES_ENDPOINT}/changes")).json()
+    assert [item["id"] for item in page["items"]] == [kept["id"]]
+    assert [tombstone["id"] for tombstone in page["deleted"]] == [deleted["id"]]
+
+    response = await async_client.get(f"{ISSUES_ENDPOINT}/changes?since={page['next_cursor']}")
+    data = response.json()
+    assert (data["items"], data["deleted"], data["has_more"]) == ([], [], False)
+
+
+async def test_async_export_ndjson(async_client):
+    for i in range(3):
+        await async_client.post(ISSUES_ENDPOINT, json={"title": f"Issue {i}", "description": "d"})
+
+    response = await async_client.get(f"{ISSUES_ENDPOINT}/export?format=ndjson&sort=asc")
+    assert response.status_code == status.HTTP_200_OK
+    lines = response.text.splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["Issue 0", "Issue 1", "Issue 2"]
+
+
+async def test_async_import_csv(async_client):
+    body = "title,description,status\nOne,d,closed\n,Blank title,\nTwo,d,\n"
+
+    response = await async_client.post(f"{ISSUES_ENDPOINT}/import", files={"file": ("legacy.csv", body)})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert (response.json()["imported"], response.json()["rejected"]) == (2, 1)
+
+    listing = (await async_client.get(f"{ISSUES_ENDPOINT}?status_filter=closed")).json()
+    assert [item["title"] for item in listing["items"]] == ["One"]
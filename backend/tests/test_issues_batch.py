@@ -0,0 +1,59 @@
+from fastapi import status
+from app.config import settings
+from app.models.issue import IssueStatus
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+BATCH_ENDPOINT = f"{ISSUES_ENDPOINT}/batch"
+NONEXISTENT_ID = 99999
+
+# ==================== BATCH GET (GET/POST /api/v1/issues/batch) ====================
+
+def test_batch_get_keeps_requested_order_and_reports_missing(client, create_issue):
+    first = create_issue(title="First")
+    second = create_issue(title="Second", status=IssueStatus.CLOSED)
+
+    response = client.get(f"{BATCH_ENDPOINT}?ids={second.id},{NONEXISTENT_ID},{first.id}")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [item["title"] for item in data["items"]] == ["Second", "First"]
+    assert data["items"][0]["status"] == "closed"
+    assert data["missing"] == [NONEXISTENT_ID]
+
+def test_batch_post_matches_get(client, create_issue):
+    issues = [create_issue(title=f"Issue {i}") for i in range(3)]
+    ids = [issue.id for issue in reversed(issues)]
+
+    response = client.post(BATCH_ENDPOINT, json={"ids": ids})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == client.get(f"{BATCH_ENDPOINT}?ids={','.join(map(str, ids))}").json()
+
+def test_batch_get_returns_repeated_ids_once(client, create_issue):
+    issue = create_issue()
+
+    data = client.get(f"{BATCH_ENDPOINT}?ids={issue.id},{issue.id},{NONEXISTENT_ID},{NONEXISTENT_ID}").json()
+    assert [item["id"] for item in data["items"]] == [issue.id]
+    assert data["missing"] == [NONEXISTENT_ID]
+
+def test_batch_reports_ids_outside_the_integer_range_as_missing(client, create_issue):
+    issue = create_issue()
+    out_of_range = [99999999999, -99999999999, 0]
+
+    response = client.get(f"{BATCH_ENDPOINT}?ids={issue.id},{','.join(map(str, out_of_range))}")
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.json()["items"]] == [issue.id]
+    assert response.json()["missing"] == out_of_range
+
+    response = client.post(BATCH_ENDPOINT, json={"ids": [issue.id, *out_of_range]})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["missing"] == out_of_range
+
+def test_batch_get_rejects_malformed_ids(client):
+    assert client.get(f"{BATCH_ENDPOINT}?ids=1,two").status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get(f"{BATCH_ENDPOINT}?ids=,").status_code == status.HTTP_400_BAD_REQUEST
+    assert client.post(BATCH_ENDPOINT, json={"ids": []}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_batch_get_rejects_oversized_batch(client, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+
+    response = client.get(f"{BATCH_ENDPOINT}?ids=1,2,3")
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
@@ -0,0 +1,209 @@
+from fastapi import status
+from sqlalchemy import event, text
+from app.config import settings
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+BULK_ENDPOINT = f"{ISSUES_ENDPOINT}/bulk"
+
+# ==================== BULK CREATE (POST /api/v1/issues/bulk) ====================
+
+def test_bulk_create_returns_issues_in_order(client, db_session):
+    payload = [
+        {"title": f"  Bulk {i}  ", "description": f"Description {i}", "status": "closed" if i % 2 else "open"}
+        for i in range(5)
+    ]
+
+    response = client.post(BULK_ENDPOINT, json=payload)
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert [item["title"] for item in data] == [f"Bulk {i}" for i in range(5)]
+    assert [item["status"] for item in data] == ["open", "closed", "open", "closed", "open"]
+    assert all(item["id"] and item["created_at"] for item in data)
+
+    counts = dict(db_session.execute(text("SELECT status, count FROM issue_counts")).all())
+    assert counts == {"open": 3, "closed": 2}
+
+def test_bulk_create_does_not_reload_rows(client, test_engine):
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", _capture)
+    try:
+        payload = [{"title": f"Bulk {i}", "description": "d"} for i in range(5)]
+        response = client.post(BULK_ENDPOINT, json=payload)
+    finally:
+        event.remove(test_engine, "before_cursor_execute", _capture)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [item["title"] for item in response.json()] == [item["title"] for item in payload]
+    # One INSERT ... RETURNING, no SELECT per instance expired by the commit
+    assert [statement.split()[0] for statement in statements if "issues" in statement] == ["INSERT"]
+
+def test_bulk_create_reports_every_invalid_item(client):
+    payload = [
+        {"title": "Valid", "description": "Valid"},
+        {"title": "   ", "description": "Blank title"},
+        {"title": "Bad status", "description": "d", "status": "pending"},
+        "not an object",
+    ]
+
+    response = client.post(BULK_ENDPOINT, json=payload)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    errors = response.json()["detail"]["errors"]
+    assert [error["index"] for error in errors] == [1, 2, 3]
+    assert errors[0]["errors"][0]["loc"] == ["title"]
+    assert errors[1]["errors"][0]["loc"] == ["status"]
+
+    # Nothing is inserted when any item is invalid
+    assert client.get(ISSUES_ENDPOINT).json()["total"] == 0
+
+def test_bulk_create_rejects_oversized_batch(client, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+    payload = [{"title": "t", "description": "d"}] * 3
+
+    response = client.post(BULK_ENDPOINT, json=payload)
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+def test_bulk_create_empty_list(client):
+    response = client.post(BULK_ENDPOINT, json=[])
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == []
+
+def test_bulk_create_invalidates_cached_lists(client):
+    client.get(ISSUES_ENDPOINT)
+
+    client.post(BULK_ENDPOINT, json=[{"title": "t", "description": "d"}])
+
+    assert client.get(ISSUES_ENDPOINT).json()["total"] == 1
+
+# ==================== BULK UPDATE (PATCH /api/v1/issues/bulk) ====================
+
+def test_bulk_update_by_ids(client, create_issue):
+    first = create_issue(title="First")
+    second = create_issue(title="Second")
+    untouched = create_issue(title="Untouched")
+
+    response = client.patch(BULK_ENDPOINT, json={"ids": [first.id, second.id], "patch": {"status": "closed"}})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert sorted(data["ids"]) == sorted([first.id, second.id])
+    assert data["count"] == 2
+
+    assert client.get(f"{ISSUES_ENDPOINT}/{first.id}").json()["status"] == "closed"
+    assert client.get(f"{ISSUES_ENDPOINT}/{untouched.id}").json()["status"] == "open"
+
+def test_bulk_update_by_filter_bumps_updated_at_and_counts(client, db_session, seed_bulk_issues):
+    seed_bulk_issues(30)
+    cutoff = 1700000000 + 5 * 60
+
+    response = client.patch(BULK_ENDPOINT, json={
+        "filter": {"status": "open", "created_before": cutoff},
+        "patch": {"status": "closed"}
+    })
+    assert response.status_code == status.HTTP_200_OK
+    # n = 1..14 fall before the cutoff, of which 3, 6, 9 and 12 were already closed
+    assert response.json()["count"] == 10
+
+    rows = db_session.execute(
+        text("SELECT updated_at FROM issues WHERE id = ANY(:ids)"), {"ids": response.json()["ids"]}
+    ).scalars().all()
+    assert all(updated_at > cutoff for updated_at in rows)
+
+    counts = dict(db_session.execute(text("SELECT status, count FROM issue_counts")).all())
+    assert counts == {"open": 10, "closed": 20}
+
+def test_bulk_update_no_matches(client, create_issue):
+    create_issue()
+
+    response = client.patch(BULK_ENDPOINT, json={"ids": [999999], "patch": {"title": "Nope"}})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"ids": [], "count": 0}
+
+def test_bulk_update_requires_selection(client):
+    response = client.patch(BULK_ENDPOINT, json={"patch": {"status": "closed"}})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = client.patch(BULK_ENDPOINT, json={"filter": {}, "patch": {"status": "closed"}})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_bulk_update_rejects_empty_patch(client, create_issue):
+    issue = create_issue()
+
+    response = client.patch(BULK_ENDPOINT, json={"ids": [issue.id], "patch": {}})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_bulk_update_invalidates_cached_reads(client, create_issue):
+    issue = create_issue()
+    client.get(f"{ISSUES_ENDPOINT}/{issue.id}")
+    client.get(ISSUES_ENDPOINT, params={"status_filter": "closed"})
+
+    client.patch(BULK_ENDPOINT, json={"ids": [issue.id], "patch": {"status": "closed"}})
+
+    assert client.get(f"{ISSUES_ENDPOINT}/{issue.id}").json()["status"] == "closed"
+    assert client.get(ISSUES_ENDPOINT, params={"status_filter": "closed"}).json()["total"] == 1
+
+def test_bulk_update_rejects_too_many_ids(client, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+
+    response = client.patch(BULK_ENDPOINT, json={"ids": [1, 2, 3], "patch": {"title": "t"}})
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+def test_bulk_update_past_the_limit_returns_only_the_count(client, create_issue, monkeypatch):
+    issues = [create_issue(title="Before") for _ in range(3)]
+    client.get(f"{ISSUES_ENDPOINT}/{issues[0].id}")
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+
+    response = client.patch(BULK_ENDPOINT, json={"filter": {"status": "open"}, "patch": {"title": "After"}})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"ids": None, "count": 3}
+
+    # Without the ids, every cached detail is dropped
+    assert client.get(f"{ISSUES_ENDPOINT}/{issues[0].id}").json()["title"] == "After"
+
+# ==================== BULK DELETE (POST /api/v1/issues/bulk/delete) ====================
+
+def test_bulk_delete_by_filter(client, db_session, seed_bulk_issues):
+    seed_bulk_issues(30)
+
+    response = client.post(f"{BULK_ENDPOINT}/delete", json={"filter": {"status": "closed"}})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["count"] == 10
+
+    counts = dict(db_session.execute(text("SELECT status, count FROM issue_counts")).all())
+    assert counts == {"open": 20, "closed": 0}
+    assert client.get(ISSUES_ENDPOINT, params={"status_filter": "closed"}).json()["total"] == 0
+
+def test_bulk_delete_by_ids_and_filter(client, create_issue):
+    open_id = create_issue(status="open").id
+    closed_id = create_issue(status="closed").id
+
+    response = client.post(f"{BULK_ENDPOINT}/delete", json={
+        "ids": [open_id, closed_id],
+        "filter": {"status": "closed"}
+    })
+    assert response.json() == {"ids": [closed_id], "count": 1}
+    assert client.get(f"{ISSUES_ENDPOINT}/{open_id}").status_code == status.HTTP_200_OK
+    assert client.get(f"{ISSUES_ENDPOINT}/{closed_id}").status_code == status.HTTP_404_NOT_FOUND
+
+def test_bulk_delete_requires_selection(client):
+    response = client.post(f"{BULK_ENDPOINT}/delete", json={})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_bulk_delete_rejects_too_many_ids(client, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+
+    response = client.post(f"{BULK_ENDPOINT}/delete", json={"ids": [1, 2, 3]})
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+def test_bulk_delete_past_the_limit_returns_only_the_count(client, seed_bulk_issues, monkeypatch):
+    seed_bulk_issues(30)
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 10)
+
+    response = client.post(f"{BULK_ENDPOINT}/delete", json={"filter": {"status": "open"}})
+    assert response.json() == {"ids": None, "count": 20}
+
+    response = client.post(f"{BULK_ENDPOINT}/delete", json={"filter": {"status": "closed"}})
+    assert response.json()["count"] == 10
+    assert len(response.json()["ids"]) == 10
@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+from fastapi import status
+from app.services import issue_export
+
+EXPORT_ENDPOINT = "/api/v1/issues/export"
+
+# ==================== EXPORT (GET /api/v1/issues/export) ====================
+
+def test_export_ndjson_streams_every_issue(client, seed_bulk_issues, monkeypatch):
+    # Force several server-side cursor batches
+    monkeypatch.setattr(issue_export, "EXPORT_BATCH_SIZE", 7)
+    seed_bulk_issues(50)
+
+    response = client.get(EXPORT_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="issues.ndjson"' in response.headers["content-disposition"]
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 50
+    assert set(rows[0]) == {"id", "title", "description", "status", "created_at", "updated_at"}
+    # Default sort is newest first, ties broken by id
+    keys = [(row["created_at"], row["id"]) for row in rows]
+    assert keys == sorted(keys, reverse=True)
+
+def test_export_csv_with_filter_and_sort(client, create_issue):
+    create_issue(title="Open, with comma", description='Quote " and\nnewline')
+    create_issue(title="Closed", status="closed")
+
+    response = client.get(EXPORT_ENDPOINT, params={"format": "csv", "status_filter": "open", "sort": "asc"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["title"] == "Open, with comma"
+    assert rows[0]["description"] == 'Quote " and\nnewline'
+    assert rows[0]["status"] == "open"
+
+def test_export_csv_empty_table_has_header(client):
+    response = client.get(EXPORT_ENDPOINT, params={"format": "csv"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.text == "id,title,description,status,created_at,updated_at\n"
+
+def test_export_invalid_format(client):
+    response = client.get(EXPORT_ENDPOINT, params={"format": "xml"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_export_invalid_status_filter(client):
+    response = client.get(EXPORT_ENDPOINT, params={"status_filter": "pending"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,107 @@
+import io
+import json
+from fastapi import status
+from sqlalchemy import text
+from app.services import issue_import
+from app.services.issue_import import import_issues
+
+IMPORT_ENDPOINT = "/api/v1/issues/import"
+
+CSV_IMPORT = (
+    "title,description,status,created_at\n"
+    "  Legacy 1  ,First,closed,1600000000\n"
+    "Legacy 2,\"Multi-line,\nquoted\",,\n"
+    "   ,Blank title,open,\n"
+    "Legacy 3,Bad status,pending,\n"
+)
+
+# ==================== IMPORT SERVICE ====================
+
+def test_import_issues_copies_valid_rows_and_reports_rejects(db_session, monkeypatch):
+    # Several COPY chunks
+    monkeypatch.setattr(issue_import, "COPY_CHUNK_ROWS", 2)
+    rejects = []
+
+    report = import_issues(db_session, io.StringIO(CSV_IMPORT), "csv", rejects.append)
+    db_session.commit()
+
+    assert (report.imported, report.rejected) == (2, 2)
+    assert report.rows_per_second >= 0
+    assert [rejected.line for rejected in rejects] == [5, 6]
+    assert rejects[0].errors[0]["loc"] == ("title",)
+    assert rejects[1].errors[0]["loc"] == ("status",)
+
+    rows = db_session.execute(
+        text("SELECT title, description, status, created_at FROM issues ORDER BY title")
+    ).all()
+    assert [(row.title, row.description, row.status) for row in rows] == [
+        ("Legacy 1", "First", "closed"),
+        ("Legacy 2", "Multi-line,\nquoted", "open"),
+    ]
+    assert rows[0].created_at == 1600000000
+
+    counts = dict(db_session.execute(text("SELECT status, count FROM issue_counts")).all())
+    assert counts == {"open": 1, "closed": 1}
+
+def test_import_issues_ndjson_rejects_bad_lines(db_session):
+    lines = [
+        json.dumps({"title": "One", "description": "d"}),
+        "",
+        "{not json",
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"title": "Two", "description": "d", "created_at": -1}),
+    ]
+    rejects = []
+
+    report = import_issues(db_session, io.StringIO("\n".join(lines) + "\n"), "ndjson", rejects.append)
+
+    assert (report.imported, report.rejected) == (1, 3)
+    assert [rejected.line for rejected in rejects] == [3, 4, 5]
+    assert rejects[0].errors[0]["type"] == "json_invalid"
+    assert json.loads(rejects[2].to_json())["record"]["title"] == "Two"
+
+# ==================== IMPORT (POST /api/v1/issues/import) ====================
+
+def test_import_upload_csv(client):
+    client.get("/api/v1/issues")
+
+    response = client.post(IMPORT_ENDPOINT, files={"file": ("legacy.csv", CSV_IMPORT, "text/csv")})
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert (data["imported"], data["rejected"]) == (2, 2)
+    assert [rejected["line"] for rejected in data["rejects"]] == [5, 6]
+
+    # Cached list pages are invalidated
+    assert client.get("/api/v1/issues").json()["total"] == 2
+
+def test_import_upload_rejects_out_of_range_created_at(client):
+    # Millisecond timestamps, common in legacy exports, do not fit the column
+    csv_body = "title,description,created_at\nKept,d,1700000000\nMillis,d,1700000000000\n"
+    ndjson_body = "\n".join([
+        json.dumps({"title": "Kept", "description": "d"}),
+        json.dumps({"title": "Millis", "description": "d", "created_at": 1700000000000}),
+    ]) + "\n"
+
+    for filename, body in [("legacy.csv", csv_body), ("legacy.ndjson", ndjson_body)]:
+        response = client.post(IMPORT_ENDPOINT, files={"file": (filename, body)})
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert (data["imported"], data["rejected"]) == (1, 1)
+        assert data["rejects"][0]["line"] == (3 if filename.endswith(".csv") else 2)
+        assert data["rejects"][0]["errors"][0]["loc"] == ["created_at"]
+
+def test_import_upload_format_param_overrides_filename(client):
+    body = json.dumps({"title": "One", "description": "d"}) + "\n"
+
+    response = client.post(IMPORT_ENDPOINT, params={"format": "ndjson"}, files={"file": ("upload.txt", body)})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["imported"] == 1
+
+def test_import_upload_unknown_format(client):
+    response = client.post(IMPORT_ENDPOINT, files={"file": ("upload.txt", "title,description\n")})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_import_upload_rejects_non_utf8(client):
+    response = client.post(IMPORT_ENDPOINT, files={"file": ("legacy.csv", b"title,description\n\xff\xfe,x\n")})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get("/api/v1/issues").json()["total"] == 0
@@ -0,0 +1,69 @@
+import pytest
+from fastapi import status
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+SUGGEST_ENDPOINT = "/api/v1/issues/suggest"
+
+
+@pytest.fixture
+def trigram_index(db_connection):
+    """The trigram index needs pg_trgm, which not every test server ships"""
+    savepoint = db_connection.begin_nested()
+    try:
+        db_connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except SQLAlchemyError:
+        savepoint.rollback()
+        pytest.skip("pg_trgm extension is not available")
+    db_connection.execute(text("CREATE INDEX ix_issues_title_trgm ON issues USING gin (title gin_trgm_ops)"))
+    savepoint.commit()
+
+# ==================== SUGGEST (GET /api/v1/issues/suggest) ====================
+
+def test_suggest_ranks_prefix_matches_first(client, create_issue, trigram_index):
+    create_issue(title="Export to CSV fails")
+    create_issue(title="Login button misaligned")
+    create_issue(title="Cannot export large reports")
+
+    response = client.get(SUGGEST_ENDPOINT, params={"prefix": "exp"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [item["title"] for item in data] == ["Export to CSV fails", "Cannot export large reports"]
+    assert set(data[0]) == {"id", "title", "status"}
+
+def test_suggest_matches_typos(client, create_issue, trigram_index):
+    create_issue(title="Notification emails are delayed")
+
+    response = client.get(SUGGEST_ENDPOINT, params={"prefix": "notifcation"})
+    assert [item["title"] for item in response.json()] == ["Notification emails are delayed"]
+
+def test_suggest_escapes_like_wildcards(client, create_issue, trigram_index):
+    create_issue(title="Progress stuck at 100%")
+    create_issue(title="Progress bar flickers")
+
+    response = client.get(SUGGEST_ENDPOINT, params={"prefix": "100%"})
+    assert [item["title"] for item in response.json()] == ["Progress stuck at 100%"]
+
+def test_suggest_limit(client, create_multiple_issues, trigram_index):
+    create_multiple_issues(15, title="Dashboard widget broken")
+
+    assert len(client.get(SUGGEST_ENDPOINT, params={"prefix": "dash"}).json()) == 10
+    assert len(client.get(SUGGEST_ENDPOINT, params={"prefix": "dash", "limit": 3}).json()) == 3
+
+def test_suggest_cache_is_cleared_by_writes(client, create_issue, trigram_index):
+    issue = create_issue(title="Payment declined")
+    assert len(client.get(SUGGEST_ENDPOINT, params={"prefix": "pay"}).json()) == 1
+    # Served from the cache, whatever the case of the prefix
+    assert len(client.get(SUGGEST_ENDPOINT, params={"prefix": "PAY"}).json()) == 1
+
+    client.patch(f"/api/v1/issues/{issue.id}", json={"title": "Refund declined"})
+
+    assert client.get(SUGGEST_ENDPOINT, params={"prefix": "pay"}).json() == []
+
+def test_suggest_validates_parameters(client):
+    assert client.get(SUGGEST_ENDPOINT).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert client.get(SUGGEST_ENDPOINT, params={"prefix": "abc", "limit": 0}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    # Too short to use the trigram index
+    assert client.get(SUGGEST_ENDPOINT, params={"prefix": "ab"}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert client.get(SUGGEST_ENDPOINT, params={"prefix": "   "}).json() == []
+    assert client.get(SUGGEST_ENDPOINT, params={"prefix": " ab "}).json() == []
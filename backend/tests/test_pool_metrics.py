@@ -0,0 +1,111 @@
+import time
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.pool import QueuePool
+from app.core.metrics import Histogram
+from app.core.pool_metrics import PoolMetrics, instrumented_pool_class
+from tests.conftest import TEST_DATABASE_URL
+
+POOL_STATS_ENDPOINT = "/api/v1/diagnostics/pool"
+
+
+@pytest.fixture
+def small_pool():
+    metrics = PoolMetrics()
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        poolclass=instrumented_pool_class(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1
+    )
+    metrics.attach(engine)
+    yield engine, metrics
+    engine.dispose()
+
+
+# ==================== HISTOGRAM ====================
+
+def test_histogram_counts_are_cumulative():
+    histogram = Histogram([0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 2, "1": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(3.65)
+
+# ==================== POOL METRICS ====================
+
+def test_pool_stats_track_checked_out_and_idle(small_pool):
+    engine, metrics = small_pool
+
+    with engine.connect():
+        stats = metrics.stats(engine.pool)
+        assert stats["checked_out"] == 1
+        assert stats["idle"] == 0
+
+    stats = metrics.stats(engine.pool)
+    assert stats["checked_out"] == 0
+    assert stats["idle"] == 1
+    assert stats["size"] == 1
+    assert stats["overflow"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["connects"] == 1
+    assert stats["checkout_wait_seconds"]["count"] == 1
+
+def test_exhausted_pool_counts_timeouts(small_pool):
+    engine, metrics = small_pool
+
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = metrics.stats(engine.pool)
+    assert stats["timeouts"] == 1
+    assert stats["checkouts"] == 1
+    # The timed-out wait is observed too, in a bucket above the pool timeout
+    wait = stats["checkout_wait_seconds"]
+    assert wait["count"] == 2
+    assert wait["sum"] >= 0.1
+    assert wait["buckets"]["0.05"] <= 1
+
+def test_connect_time_is_not_counted_as_waiting(small_pool):
+    engine, metrics = small_pool
+
+    @event.listens_for(engine, "do_connect")
+    def _slow_connect(dialect, connection_record, cargs, cparams):
+        time.sleep(0.2)
+
+    with engine.connect():
+        pass
+
+    stats = metrics.stats(engine.pool)
+    assert stats["connect_seconds"]["count"] == 1
+    assert stats["connect_seconds"]["sum"] >= 0.2
+    assert stats["checkout_wait_seconds"]["count"] == 1
+    assert stats["checkout_wait_seconds"]["sum"] < 0.1
+
+def test_metrics_survive_engine_dispose(small_pool):
+    engine, metrics = small_pool
+
+    with engine.connect():
+        pass
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    stats = metrics.stats(engine.pool)
+    assert stats["checkouts"] == 2
+    assert stats["checkout_wait_seconds"]["count"] == 2
+
+# ==================== ENDPOINT ====================
+
+def test_pool_stats_endpoint(client):
+    response = client.get(POOL_STATS_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    stats = response.json()["sync"]
+    for key in ("size", "checked_out", "idle", "overflow", "timeouts", "checkout_wait_seconds", "connect_seconds"):
+        assert key in stats
@@ -0,0 +1,147 @@
+"""
+Query-plan regression tests.
+
+Each test drives an endpoint against a seeded table, captures the SQL it
+actually sends to Postgres and runs EXPLAIN on it. A plan that falls back
+to a sequential scan of `issues` (any of its partitions) or adds a Sort
+node fails the test, so a dropped index or a query change that defeats one
+is caught before deploy.
+"""
+import json
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from app.config import settings
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+SEEDED_ISSUE_COUNT = 30000
+FORBIDDEN_NODE_TYPES = {"Sort", "Incremental Sort"}
+
+
+@pytest.fixture
+def captured_statements(test_engine):
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if " issues" in statement and not statement.lstrip().upper().startswith(("EXPLAIN", "ANALYZE")):
+            statements.append((statement, parameters))
+
+    event.listen(test_engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(test_engine, "before_cursor_execute", _capture)
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _is_issues_relation(node):
+    # Partitions are named issues_open, issues_closed_2024_01, ...
+    relation = node.get("Relation Name", "")
+    return relation == "issues" or relation.startswith("issues_")
+
+
+def _assert_index_only_plans(db_connection, statements):
+    assert statements, "endpoint did not issue any query against issues"
+    for statement, parameters in statements:
+        result = db_connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        for node in _plan_nodes(plan[0]["Plan"]):
+            node_type = node["Node Type"]
+            assert node_type not in FORBIDDEN_NODE_TYPES, f"{node_type} in plan for:\n{statement}"
+            assert not (node_type == "Seq Scan" and _is_issues_relation(node)), (
+                f"Seq Scan on {node['Relation Name']} in plan for:\n{statement}"
+            )
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "sort=asc",
+    "status_filter=open",
+    "status_filter=closed&sort=asc",
+    "page=50",
+    "status_filter=open&page=50",
+    "view=summary",
+    "fields=id,title&status_filter=closed",
+])
+def test_list_issues_plan_uses_index(client, db_connection, seed_bulk_issues, captured_statements, query):
+    seed_bulk_issues(SEEDED_ISSUE_COUNT)
+    captured_statements.clear()
+
+    response = client.get(f"{ISSUES_ENDPOINT}?{query}")
+    assert response.status_code == status.HTTP_200_OK
+
+    _assert_index_only_plans(db_connection, captured_statements)
+
+
+@pytest.mark.parametrize("query", ["", "sort=asc", "status_filter=open", "status_filter=closed&sort=asc"])
+def test_list_issues_cursor_plan_uses_index(client, db_connection, seed_bulk_issues, captured_statements, query):
+    seed_bulk_issues(SEEDED_ISSUE_COUNT)
+    first_page = client.get(f"{ISSUES_ENDPOINT}?{query}").json()
+    captured_statements.clear()
+
+    response = client.get(f"{ISSUES_ENDPOINT}?{query}&cursor={first_page['next_cursor']}")
+    assert response.status_code == status.HTTP_200_OK
+
+    _assert_index_only_plans(db_connection, captured_statements)
+
+
+def test_change_feed_plan_uses_index(client, db_connection, seed_bulk_issues, captured_statements, monkeypatch):
+    # The seeded issues are stamped years ago, past the feed's retention
+    monkeypatch.setattr(settings, "CHANGE_FEED_RETENTION_DAYS", 0)
+    seed_bulk_issues(SEEDED_ISSUE_COUNT)
+    first_page = client.get(f"{ISSUES_ENDPOINT}/changes").json()
+    captured_statements.clear()
+
+    response = client.get(f"{ISSUES_ENDPOINT}/changes?since={first_page['next_cursor']}")
+    assert response.status_code == status.HTTP_200_OK
+
+    _assert_index_only_plans(db_connection, captured_statements)
+
+
+def test_summary_page_reads_only_the_start_of_descriptions(client, captured_statements, create_issue):
+    create_issue()
+    captured_statements.clear()
+
+    assert client.get(f"{ISSUES_ENDPOINT}?view=summary").status_code == status.HTTP_200_OK
+
+    page_statement = captured_statements[-1][0]
+    selected = page_statement.split(" FROM ")[0]
+    assert selected.count("issues.description") == 1
+    assert "substr(issues.description" in selected
+
+
+def test_get_issue_plan_uses_index(client, db_connection, seed_bulk_issues, captured_statements):
+    seed_bulk_issues(SEEDED_ISSUE_COUNT)
+    issue_id = client.get(ISSUES_ENDPOINT).json()["items"][0]["id"]
+    captured_statements.clear()
+
+    response = client.get(f"{ISSUES_ENDPOINT}/{issue_id}")
+    assert response.status_code == status.HTTP_200_OK
+
+    _assert_index_only_plans(db_connection, captured_statements)
+
+
+@pytest.mark.parametrize("query", ["q=4242", "q=4242&status_filter=closed", "q=%22issue+4242%22&page=2"])
+def test_search_plan_uses_gin_index(client, db_connection, seed_bulk_issues, captured_statements, query):
+    seed_bulk_issues(SEEDED_ISSUE_COUNT)
+    captured_statements.clear()
+
+    response = client.get(f"{ISSUES_ENDPOINT}?{query}")
+    assert response.status_code == status.HTTP_200_OK
+
+    # Ranked results need a Sort, but matching must go through the GIN index
+    assert captured_statements
+    for statement, parameters in captured_statements:
+        plan = db_connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        nodes = list(_plan_nodes(plan[0]["Plan"]))
+        assert not any(node["Node Type"] == "Seq Scan" and _is_issues_relation(node) for node in nodes)
+        # Partition copies of ix_issues_search_vector are named <partition>_search_vector_idx
+        assert any("search_vector" in node.get("Index Name", "") for node in nodes), statement
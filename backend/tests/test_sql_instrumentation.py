@@ -0,0 +1,102 @@
+import logging
+import pytest
+from fastapi import status
+from sqlalchemy import text
+from sqlalchemy.exc import DataError
+from app.core.sql_instrumentation import RequestQueries, current_request
+from app.database import get_sql_instrumentation
+
+ISSUES_ENDPOINT = "/api/v1/issues"
+LOGGER = "app.core.sql_instrumentation"
+
+
+@pytest.fixture
+def instrumented(test_engine, monkeypatch):
+    """Time the test engine's statements with the application's instrumentation"""
+    sql_instrumentation = get_sql_instrumentation()
+    monkeypatch.setattr(sql_instrumentation, "slow_query_seconds", 60.0)
+    sql_instrumentation.attach(test_engine)
+    yield sql_instrumentation
+    sql_instrumentation.detach(test_engine)
+
+
+def _server_timing(response):
+    name, duration, description = response.headers["server-timing"].split(";")
+    assert name == "db"
+    return float(duration.removeprefix("dur=")), int(description.removeprefix('desc="').split()[0])
+
+
+def test_server_timing_reports_request_queries(client, create_issue, instrumented):
+    issue = create_issue(title="Timed")
+
+    response = client.get(f"{ISSUES_ENDPOINT}/{issue.id}")
+    assert response.status_code == status.HTTP_200_OK
+    duration, queries = _server_timing(response)
+    assert queries == 1
+    assert duration > 0
+
+    # Total count and page rows
+    response = client.get(ISSUES_ENDPOINT)
+    assert _server_timing(response)[1] == 2
+
+def test_batch_get_reports_one_query(client, create_multiple_issues, instrumented):
+    ids = ",".join(str(issue.id) for issue in create_multiple_issues(30))
+
+    response = client.get(f"{ISSUES_ENDPOINT}/batch?ids={ids}")
+    assert len(response.json()["items"]) == 30
+    assert _server_timing(response)[1] == 1
+
+def test_cached_response_reports_no_queries(client, create_issue, instrumented):
+    issue = create_issue(title="Cached")
+    client.get(f"{ISSUES_ENDPOINT}/{issue.id}")
+
+    assert _server_timing(client.get(f"{ISSUES_ENDPOINT}/{issue.id}")) == (0.0, 0)
+
+def test_slow_query_logs_parameters_and_endpoint(client, create_issue, instrumented, monkeypatch, caplog):
+    issue = create_issue(title="Slow")
+    monkeypatch.setattr(instrumented, "slow_query_seconds", 0.0)
+
+    with caplog.at_level(logging.WARNING, logger=LOGGER):
+        client.get(f"{ISSUES_ENDPOINT}/{issue.id}")
+
+    slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Slow query")]
+    assert len(slow) == 1
+    assert "GET /api/v1/issues/{issue_id}" in slow[0]
+    assert str(issue.id) in slow[0].split("parameters:")[1]
+
+def test_repeated_statement_warns_about_n_plus_one(db_session, instrumented, monkeypatch, caplog):
+    monkeypatch.setattr(instrumented, "repeat_threshold", 3)
+    request = RequestQueries({"method": "GET", "path": "/loop"})
+    token = current_request.set(request)
+    try:
+        for issue_id in range(3):
+            db_session.execute(text("SELECT id FROM issues WHERE id = :id"), {"id": issue_id})
+        db_session.execute(text("SELECT count(*) FROM issues"))
+    finally:
+        current_request.reset(token)
+
+    assert request.count == 4
+    with caplog.at_level(logging.WARNING, logger=LOGGER):
+        instrumented.report_repeats(request)
+
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert "GET /loop ran the same statement 3 times" in message
+    assert "WHERE id = %(id)s" in message
+
+def test_failed_statement_does_not_skew_later_timings(db_session, instrumented):
+    request = RequestQueries({"method": "GET", "path": "/failing"})
+    token = current_request.set(request)
+    try:
+        with pytest.raises(DataError):
+            with db_session.begin_nested():
+                db_session.execute(text("SELECT 1 / 0"))
+        db_session.execute(text("SELECT pg_sleep(0.05)"))
+    finally:
+        current_request.reset(token)
+
+    # The savepoint statements and the sleep are timed; the failed division is not
+    assert request.shapes.get("SELECT pg_sleep(0.05)") == 1
+    assert "SELECT 1 / 0" not in request.shapes
+    assert 0.05 <= request.seconds < 1.0
+    assert "query_started" not in db_session.connection().info